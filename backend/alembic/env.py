@@ -14,6 +14,8 @@ from database.base import Base
 
 from app.user.model.user import User
 from app.skill.model.skill import Skill
+from app.skill.model.skill_stats import SkillStats
+from app.skill.model.skill_level_history import SkillLevelHistory
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
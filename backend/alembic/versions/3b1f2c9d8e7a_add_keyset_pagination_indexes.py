@@ -0,0 +1,30 @@
+"""Add keyset pagination indexes
+
+Revision ID: 3b1f2c9d8e7a
+Revises: ef43d838464c
+Create Date: 2026-10-16 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b1f2c9d8e7a'
+down_revision: Union[str, None] = 'ef43d838464c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_user_name_id', 'user', ['name', 'id'], unique=False)
+    op.create_index('ix_skill_user_id_name_id', 'skill', ['user_id', 'name', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_skill_user_id_name_id', table_name='skill')
+    op.drop_index('ix_user_name_id', table_name='user')
@@ -0,0 +1,45 @@
+"""Create skill_stats table with org-wide running totals
+
+Revision ID: 5e9a7b3c4d21
+Revises: 8c4d1e6f2a90
+Create Date: 2026-10-16 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e9a7b3c4d21'
+down_revision: Union[str, None] = '8c4d1e6f2a90'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('skill_stats',
+    sa.Column('category', sa.String(length=100), nullable=False),
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.Column('level_sum', sa.Float(), nullable=False),
+    sa.Column('level_sq_sum', sa.Float(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.PrimaryKeyConstraint('category', 'name')
+    )
+    # Backfill from existing skills
+    op.execute(
+        """
+        INSERT INTO skill_stats (category, name, count, level_sum, level_sq_sum)
+        SELECT category, name, count(*), sum(level), sum(level * level)
+        FROM skill
+        GROUP BY category, name
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('skill_stats')
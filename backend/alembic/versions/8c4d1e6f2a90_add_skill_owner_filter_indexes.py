@@ -0,0 +1,35 @@
+"""Add composite indexes for per-user skill filtering and level sorting
+
+Revision ID: 8c4d1e6f2a90
+Revises: 3b1f2c9d8e7a
+Create Date: 2026-10-16 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c4d1e6f2a90'
+down_revision: Union[str, None] = '3b1f2c9d8e7a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_skill_user_id_category', 'skill', ['user_id', 'category'], unique=False)
+    op.create_index(
+        'ix_skill_user_id_level_desc',
+        'skill',
+        ['user_id', sa.text('level DESC'), sa.text('id DESC')],
+        unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_skill_user_id_level_desc', table_name='skill')
+    op.drop_index('ix_skill_user_id_category', table_name='skill')
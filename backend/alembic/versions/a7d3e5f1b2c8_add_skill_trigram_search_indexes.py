@@ -0,0 +1,37 @@
+"""Add trigram indexes for skill search
+
+Revision ID: a7d3e5f1b2c8
+Revises: 5e9a7b3c4d21
+Create Date: 2026-10-16 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7d3e5f1b2c8'
+down_revision: Union[str, None] = '5e9a7b3c4d21'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_index(
+        'ix_skill_name_trgm', 'skill', ['name'], unique=False,
+        postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'}
+    )
+    op.create_index(
+        'ix_skill_description_trgm', 'skill', ['description'], unique=False,
+        postgresql_using='gin', postgresql_ops={'description': 'gin_trgm_ops'}
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_skill_description_trgm', table_name='skill')
+    op.drop_index('ix_skill_name_trgm', table_name='skill')
@@ -0,0 +1,50 @@
+"""Create skill_level_history table
+
+Revision ID: c4e8f2a6b1d3
+Revises: a7d3e5f1b2c8
+Create Date: 2026-10-16 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4e8f2a6b1d3'
+down_revision: Union[str, None] = 'a7d3e5f1b2c8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('skill_level_history',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('skill_id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('category', sa.String(length=100), nullable=False),
+    sa.Column('level', sa.Float(), nullable=False),
+    sa.Column('recorded_at', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(
+        'ix_skill_level_history_user_id_recorded_at', 'skill_level_history',
+        ['user_id', 'recorded_at'], unique=False
+    )
+    # Seed each existing skill's current level as its first point
+    op.execute(
+        """
+        INSERT INTO skill_level_history (skill_id, user_id, name, category, level, recorded_at)
+        SELECT id, user_id, name, category, level, COALESCE(updated_at, created_at, now())
+        FROM skill
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_skill_level_history_user_id_recorded_at', table_name='skill_level_history')
+    op.drop_table('skill_level_history')
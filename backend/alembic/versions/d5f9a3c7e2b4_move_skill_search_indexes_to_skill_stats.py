@@ -0,0 +1,48 @@
+"""Move the skill search indexes to skill_stats
+
+Revision ID: d5f9a3c7e2b4
+Revises: c4e8f2a6b1d3
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5f9a3c7e2b4'
+down_revision: Union[str, None] = 'c4e8f2a6b1d3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_index(
+        'ix_skill_stats_name_trgm', 'skill_stats', ['name'], unique=False,
+        postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'}
+    )
+    # Prefix lookups for queries too short for trigrams
+    op.create_index(
+        'ix_skill_stats_name_prefix', 'skill_stats', [sa.text('lower(name) text_pattern_ops')], unique=False
+    )
+    # Search no longer reads the skill table, so these only slowed down skill writes
+    op.drop_index('ix_skill_description_trgm', table_name='skill')
+    op.drop_index('ix_skill_name_trgm', table_name='skill')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index(
+        'ix_skill_name_trgm', 'skill', ['name'], unique=False,
+        postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'}
+    )
+    op.create_index(
+        'ix_skill_description_trgm', 'skill', ['description'], unique=False,
+        postgresql_using='gin', postgresql_ops={'description': 'gin_trgm_ops'}
+    )
+    op.drop_index('ix_skill_stats_name_prefix', table_name='skill_stats')
+    op.drop_index('ix_skill_stats_name_trgm', table_name='skill_stats')
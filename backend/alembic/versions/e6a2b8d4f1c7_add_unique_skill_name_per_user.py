@@ -0,0 +1,50 @@
+"""Make skill names unique per user
+
+Revision ID: e6a2b8d4f1c7
+Revises: d5f9a3c7e2b4
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e6a2b8d4f1c7'
+down_revision: Union[str, None] = 'd5f9a3c7e2b4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Duplicate (user_id, name) pairs listed when the upgrade is refused
+MAX_LISTED = 20
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Never drop user data here; database/merge_duplicate_skills.py merges them explicitly
+    duplicates = op.get_bind().execute(sa.text(
+        """
+        SELECT user_id, name, count(*)
+        FROM skill
+        GROUP BY user_id, name
+        HAVING count(*) > 1
+        ORDER BY user_id, name
+        """
+    )).all()
+    if duplicates:
+        listed = "\n".join(f"  user_id={user_id} name={name!r} rows={rows}" for user_id, name, rows in duplicates[:MAX_LISTED])
+        more = f"\n  ... and {len(duplicates) - MAX_LISTED} more" if len(duplicates) > MAX_LISTED else ""
+        raise RuntimeError(
+            f"{len(duplicates)} skill names are held more than once by the same user:\n{listed}{more}\n"
+            "Run `python database/merge_duplicate_skills.py` to review them and "
+            "`--apply` to merge them, then upgrade again."
+        )
+    op.create_index('uq_skill_user_id_name', 'skill', ['user_id', 'name'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('uq_skill_user_id_name', table_name='skill')
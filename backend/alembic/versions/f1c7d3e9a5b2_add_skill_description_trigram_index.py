@@ -0,0 +1,33 @@
+"""Index skill descriptions for search
+
+Revision ID: f1c7d3e9a5b2
+Revises: e6a2b8d4f1c7
+Create Date: 2026-10-17 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1c7d3e9a5b2'
+down_revision: Union[str, None] = 'e6a2b8d4f1c7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # Serves description substring (ILIKE) matches in skill search
+    op.create_index(
+        'ix_skill_description_trgm', 'skill', ['description'], unique=False,
+        postgresql_using='gin', postgresql_ops={'description': 'gin_trgm_ops'}
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_skill_description_trgm', table_name='skill')
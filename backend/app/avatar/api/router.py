@@ -0,0 +1,11 @@
+from fastapi import APIRouter
+from .v1.avatar import router as avatar_v1_router
+
+router = APIRouter()
+
+# Include v1 routes
+router.include_router(
+    avatar_v1_router,
+    prefix="/v1/avatars",
+    tags=["avatars"]
+)
@@ -0,0 +1,3 @@
+from .avatar import router
+
+__all__ = ["router"]
@@ -0,0 +1,80 @@
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status, Query
+from fastapi.responses import FileResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+from database.database import get_session
+from app.core.auth import get_current_user
+from app.core.etag import make_etag, etag_matches
+from app.core.responses import json_response
+from app.core.query_budget import query_budget
+from app.core.settings import settings
+from app.user.schema.user import UserResponse
+from ...schema.avatar import AvatarResponse
+from ...service.avatar_service import AvatarService, avatar_store
+from ...service.avatar_store import InvalidAvatar
+
+router = APIRouter()
+
+# Stored files never change (their name is their hash), so caches may keep them for good
+CACHE_HEADERS = {
+    "Cache-Control": "public, max-age=31536000, immutable",
+    # Uploaded SVGs are served as-is; never let them run scripts or load anything
+    "Content-Security-Policy": "default-src 'none'; style-src 'unsafe-inline'; sandbox",
+    "X-Content-Type-Options": "nosniff",
+}
+
+
+@router.put("/me", response_model=AvatarResponse)
+@query_budget(2)
+async def upload_avatar(
+    request: Request,
+    current_user: UserResponse = Depends(get_current_user),
+    db: AsyncSession = Depends(get_session)
+):
+    """Store the raw request body (PNG, JPEG, GIF, WebP or SVG) as the authenticated user's avatar"""
+    data = bytearray()
+    async for chunk in request.stream():
+        data += chunk
+        if len(data) > settings.AVATAR_MAX_BYTES:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"Avatars are limited to {settings.AVATAR_MAX_BYTES} bytes"
+            )
+
+    try:
+        user = await AvatarService.set_user_avatar(db, current_user.id, bytes(data))
+    except InvalidAvatar as e:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=str(e)
+        )
+    return json_response(AvatarResponse, {"avatar_url": user.avatar_url, "sizes": avatar_store.sizes})
+
+
+@router.get("/{name}", response_class=FileResponse)
+@query_budget(0)
+async def get_avatar(
+    name: str,
+    request: Request,
+    size: Optional[int] = Query(None, description="Thumbnail edge length; omit for the original")
+):
+    """Serve a stored avatar or one of its square thumbnails"""
+    if size is not None and size not in avatar_store.sizes:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"size must be one of {avatar_store.sizes}"
+        )
+
+    etag = make_etag("avatar", name, size)
+    if etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag, **CACHE_HEADERS})
+
+    resolved = await avatar_store.resolve(name, size)
+    if resolved is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Avatar not found"
+        )
+    path, media_type = resolved
+    # FileResponse streams from disk, using the server's zero-copy send when it offers one
+    return FileResponse(path, media_type=media_type, headers={"ETag": etag, **CACHE_HEADERS})
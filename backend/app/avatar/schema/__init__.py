@@ -0,0 +1,3 @@
+from .avatar import AvatarResponse
+
+__all__ = ["AvatarResponse"]
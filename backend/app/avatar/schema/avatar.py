@@ -0,0 +1,8 @@
+from pydantic import BaseModel, Field
+from typing import List
+
+
+class AvatarResponse(BaseModel):
+    """A stored avatar and where to fetch it"""
+    avatar_url: str = Field(..., description="Local URL now stored as the user's avatar_url")
+    sizes: List[int] = Field(default=[], description="Thumbnail edge lengths available through ?size=")
@@ -0,0 +1,3 @@
+from .avatar_service import AvatarService
+
+__all__ = ["AvatarService"]
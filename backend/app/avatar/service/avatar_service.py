@@ -0,0 +1,56 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+from typing import List, Optional
+from app.core.settings import settings
+from app.user.model.user import User
+from app.user.schema.user import UserUpdate
+from app.user.service.user_service import UserService
+from .avatar_store import AvatarStore
+from .avatar_source import create_avatar_source
+
+# Public path stored in User.avatar_url for cached avatars
+AVATAR_URL_PREFIX = "/api/v1/avatars/"
+
+avatar_store = AvatarStore(
+    settings.AVATAR_STORAGE_DIR,
+    sizes=[int(size) for size in settings.AVATAR_SIZES.split(",") if size.strip()],
+    workers=settings.AVATAR_WORKERS,
+)
+
+avatar_source = create_avatar_source(
+    settings.AVATAR_SOURCE,
+    timeout=settings.AVATAR_FETCH_TIMEOUT,
+    max_bytes=settings.AVATAR_MAX_BYTES,
+)
+
+
+class AvatarService:
+    """Service class for locally cached user avatars"""
+
+    @staticmethod
+    def url_for(name: str) -> str:
+        """Local avatar_url for a stored avatar name"""
+        return AVATAR_URL_PREFIX + name
+
+    @staticmethod
+    async def set_user_avatar(db: AsyncSession, user_id: int, data: bytes) -> Optional[User]:
+        """Store image bytes and point the user's avatar_url at the local copy.
+
+        Raises InvalidAvatar when the bytes are not an accepted image.
+        """
+        name = await avatar_store.ingest(data)
+        return await UserService.update_user(db, user_id, UserUpdate(avatar_url=AvatarService.url_for(name)))
+
+    @staticmethod
+    async def get_users_with_remote_avatars(db: AsyncSession) -> List[User]:
+        """Users whose avatar_url still points at an external http(s) URL"""
+        result = await db.execute(
+            select(User).where(User.avatar_url.like("http%")).order_by(User.id)
+        )
+        return result.scalars().all()
+
+    @staticmethod
+    async def cache_remote_avatar(db: AsyncSession, user: User) -> Optional[User]:
+        """Fetch a user's external avatar through the configured source and store it locally"""
+        data = await avatar_source.fetch(user.avatar_url)
+        return await AvatarService.set_user_avatar(db, user.id, data)
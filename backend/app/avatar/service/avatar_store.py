@@ -0,0 +1,140 @@
+"""
+Content-addressed on-disk avatar store with thumbnails built in a worker pool
+"""
+import asyncio
+import hashlib
+import io
+import os
+import re
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+# Pillow format name -> (file extension, media type) for accepted originals
+RASTER_FORMATS = {
+    "PNG": ("png", "image/png"),
+    "JPEG": ("jpg", "image/jpeg"),
+    "GIF": ("gif", "image/gif"),
+    "WEBP": ("webp", "image/webp"),
+}
+SVG = ("svg", "image/svg+xml")
+MEDIA_TYPES = dict([*RASTER_FORMATS.values(), SVG])
+THUMBNAIL_MEDIA_TYPE = "image/webp"
+
+# "<sha256>.<ext>", the public name of a stored original
+AVATAR_NAME = re.compile(r"^([0-9a-f]{64})\.(png|jpg|gif|webp|svg)$")
+
+# Rejects decompression bombs before decoding
+MAX_PIXELS = 40_000_000
+
+
+class InvalidAvatar(ValueError):
+    """The uploaded bytes are not an image the store accepts"""
+
+
+def _sniff(data: bytes) -> Tuple[str, Optional[Image.Image]]:
+    """Return the extension for `data`, plus the opened image for raster formats"""
+    head = data[:1024].lstrip()
+    if head.startswith(b"<svg") or (head.startswith(b"<?xml") and b"<svg" in data[:4096]):
+        return SVG[0], None
+    try:
+        image = Image.open(io.BytesIO(data))
+    except (UnidentifiedImageError, OSError) as exc:
+        raise InvalidAvatar("Unsupported or corrupt image") from exc
+    if image.format not in RASTER_FORMATS:
+        raise InvalidAvatar(f"Unsupported image format {image.format}")
+    if image.width * image.height > MAX_PIXELS:
+        raise InvalidAvatar("Image is too large")
+    return RASTER_FORMATS[image.format][0], image
+
+
+def _thumbnail(image: Image.Image, size: int) -> bytes:
+    """Center-crop to a square and scale to `size` pixels, encoded as WebP"""
+    image.seek(0)
+    frame = ImageOps.exif_transpose(image.convert("RGBA"))
+    thumb = ImageOps.fit(frame, (size, size), method=Image.Resampling.LANCZOS)
+    out = io.BytesIO()
+    thumb.save(out, format="WEBP", quality=85, method=4)
+    return out.getvalue()
+
+
+class AvatarStore:
+    """Stores originals as `<root>/<ab>/<sha256>.<ext>` and thumbnails beside them.
+
+    Files are named by the SHA-256 of the original bytes, so identical
+    uploads share one copy and a stored file never changes; that is what
+    lets the API serve them with immutable caching. Thumbnails for every
+    configured size are built at ingest time on a small thread pool
+    (Pillow releases the GIL while resizing and encoding) and are rebuilt
+    on demand if the size list changes later. SVG originals are vector
+    images and are served as-is for every size.
+    """
+
+    def __init__(self, root: str, sizes: Iterable[int], workers: int = 2) -> None:
+        self.root = Path(root)
+        self.sizes: List[int] = sorted(set(sizes))
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="avatar-thumbnail")
+
+    def path(self, digest: str, ext: str) -> Path:
+        return self.root / digest[:2] / f"{digest}.{ext}"
+
+    def thumbnail_path(self, digest: str, size: int) -> Path:
+        return self.root / digest[:2] / f"{digest}_{size}.webp"
+
+    @staticmethod
+    def _write(path: Path, data: bytes) -> None:
+        """Write atomically, so readers never see a partial file"""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+    def _ingest_sync(self, data: bytes) -> str:
+        ext, image = _sniff(data)
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.path(digest, ext)
+        if not path.exists():
+            self._write(path, data)
+        if image is not None:
+            for size in self.sizes:
+                thumb = self.thumbnail_path(digest, size)
+                if not thumb.exists():
+                    self._write(thumb, _thumbnail(image, size))
+        return path.name
+
+    def _build_thumbnail_sync(self, digest: str, ext: str, size: int) -> Path:
+        thumb = self.thumbnail_path(digest, size)
+        if not thumb.exists():
+            with Image.open(self.path(digest, ext)) as image:
+                self._write(thumb, _thumbnail(image, size))
+        return thumb
+
+    async def ingest(self, data: bytes) -> str:
+        """Store an image and its thumbnails; returns its public name `<sha256>.<ext>`"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self._ingest_sync, data)
+
+    async def resolve(self, name: str, size: Optional[int] = None) -> Optional[Tuple[Path, str]]:
+        """(file path, media type) for a stored avatar, or None if there is no such file.
+
+        With `size` a raster avatar resolves to its thumbnail, built first
+        if missing; `size` must be one of the configured sizes.
+        """
+        match = AVATAR_NAME.match(name)
+        if match is None:
+            return None
+        digest, ext = match.groups()
+        original = self.path(digest, ext)
+        if size is None or ext == SVG[0]:
+            return (original, MEDIA_TYPES[ext]) if original.exists() else None
+
+        thumb = self.thumbnail_path(digest, size)
+        if not thumb.exists():
+            if not original.exists():
+                return None
+            loop = asyncio.get_running_loop()
+            thumb = await loop.run_in_executor(self._executor, self._build_thumbnail_sync, digest, ext, size)
+        return thumb, THUMBNAIL_MEDIA_TYPE
@@ -7,21 +7,29 @@ from typing import Optional
 from app.user.model.user import User
 from app.user.service.user_service import UserService
 from database.database import get_session
+from app.core.session import session_store
 
 class AuthService:
     """Simple session-based authentication service"""
     
     @staticmethod
     def login_user(request: Request, user: User) -> None:
-        """Login user by storing user_id in session"""
+        """Login user by storing user_id in the server-side session under a fresh session ID"""
+        request.session.clear()
+        request.session.regenerate()
         request.session["user_id"] = user.id
         request.session["user_email"] = user.email
     
     @staticmethod
     def logout_user(request: Request) -> None:
-        """Logout user by clearing session"""
+        """Logout user by clearing session; the middleware deletes it from the store"""
         request.session.clear()
     
+    @staticmethod
+    async def revoke_user_sessions(user_id: int) -> int:
+        """Log a user out everywhere by dropping all of their stored sessions"""
+        return await session_store.revoke_user(user_id)
+    
     @staticmethod
     def get_current_user_id(request: Request) -> Optional[int]:
         """Get current user ID from session"""
@@ -44,7 +52,7 @@ async def get_current_user(
             detail="Not authenticated. Please login first."
         )
     
-    user = await UserService.get_user_by_id(db, user_id)
+    user = await UserService.get_cached_user(db, user_id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -62,4 +70,4 @@ async def get_current_user_optional(
     if not user_id:
         return None
     
-    return await UserService.get_user_by_id(db, user_id)
+    return await UserService.get_cached_user(db, user_id)
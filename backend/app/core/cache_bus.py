@@ -0,0 +1,159 @@
+"""
+Cross-worker cache invalidation over Redis pub/sub
+"""
+import asyncio
+import json
+import logging
+import secrets
+from typing import Any, Callable, Dict, List, Optional
+from app.core.session import RedisProtocolError, RespClient
+from app.core.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+class CacheBus:
+    """Relays writes to the in-process caches between worker processes.
+
+    Every worker keeps its own user cache, autocomplete index and similarity
+    matrix. A write applied locally is also published, as JSON, on one
+    Redis channel. The other workers apply it to their copies through the
+    handler registered under the same name, and each worker skips its own
+    messages. `publish` only queues the message; a background task sends
+    the queue as one pipeline, so callers never wait on Redis.
+
+    Messages sent while a worker's subscription is down are lost. After
+    reconnecting, the worker therefore calls every registered `reset`,
+    which clears or expires that cache. Without a Redis URL the bus stays
+    off and the caches rely on their TTLs alone.
+    """
+
+    def __init__(self, url: Optional[str], channel: str = "cache", retry_after: float = 1.0) -> None:
+        self.url = url
+        self.channel = channel
+        self.retry_after = retry_after
+        self.sender = ""
+        self._handlers: Dict[str, Callable[..., None]] = {}
+        self._resets: List[Callable[[], None]] = []
+        self._outbox: List[str] = []
+        self._client: Optional[RespClient] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._tasks: List[asyncio.Task] = []
+        self.published = 0
+        self.received = 0
+        self.dropped = 0
+        self.reconnects = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self._client is not None
+
+    def register(self, name: str, handler: Callable[..., None], reset: Callable[[], None]) -> None:
+        """Apply messages published under `name` with `handler`; `reset` when messages may have been missed"""
+        self._handlers[name] = handler
+        self._resets.append(reset)
+
+    def publish(self, name: str, *args: Any) -> None:
+        """Queue a write for the other workers; does nothing while the bus is off"""
+        if self._client is None:
+            return
+        self._outbox.append(json.dumps([self.sender, name, args]))
+        self._wake.set()
+
+    async def start(self) -> None:
+        """Subscribe and start sending; called in each worker, after the fork"""
+        if self.url is None or self._client is not None:
+            return
+        # Chosen here, not at import, because preloaded workers share the import
+        self.sender = secrets.token_hex(8)
+        self._client = RespClient(self.url, max_connections=1)
+        self._wake = asyncio.Event()
+        subscribed = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        self._tasks = [loop.create_task(self._send()), loop.create_task(self._listen(subscribed))]
+        try:
+            await asyncio.wait_for(subscribed.wait(), timeout=5.0)
+        except asyncio.TimeoutError:
+            logger.warning("Cache bus not subscribed yet; retrying in the background")
+
+    async def _send(self) -> None:
+        while True:
+            await self._wake.wait()
+            self._wake.clear()
+            messages, self._outbox = self._outbox, []
+            try:
+                await self._client.pipeline(*[("PUBLISH", self.channel, message) for message in messages])
+            except (ConnectionError, OSError, asyncio.IncompleteReadError, RedisProtocolError) as exc:
+                self.dropped += len(messages)
+                logger.warning("Dropped %d cache bus messages: %s", len(messages), exc)
+                continue
+            self.published += len(messages)
+
+    async def _listen(self, subscribed: asyncio.Event) -> None:
+        first = True
+        while True:
+            connection = None
+            try:
+                connection = await self._client.subscribe(self.channel)
+                if not first:
+                    self.reconnects += 1
+                    for reset in self._resets:
+                        reset()
+                first = False
+                subscribed.set()
+                while True:
+                    message = await connection.read()
+                    if isinstance(message, list) and message[:1] == [b"message"]:
+                        self._dispatch(message[2])
+            except (ConnectionError, OSError, asyncio.IncompleteReadError, RedisProtocolError) as exc:
+                logger.warning("Cache bus subscription lost: %s", exc)
+            finally:
+                if connection is not None:
+                    await connection.close()
+            await asyncio.sleep(self.retry_after)
+
+    def _dispatch(self, raw: bytes) -> None:
+        try:
+            sender, name, args = json.loads(raw)
+            if sender == self.sender:
+                return
+            self.received += 1
+            handler = self._handlers.get(name)
+            if handler is not None:
+                handler(*args)
+        except Exception:
+            logger.exception("Could not apply cache bus message %r", raw[:200])
+
+    async def close(self) -> None:
+        """Send what is queued, then stop both tasks"""
+        if self._client is None:
+            return
+        if self._outbox:
+            messages, self._outbox = self._outbox, []
+            try:
+                await self._client.pipeline(*[("PUBLISH", self.channel, message) for message in messages])
+                self.published += len(messages)
+            except (ConnectionError, OSError, asyncio.IncompleteReadError, RedisProtocolError):
+                self.dropped += len(messages)
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        await self._client.close()
+        self._client = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "published": self.published,
+            "received": self.received,
+            "dropped": self.dropped,
+            "reconnects": self.reconnects,
+        }
+
+
+# Shares the session store's Redis; with SESSION_BACKEND=memory there is only one worker to keep in step
+cache_bus = CacheBus(
+    settings.SESSION_REDIS_URL if settings.SESSION_BACKEND == "redis" else None,
+    channel=settings.CACHE_BUS_CHANNEL,
+)
@@ -0,0 +1,92 @@
+"""
+Keyset (cursor) pagination helpers shared by the listing endpoints
+"""
+import base64
+import binascii
+import json
+from typing import Any, Callable, Generic, List, Optional, Sequence, Tuple, TypeVar
+from fastapi import HTTPException, status
+from pydantic import BaseModel, Field
+from sqlalchemy import Select, tuple_
+
+T = TypeVar("T")
+
+
+class Page(BaseModel, Generic[T]):
+    """A page of results plus the cursor to fetch the next one"""
+    items: List[T] = Field(default=[], description="Items in this page")
+    next_cursor: Optional[str] = Field(None, description="Opaque cursor for the next page, null on the last page")
+
+
+def encode_cursor(sort: str, values: Sequence[Any]) -> str:
+    """Encode the last row's sort key as an opaque URL-safe cursor"""
+    payload = json.dumps({"s": sort, "v": list(values)}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def _matches(value: Any, python_type: type) -> bool:
+    """Whether a JSON-decoded cursor value fits a column's Python type"""
+    if isinstance(value, bool):
+        return False
+    if python_type is float:
+        return isinstance(value, (int, float))
+    return isinstance(value, python_type)
+
+
+def decode_cursor(cursor: str, sort: str, columns: Sequence[Any]) -> Optional[Tuple[Any, ...]]:
+    """Decode a cursor produced by encode_cursor for the given sort order.
+
+    An empty cursor means "first page" and returns None. Malformed cursors,
+    cursors issued for a different sort order, and cursors whose values do
+    not match the key `columns` in number and type raise a 400.
+    """
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if payload["s"] != sort:
+            raise ValueError("cursor was issued for a different sort order")
+        values = payload["v"]
+        if not isinstance(values, list) or len(values) != len(columns):
+            raise ValueError("cursor does not match the sort key")
+        if not all(_matches(value, column.type.python_type) for value, column in zip(values, columns)):
+            raise ValueError("cursor does not match the sort key")
+        return tuple(values)
+    except (ValueError, KeyError, TypeError, NotImplementedError, binascii.Error):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor"
+        )
+
+
+def keyset_filter(
+    query: Select,
+    columns: Sequence[Any],
+    after: Optional[Tuple[Any, ...]],
+    limit: int,
+    descending: bool = False,
+) -> Select:
+    """Order by the given column tuple and seek past `after`.
+
+    One extra row is requested so the caller can tell whether another page
+    exists without issuing a count query.
+    """
+    if after is not None:
+        key = tuple_(*columns)
+        query = query.filter(key < tuple_(*after) if descending else key > tuple_(*after))
+    order = [column.desc() for column in columns] if descending else list(columns)
+    return query.order_by(*order).limit(limit + 1)
+
+
+def split_page(
+    rows: Sequence[T],
+    limit: int,
+    sort: str,
+    key: Callable[[T], Sequence[Any]],
+) -> Tuple[List[T], Optional[str]]:
+    """Trim the look-ahead row and build the next cursor if there is one"""
+    items = list(rows[:limit])
+    if len(rows) <= limit or not items:
+        return items, None
+    return items, encode_cursor(sort, key(items[-1]))
@@ -0,0 +1,115 @@
+"""
+Per-route query budgets and repeated-statement (N+1) detection
+"""
+import json
+import logging
+from collections import Counter as StatementCounter
+from typing import Callable, List, Optional, TypeVar
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.metrics import Counter, RequestTimings, current_timings, registry
+
+logger = logging.getLogger(__name__)
+
+F = TypeVar("F", bound=Callable)
+
+# Sentinel budget meaning "not declared"; only the repeat check applies
+UNSET = -1
+
+query_budget_violations_total = registry.register(Counter(
+    "http_query_budget_violations_total",
+    "Requests that exceeded their query budget or repeated a statement",
+    ("route", "kind"),
+))
+
+
+def query_budget(max_queries: Optional[int] = UNSET, max_repeats: Optional[int] = UNSET) -> Callable[[F], F]:
+    """Declare the most SQL statements an endpoint may execute per request.
+
+    Apply below the route decorator. `max_repeats` overrides how often one
+    statement may run in a request before it is reported as an N+1 pattern;
+    pass None for either limit to switch that check off for the route (for
+    example on bulk endpoints whose statement count grows with the input).
+    """
+    def decorator(endpoint: F) -> F:
+        endpoint.query_budget = max_queries
+        endpoint.query_repeat_budget = max_repeats
+        return endpoint
+    return decorator
+
+
+class QueryBudgetMiddleware:
+    """ASGI middleware enforcing `query_budget` declarations.
+
+    Counts statements per request through the engine hooks in app.core.metrics
+    and, once the response starts, checks the route's budget and looks for
+    statements repeated more than `repeat_threshold` times. In "log" mode a
+    warning is logged; in "raise" mode the response is replaced by a 500 so
+    tests and local runs fail loudly.
+    """
+
+    def __init__(self, app: ASGIApp, mode: str = "log", repeat_threshold: int = 5) -> None:
+        if mode not in ("log", "raise"):
+            raise ValueError(f"Unknown query budget mode {mode!r}")
+        self.app = app
+        self.mode = mode
+        self.repeat_threshold = repeat_threshold
+
+    def violations(self, scope: Scope, timings: RequestTimings) -> List[str]:
+        route = scope.get("route")
+        endpoint = getattr(route, "endpoint", None)
+        budget = getattr(endpoint, "query_budget", UNSET)
+        repeat_budget = getattr(endpoint, "query_repeat_budget", UNSET)
+        if repeat_budget == UNSET:
+            repeat_budget = self.repeat_threshold
+
+        found = []
+        if budget not in (None, UNSET) and timings.queries > budget:
+            found.append(("budget", f"{timings.queries} statements, budget is {budget}"))
+        if repeat_budget is not None:
+            for statement, count in timings.statements.items():
+                if count > repeat_budget:
+                    found.append(("repeat", f"statement ran {count} times (N+1?): {' '.join(statement.split())[:200]}"))
+
+        label = getattr(route, "path", None) or "unmatched"
+        for kind, _ in found:
+            query_budget_violations_total.inc(label, kind)
+        return [f"{scope['method']} {label}: {message}" for _, message in found]
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings = current_timings.get()
+        token = None
+        if timings is None:
+            timings = RequestTimings()
+            token = current_timings.set(timings)
+        timings.statements = StatementCounter()
+        replaced = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal replaced
+            if replaced:
+                return
+            if message["type"] == "http.response.start":
+                problems = self.violations(scope, timings)
+                for problem in problems:
+                    logger.warning("Query budget: %s", problem)
+                if problems and self.mode == "raise":
+                    replaced = True
+                    body = json.dumps({"detail": "Query budget exceeded", "violations": problems}).encode()
+                    await send({
+                        "type": "http.response.start",
+                        "status": 500,
+                        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+                    })
+                    await send({"type": "http.response.body", "body": body})
+                    return
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            if token is not None:
+                current_timings.reset(token)
@@ -0,0 +1,37 @@
+"""
+Single-pass JSON responses built straight from ORM rows
+"""
+from functools import lru_cache
+from typing import Any, Mapping, Optional
+from fastapi import Response
+from pydantic import TypeAdapter
+
+
+class PydanticJSONResponse(Response):
+    """Response whose body is already-encoded JSON bytes"""
+    media_type = "application/json"
+
+
+@lru_cache(maxsize=None)
+def adapter_for(response_type: Any) -> TypeAdapter:
+    """TypeAdapter for a response type, built once per type and reused"""
+    return TypeAdapter(response_type)
+
+
+def json_response(
+    response_type: Any,
+    value: Any,
+    status_code: int = 200,
+    headers: Optional[Mapping[str, str]] = None,
+) -> PydanticJSONResponse:
+    """Validate `value` against `response_type` once and encode it to JSON bytes.
+
+    `value` may be ORM rows (read via from_attributes), dicts or schema
+    instances. Both validation and encoding run in pydantic-core, and
+    returning a Response makes FastAPI skip its own response_model pass, so
+    each object is processed exactly once. Keep `response_model` on the
+    route for the OpenAPI schema.
+    """
+    adapter = adapter_for(response_type)
+    body = adapter.dump_json(adapter.validate_python(value, from_attributes=True))
+    return PydanticJSONResponse(content=body, status_code=status_code, headers=headers)
@@ -0,0 +1,99 @@
+"""
+Password hashing with scrypt, run off the event loop in a bounded thread pool
+"""
+import asyncio
+import base64
+import hashlib
+import hmac
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Tuple
+from app.core.settings import settings
+
+SCHEME = "scrypt"
+SALT_BYTES = 16
+KEY_BYTES = 32
+
+# hashlib.scrypt releases the GIL, so threads give real parallelism here
+_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    thread_name_prefix="password-hash",
+)
+# Caps hashes in flight so a login burst queues here instead of piling up work
+_slots = asyncio.Semaphore(settings.PASSWORD_HASH_CONCURRENCY)
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.b64encode(data).decode().rstrip("=")
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.b64decode(data + "=" * (-len(data) % 4))
+
+
+def _derive(password: str, salt: bytes, n: int, r: int, p: int) -> bytes:
+    return hashlib.scrypt(
+        password.encode(), salt=salt, n=n, r=r, p=p,
+        maxmem=128 * n * r * p + 1024 * 1024, dklen=KEY_BYTES,
+    )
+
+
+def hash_password_sync(password: str) -> str:
+    """Hash a password as `scrypt$n$r$p$salt$key` (blocking)"""
+    n, r, p = settings.PASSWORD_SCRYPT_N, settings.PASSWORD_SCRYPT_R, settings.PASSWORD_SCRYPT_P
+    salt = os.urandom(SALT_BYTES)
+    key = _derive(password, salt, n, r, p)
+    return f"{SCHEME}${n}${r}${p}${_b64encode(salt)}${_b64encode(key)}"
+
+
+def is_password_hash(value: str) -> bool:
+    """Whether `value` is a hash in the format hash_password_sync produces"""
+    parts = value.split("$")
+    if len(parts) != 6 or parts[0] != SCHEME:
+        return False
+    try:
+        n, r, p = (int(part) for part in parts[1:4])
+        salt, key = _b64decode(parts[4]), _b64decode(parts[5])
+    except (ValueError, TypeError):
+        return False
+    return n > 1 and n & (n - 1) == 0 and r > 0 and p > 0 and len(salt) > 0 and len(key) == KEY_BYTES
+
+
+def verify_password_sync(password: str, stored: str) -> Tuple[bool, bool]:
+    """Check a password against a stored value (blocking).
+
+    Returns (matches, needs_rehash). Values that are not scrypt hashes are
+    legacy plaintext rows; they still verify, but are flagged for rehashing,
+    as are hashes made with older cost parameters.
+    """
+    if not stored.startswith(f"{SCHEME}$"):
+        return hmac.compare_digest(password.encode(), stored.encode()), True
+    try:
+        _, n, r, p, salt, key = stored.split("$")
+        n, r, p = int(n), int(r), int(p)
+        expected = _b64decode(key)
+        candidate = _derive(password, _b64decode(salt), n, r, p)
+    except (ValueError, TypeError):
+        return False, False
+    current = (settings.PASSWORD_SCRYPT_N, settings.PASSWORD_SCRYPT_R, settings.PASSWORD_SCRYPT_P)
+    return hmac.compare_digest(candidate, expected), (n, r, p) != current
+
+
+async def _run(func: Callable[..., Any], *args: Any) -> Any:
+    async with _slots:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_executor, func, *args)
+
+
+async def hash_password(password: str) -> str:
+    """Hash a password without blocking the event loop"""
+    return await _run(hash_password_sync, password)
+
+
+async def verify_password(password: str, stored: str) -> Tuple[bool, bool]:
+    """Verify a password without blocking the event loop. See verify_password_sync"""
+    return await _run(verify_password_sync, password, stored)
+
+
+# Verified against when the email is unknown, so both paths cost one hash
+DUMMY_HASH = hash_password_sync(base64.b64encode(os.urandom(12)).decode())
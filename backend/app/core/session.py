@@ -0,0 +1,432 @@
+"""
+Server-side session storage.
+
+The session cookie only carries a random ID. Session data lives in a
+pluggable backend: an in-process LRU with TTL, or any server speaking the
+Redis protocol. ServerSessionMiddleware exposes the data as
+`request.session`, so code written against Starlette's SessionMiddleware
+keeps working.
+"""
+import asyncio
+import json
+import secrets
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+from urllib.parse import urlparse
+from starlette.datastructures import MutableHeaders
+from starlette.requests import HTTPConnection
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.settings import settings
+
+
+class ServerSession(dict):
+    """Session data plus the bookkeeping the middleware needs to persist it"""
+
+    def __init__(self, sid: Optional[str] = None, data: Optional[Dict[str, Any]] = None) -> None:
+        super().__init__(data or {})
+        self.sid = sid
+        self.modified = False
+        self.rotate = False
+
+    def regenerate(self) -> None:
+        """Issue a fresh session ID on save, e.g. after login"""
+        self.rotate = True
+        self.modified = True
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self.modified = True
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key: str) -> None:
+        self.modified = True
+        super().__delitem__(key)
+
+    def clear(self) -> None:
+        self.modified = True
+        super().clear()
+
+    def pop(self, *args: Any) -> Any:
+        self.modified = True
+        return super().pop(*args)
+
+    def update(self, *args: Any, **kwargs: Any) -> None:
+        self.modified = True
+        super().update(*args, **kwargs)
+
+    def setdefault(self, key: str, default: Any = None) -> Any:
+        if key not in self:
+            self.modified = True
+        return super().setdefault(key, default)
+
+
+class SessionBackend(ABC):
+    """Storage interface for session data"""
+
+    name = "abstract"
+
+    @abstractmethod
+    async def load(self, sid: str) -> Optional[Dict[str, Any]]:
+        """Return the session data, or None if missing or expired"""
+
+    @abstractmethod
+    async def save(self, sid: str, data: Dict[str, Any], ttl: int) -> None:
+        """Store session data for `ttl` seconds"""
+
+    @abstractmethod
+    async def touch(self, sid: str, ttl: int, user_id: Any = None) -> None:
+        """Push the session's expiry `ttl` seconds into the future, along with the user's session index"""
+
+    @abstractmethod
+    async def delete(self, sid: str) -> None:
+        """Remove a session"""
+
+    @abstractmethod
+    async def revoke_user(self, user_id: int) -> int:
+        """Remove every session belonging to a user. Returns how many were removed"""
+
+    @abstractmethod
+    async def count(self) -> int:
+        """Number of live sessions"""
+
+    async def close(self) -> None:
+        """Release any resources held by the backend"""
+
+
+class MemorySessionBackend(SessionBackend):
+    """Per-process LRU of sessions with TTL expiry.
+
+    Sessions are not shared between worker processes; use the Redis backend
+    when running more than one.
+    """
+
+    name = "memory"
+
+    def __init__(self, max_entries: int = 100_000) -> None:
+        self.max_entries = max_entries
+        self._sessions: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._by_user: Dict[Any, Set[str]] = {}
+
+    def _forget(self, sid: str) -> None:
+        entry = self._sessions.pop(sid, None)
+        if entry is not None:
+            user_id = entry[1].get("user_id")
+            sids = self._by_user.get(user_id)
+            if sids is not None:
+                sids.discard(sid)
+                if not sids:
+                    del self._by_user[user_id]
+
+    async def load(self, sid: str) -> Optional[Dict[str, Any]]:
+        entry = self._sessions.get(sid)
+        if entry is None:
+            return None
+        if entry[0] < time.monotonic():
+            self._forget(sid)
+            return None
+        self._sessions.move_to_end(sid)
+        return dict(entry[1])
+
+    async def save(self, sid: str, data: Dict[str, Any], ttl: int) -> None:
+        self._forget(sid)
+        self._sessions[sid] = (time.monotonic() + ttl, dict(data))
+        user_id = data.get("user_id")
+        if user_id is not None:
+            self._by_user.setdefault(user_id, set()).add(sid)
+        while len(self._sessions) > self.max_entries:
+            self._forget(next(iter(self._sessions)))
+
+    async def touch(self, sid: str, ttl: int, user_id: Any = None) -> None:
+        entry = self._sessions.get(sid)
+        if entry is not None:
+            self._sessions[sid] = (time.monotonic() + ttl, entry[1])
+            self._sessions.move_to_end(sid)
+
+    async def delete(self, sid: str) -> None:
+        self._forget(sid)
+
+    async def revoke_user(self, user_id: int) -> int:
+        sids = list(self._by_user.get(user_id, ()))
+        for sid in sids:
+            self._forget(sid)
+        return len(sids)
+
+    async def count(self) -> int:
+        now = time.monotonic()
+        for sid in [sid for sid, (expires_at, _) in self._sessions.items() if expires_at < now]:
+            self._forget(sid)
+        return len(self._sessions)
+
+
+class RedisProtocolError(Exception):
+    """Error reply or malformed response from a Redis-protocol server"""
+
+
+class RespConnection:
+    """One connection to a Redis-protocol server (RESP2)"""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.reader = reader
+        self.writer = writer
+
+    @staticmethod
+    def _encode(*args: Any) -> bytes:
+        parts = [b"*%d\r\n" % len(args)]
+        for arg in args:
+            value = arg if isinstance(arg, bytes) else str(arg).encode()
+            parts.append(b"$%d\r\n%s\r\n" % (len(value), value))
+        return b"".join(parts)
+
+    async def read(self) -> Any:
+        """Read one reply; error replies are returned, not raised"""
+        line = await self.reader.readline()
+        if not line:
+            raise ConnectionError("connection closed by server")
+        kind, payload = line[:1], line[1:-2]
+        if kind == b"+":
+            return payload.decode()
+        if kind == b"-":
+            return RedisProtocolError(payload.decode())
+        if kind == b":":
+            return int(payload)
+        if kind == b"$":
+            length = int(payload)
+            if length < 0:
+                return None
+            data = await self.reader.readexactly(length + 2)
+            return data[:-2]
+        if kind == b"*":
+            length = int(payload)
+            if length < 0:
+                return None
+            return [await self.read() for _ in range(length)]
+        raise RedisProtocolError(f"unexpected reply: {line!r}")
+
+    async def pipeline(self, *commands: Sequence[Any]) -> List[Any]:
+        """Send every command in one write and read all the replies.
+
+        Error replies are read like any other so the connection stays in
+        step, then the first one is raised.
+        """
+        self.writer.write(b"".join(self._encode(*command) for command in commands))
+        await self.writer.drain()
+        replies = [await self.read() for _ in commands]
+        for reply in replies:
+            if isinstance(reply, RedisProtocolError):
+                raise reply
+        return replies
+
+    async def close(self) -> None:
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except (ConnectionError, OSError):
+            pass
+
+
+class RespClient:
+    """Minimal asyncio client for the Redis serialization protocol (RESP2).
+
+    Keeps up to `max_connections` connections, each running one command or
+    pipeline at a time. Idle connections are reused; callers wait when all
+    are busy. A connection that fails or is interrupted mid-reply is closed
+    rather than returned, and replaced lazily.
+    """
+
+    def __init__(self, url: str, max_connections: int = 10) -> None:
+        parsed = urlparse(url)
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or 6379
+        self.password = parsed.password
+        self.db = int(parsed.path.lstrip("/") or 0)
+        self.max_connections = max_connections
+        self._idle: List[RespConnection] = []
+        self._slots = asyncio.Semaphore(max_connections)
+
+    async def _connect(self) -> RespConnection:
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        connection = RespConnection(reader, writer)
+        try:
+            if self.password:
+                await connection.pipeline(("AUTH", self.password))
+            if self.db:
+                await connection.pipeline(("SELECT", self.db))
+        except BaseException:
+            await connection.close()
+            raise
+        return connection
+
+    async def pipeline(self, *commands: Sequence[Any]) -> List[Any]:
+        """Run several commands in one round trip on a pooled connection"""
+        async with self._slots:
+            connection = self._idle.pop() if self._idle else await self._connect()
+            try:
+                replies = await connection.pipeline(*commands)
+            except RedisProtocolError:
+                self._idle.append(connection)
+                raise
+            except BaseException:
+                await connection.close()
+                raise
+            self._idle.append(connection)
+            return replies
+
+    async def execute(self, *args: Any) -> Any:
+        return (await self.pipeline(args))[0]
+
+    async def subscribe(self, channel: str) -> RespConnection:
+        """A dedicated connection, outside the pool, subscribed to `channel`; read messages from it"""
+        connection = await self._connect()
+        try:
+            await connection.pipeline(("SUBSCRIBE", channel))
+        except BaseException:
+            await connection.close()
+            raise
+        return connection
+
+    async def close(self) -> None:
+        idle, self._idle = self._idle, []
+        for connection in idle:
+            await connection.close()
+
+
+class RedisSessionBackend(SessionBackend):
+    """Sessions stored as JSON strings in a Redis-protocol server, shared by all workers"""
+
+    name = "redis"
+
+    def __init__(self, url: str, prefix: str = "sess:", max_connections: int = 10) -> None:
+        self.client = RespClient(url, max_connections=max_connections)
+        self.prefix = prefix
+        self.user_prefix = prefix.rstrip(":") + "user:"
+
+    def _key(self, sid: str) -> str:
+        return self.prefix + sid
+
+    async def load(self, sid: str) -> Optional[Dict[str, Any]]:
+        raw = await self.client.execute("GET", self._key(sid))
+        return json.loads(raw) if raw is not None else None
+
+    async def save(self, sid: str, data: Dict[str, Any], ttl: int) -> None:
+        commands: List[Tuple[Any, ...]] = [("SET", self._key(sid), json.dumps(data), "EX", ttl)]
+        user_id = data.get("user_id")
+        if user_id is not None:
+            user_key = f"{self.user_prefix}{user_id}"
+            commands += [("SADD", user_key, sid), ("EXPIRE", user_key, ttl)]
+        await self.client.pipeline(*commands)
+
+    async def touch(self, sid: str, ttl: int, user_id: Any = None) -> None:
+        # The user's index must outlive every session in it, or revoke_user misses them
+        commands: List[Tuple[Any, ...]] = [("EXPIRE", self._key(sid), ttl)]
+        if user_id is not None:
+            commands.append(("EXPIRE", f"{self.user_prefix}{user_id}", ttl))
+        await self.client.pipeline(*commands)
+
+    async def delete(self, sid: str) -> None:
+        await self.client.execute("DEL", self._key(sid))
+
+    async def revoke_user(self, user_id: int) -> int:
+        user_key = f"{self.user_prefix}{user_id}"
+        sids = await self.client.execute("SMEMBERS", user_key) or []
+        removed = 0
+        if sids:
+            removed = await self.client.execute("DEL", *[self._key(sid.decode()) for sid in sids])
+        await self.client.execute("DEL", user_key)
+        return removed
+
+    async def count(self) -> int:
+        total, cursor = 0, b"0"
+        while True:
+            cursor, keys = await self.client.execute("SCAN", cursor, "MATCH", self.prefix + "*", "COUNT", 1000)
+            total += len(keys)
+            if cursor in (b"0", "0"):
+                return total
+
+    async def close(self) -> None:
+        await self.client.close()
+
+
+class ServerSessionMiddleware:
+    """ASGI middleware loading `request.session` from a SessionBackend.
+
+    Expiry slides: every request that carries a live session pushes its TTL
+    forward and refreshes the cookie's Max-Age.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        backend: SessionBackend,
+        cookie_name: str = "session",
+        max_age: int = 86400,
+        same_site: str = "lax",
+        https_only: bool = False,
+    ) -> None:
+        self.app = app
+        self.backend = backend
+        self.cookie_name = cookie_name
+        self.max_age = max_age
+        self.security_flags = f"httponly; samesite={same_site}" + ("; secure" if https_only else "")
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] not in ("http", "websocket"):
+            await self.app(scope, receive, send)
+            return
+
+        connection = HTTPConnection(scope)
+        sid = connection.cookies.get(self.cookie_name)
+        data = await self.backend.load(sid) if sid else None
+        session = ServerSession(sid if data is not None else None, data)
+        scope["session"] = session
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                cookie = await self._persist(session, sid)
+                if cookie is not None:
+                    headers = MutableHeaders(scope=message)
+                    headers.append("Set-Cookie", cookie)
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+    async def _persist(self, session: ServerSession, incoming_sid: Optional[str]) -> Optional[str]:
+        """Write session changes to the backend and return the Set-Cookie value, if any"""
+        if not session:
+            if session.sid is not None:
+                await self.backend.delete(session.sid)
+            if incoming_sid:
+                return self._cookie("null", 0)
+            return None
+
+        if session.modified:
+            if session.rotate and session.sid is not None:
+                await self.backend.delete(session.sid)
+                session.sid = None
+            if session.sid is None:
+                session.sid = secrets.token_urlsafe(32)
+            await self.backend.save(session.sid, dict(session), self.max_age)
+        else:
+            await self.backend.touch(session.sid, self.max_age, session.get("user_id"))
+        return self._cookie(session.sid, self.max_age)
+
+    def _cookie(self, value: str, max_age: int) -> str:
+        expires = "expires=Thu, 01 Jan 1970 00:00:00 GMT; " if max_age == 0 else ""
+        return f"{self.cookie_name}={value}; path=/; {expires}Max-Age={max_age}; {self.security_flags}"
+
+
+def create_session_backend(backend: str, redis_url: str, max_entries: int, redis_max_connections: int = 10) -> SessionBackend:
+    """Build the backend named in settings"""
+    if backend == "memory":
+        return MemorySessionBackend(max_entries=max_entries)
+    if backend == "redis":
+        return RedisSessionBackend(redis_url, max_connections=redis_max_connections)
+    raise ValueError(f"Unknown SESSION_BACKEND '{backend}', expected 'memory' or 'redis'")
+
+
+session_store = create_session_backend(
+    settings.SESSION_BACKEND,
+    settings.SESSION_REDIS_URL,
+    settings.SESSION_MAX_ENTRIES,
+    settings.SESSION_REDIS_MAX_CONNECTIONS,
+)
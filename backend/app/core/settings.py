@@ -20,8 +20,101 @@ class Settings(BaseSettings):
     PORT: int = 8000
     RELOAD: bool = True
 
+    # Production serving (python serve.py): worker processes (0 = one per available
+    # core), requests before a worker is replaced (0 = never) with random jitter so
+    # workers do not restart together, and seconds to finish in-flight requests on restart
+    WEB_CONCURRENCY: int = 0
+    WORKER_MAX_REQUESTS: int = 10_000
+    WORKER_MAX_REQUESTS_JITTER: int = 1_000
+    WORKER_GRACEFUL_TIMEOUT: int = 30
+
     DATABASE_URL: str
     DATABASE_ECHO: bool = False
 
-settings = Settings()
+    # Connection pool tuning (ignored for SQLite URLs)
+    DATABASE_POOL_SIZE: int = 10
+    DATABASE_MAX_OVERFLOW: int = 20
+    DATABASE_POOL_TIMEOUT: float = 30.0
+    DATABASE_POOL_RECYCLE: int = 1800
+    DATABASE_POOL_PRE_PING: bool = True
+    DATABASE_STATEMENT_CACHE_SIZE: int = 100
+    # Connections all serving workers together may open per database server; when set,
+    # each worker's pool is capped at its share (0 = pool size and overflow per worker)
+    DATABASE_MAX_CONNECTIONS: int = 0
+
+    # Read replicas (comma-separated URLs); GET/HEAD requests read from them round-robin
+    DATABASE_REPLICA_URLS: str = ""
+    # Seconds an authenticated user's reads stay on the primary after their own write
+    DATABASE_READ_YOUR_WRITES_SECONDS: float = 5.0
+    # Replicas lagging more than this many seconds, or failing to connect, sit out for the retry period
+    DATABASE_REPLICA_MAX_LAG: float = 10.0
+    DATABASE_REPLICA_RETRY_SECONDS: float = 30.0
+    DATABASE_REPLICA_LAG_CHECK_INTERVAL: float = 5.0
+
+    # Startup warmup: open DATABASE_POOL_SIZE connections per engine, and load the
+    # autocomplete index and similarity matrix, before the first request is served
+    STARTUP_WARM_POOL: bool = True
+    STARTUP_WARM_CACHES: bool = True
+
+    # Authenticated user lookup cache (per process)
+    USER_CACHE_MAXSIZE: int = 1024
+    USER_CACHE_TTL: float = 60.0
+
+    # Seconds before the in-process skill name autocomplete index is reloaded
+    SKILL_NAME_INDEX_TTL: float = 300.0
+
+    # Seconds before the in-process skill similarity matrix is rebuilt
+    SIMILARITY_MATRIX_TTL: float = 600.0
+
+    # Skill level history write-behind queue: flush period, rows per INSERT, and
+    # the most rows held in memory before new ones are dropped
+    SKILL_HISTORY_FLUSH_INTERVAL: float = 1.0
+    SKILL_HISTORY_BATCH_SIZE: int = 500
+    SKILL_HISTORY_MAX_PENDING: int = 100_000
 
+    # Avatars: content-addressed store directory, thumbnail edge lengths, resize
+    # threads, upload limit, and where external avatar URLs are fetched from
+    # ("http", or "local" to draw stand-in images offline)
+    AVATAR_STORAGE_DIR: str = "data/avatars"
+    AVATAR_SIZES: str = "80,160,240"
+    AVATAR_WORKERS: int = 2
+    AVATAR_MAX_BYTES: int = 5 * 1024 * 1024
+    AVATAR_SOURCE: str = "http"
+    AVATAR_FETCH_TIMEOUT: float = 10.0
+
+    # Rows fetched per server-side cursor round trip (and encoded per chunk) by /export
+    EXPORT_CHUNK_SIZE: int = 1000
+
+    # Bulk import: rows validated and loaded per transaction, and error rows reported
+    IMPORT_BATCH_SIZE: int = 5000
+    IMPORT_MAX_ERRORS: int = 1000
+    # Comma-separated emails allowed to use POST /import; empty leaves bulk import to the CLI
+    IMPORT_ADMIN_EMAILS: str = ""
+
+    # Per-request metrics at /metrics and the Server-Timing response header
+    METRICS_ENABLED: bool = True
+    SERVER_TIMING_ENABLED: bool = True
+
+    # Query budgets declared with @query_budget: "off", "log" (warn) or "raise" (respond 500)
+    QUERY_BUDGET_MODE: str = "off"
+    # A statement run more often than this in one request is reported as N+1
+    QUERY_REPEAT_THRESHOLD: int = 5
+
+    # Password hashing (scrypt) and the worker pool it runs in
+    PASSWORD_SCRYPT_N: int = 2 ** 14
+    PASSWORD_SCRYPT_R: int = 8
+    PASSWORD_SCRYPT_P: int = 1
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_CONCURRENCY: int = 16
+
+    # Server-side sessions: "memory" (per process) or "redis" (any Redis-protocol server)
+    SESSION_BACKEND: str = "memory"
+    SESSION_REDIS_URL: str = "redis://localhost:6379/0"
+    SESSION_REDIS_MAX_CONNECTIONS: int = 10
+    # Pub/sub channel on the session Redis that keeps per-worker caches in step
+    CACHE_BUS_CHANNEL: str = "cache"
+    SESSION_TTL: int = 86400
+    SESSION_MAX_ENTRIES: int = 100_000
+    SESSION_COOKIE_NAME: str = "session"
+
+settings = Settings()
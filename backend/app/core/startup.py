@@ -0,0 +1,56 @@
+"""
+Startup timing: how long imports and each warmup step took before serving
+"""
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class StartupTimer:
+    """Records the duration of each warmup step, counted from module import.
+
+    A failing step is logged and recorded, not raised: the app still starts
+    and falls back to connecting and loading caches lazily.
+    """
+
+    def __init__(self) -> None:
+        self.started_at = time.perf_counter()
+        self.steps: Dict[str, float] = {}
+        self.errors: Dict[str, str] = {}
+        self.ready_after: Optional[float] = None
+
+    def mark(self, name: str) -> None:
+        """Record the time since this module was imported under `name`"""
+        self.steps[name] = time.perf_counter() - self.started_at
+
+    @asynccontextmanager
+    async def step(self, name: str):
+        begun = time.perf_counter()
+        try:
+            yield
+        except Exception as exc:
+            self.errors[name] = str(exc).splitlines()[0] if str(exc) else type(exc).__name__
+            logger.warning("Startup step %s failed: %s", name, self.errors[name])
+        self.steps[name] = time.perf_counter() - begun
+
+    def ready(self) -> None:
+        self.ready_after = time.perf_counter() - self.started_at
+        logger.info(
+            "Ready to serve after %.0f ms (%s)",
+            self.ready_after * 1000,
+            ", ".join(f"{name} {seconds * 1000:.0f} ms" for name, seconds in self.steps.items()),
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "ready_after_seconds": None if self.ready_after is None else round(self.ready_after, 4),
+            "steps": {name: round(seconds, 4) for name, seconds in self.steps.items()},
+            "errors": self.errors,
+        }
+
+
+# Created when main.py first imports this module, before the routers and services
+startup_timer = StartupTimer()
@@ -0,0 +1,65 @@
+"""
+Worker process sizing for multi-process serving
+"""
+import math
+import os
+from typing import Optional
+from app.core.settings import settings
+
+# Set by serve.py to the worker count it forks; unset for single-process servers such as main.py
+SERVE_WORKERS_ENV = "SERVE_WORKERS"
+
+# cgroup v2 and v1 files holding the container's CPU quota
+CGROUP_V2_CPU_MAX = "/sys/fs/cgroup/cpu.max"
+CGROUP_V1_QUOTA = "/sys/fs/cgroup/cpu/cpu.cfs_quota_us"
+CGROUP_V1_PERIOD = "/sys/fs/cgroup/cpu/cpu.cfs_period_us"
+
+
+def _read(path: str) -> Optional[str]:
+    try:
+        with open(path) as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def _cgroup_cpu_limit() -> Optional[float]:
+    """CPUs allowed by the container's quota (e.g. `docker run --cpus`), if any"""
+    cpu_max = _read(CGROUP_V2_CPU_MAX)
+    if cpu_max:
+        quota, _, period = cpu_max.partition(" ")
+        if quota != "max" and period:
+            return int(quota) / int(period)
+        return None
+    quota, period = _read(CGROUP_V1_QUOTA), _read(CGROUP_V1_PERIOD)
+    if quota and period and int(quota) > 0:
+        return int(quota) / int(period)
+    return None
+
+
+def available_cpus() -> int:
+    """Cores this process may run on: CPU affinity, capped by any cgroup quota"""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+    limit = _cgroup_cpu_limit()
+    if limit is not None:
+        cpus = min(cpus, max(1, math.ceil(limit)))
+    return max(1, cpus)
+
+
+def worker_count() -> int:
+    """Processes serve.py should fork: WEB_CONCURRENCY, or when unset one per
+    available core with shared Redis sessions and a single one otherwise"""
+    if settings.WEB_CONCURRENCY > 0:
+        return settings.WEB_CONCURRENCY
+    return available_cpus() if settings.SESSION_BACKEND == "redis" else 1
+
+
+def serving_workers() -> int:
+    """Worker processes sharing this server's budgets: what serve.py forked, else 1"""
+    try:
+        return max(1, int(os.environ.get(SERVE_WORKERS_ENV, "1")))
+    except ValueError:
+        return 1
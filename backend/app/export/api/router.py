@@ -0,0 +1,11 @@
+from fastapi import APIRouter
+from .v1.export import router as export_v1_router
+
+router = APIRouter()
+
+# Include v1 routes
+router.include_router(
+    export_v1_router,
+    prefix="/v1/export",
+    tags=["export"]
+)
@@ -0,0 +1,27 @@
+from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
+from typing import Literal
+from app.core.auth import get_current_user
+from app.user.schema.user import UserResponse
+from ...service.export_service import ExportService
+
+router = APIRouter()
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+@router.get("", response_class=StreamingResponse)
+async def export_users(
+    format: Literal["ndjson", "csv"] = "ndjson",
+    current_user: UserResponse = Depends(get_current_user)
+):
+    """Stream every user with their skills as NDJSON (one user per line) or CSV (one skill per line)"""
+    body = ExportService.export_csv() if format == "csv" else ExportService.export_ndjson()
+    return StreamingResponse(
+        body,
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="users.{format}"'}
+    )
@@ -0,0 +1,3 @@
+from .export_service import ExportService
+
+__all__ = ["ExportService"]
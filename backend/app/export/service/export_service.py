@@ -0,0 +1,91 @@
+import csv
+import io
+import json
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional
+from sqlalchemy import select
+from app.core.settings import settings
+from database.database import async_session_factory
+from ...user.model.user import User
+from ...skill.model.skill import Skill
+
+
+USER_COLUMNS = ["id", "name", "position", "email", "avatar_url", "created_at", "updated_at"]
+SKILL_COLUMNS = ["id", "name", "category", "description", "level", "created_at", "updated_at"]
+
+CSV_HEADER = [f"user_{column}" for column in USER_COLUMNS] + [f"skill_{column}" for column in SKILL_COLUMNS]
+
+
+def _json_default(value: Any) -> str:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def _export_query():
+    """Users LEFT JOIN skills as plain columns, grouped by user through the ordering"""
+    return (
+        select(
+            *(getattr(User, column) for column in USER_COLUMNS),
+            *(getattr(Skill, column) for column in SKILL_COLUMNS),
+        )
+        .outerjoin(Skill, Skill.user_id == User.id)
+        .order_by(User.id, Skill.id)
+        .execution_options(yield_per=settings.EXPORT_CHUNK_SIZE)
+    )
+
+
+class ExportService:
+    """Service class for streaming full-table exports"""
+
+    @staticmethod
+    async def stream_rows(chunk_size: Optional[int] = None) -> AsyncIterator[List[tuple]]:
+        """Yield user/skill rows in chunks read from a server-side cursor.
+
+        Opens its own session: a streaming response outlives the request's
+        dependency-managed session. Only one chunk is held in memory at a time.
+        """
+        chunk_size = chunk_size or settings.EXPORT_CHUNK_SIZE
+        async with async_session_factory() as db:
+            result = await db.stream(_export_query())
+            try:
+                async for rows in result.partitions(chunk_size):
+                    yield rows
+            finally:
+                await result.close()
+
+    @staticmethod
+    async def export_ndjson(chunk_size: Optional[int] = None) -> AsyncIterator[bytes]:
+        """One JSON object per user with a nested `skills` list, one line each"""
+        user_width = len(USER_COLUMNS)
+        current: Optional[Dict[str, Any]] = None
+        async for rows in ExportService.stream_rows(chunk_size):
+            lines = []
+            for row in rows:
+                if current is None or current["id"] != row[0]:
+                    if current is not None:
+                        lines.append(json.dumps(current, default=_json_default))
+                    current = dict(zip(USER_COLUMNS, row[:user_width]))
+                    current["skills"] = []
+                if row[user_width] is not None:
+                    current["skills"].append(dict(zip(SKILL_COLUMNS, row[user_width:])))
+            if lines:
+                yield ("\n".join(lines) + "\n").encode()
+        if current is not None:
+            yield (json.dumps(current, default=_json_default) + "\n").encode()
+
+    @staticmethod
+    async def export_csv(chunk_size: Optional[int] = None) -> AsyncIterator[bytes]:
+        """One CSV line per (user, skill) pair; users without skills get empty skill columns"""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(CSV_HEADER)
+        yield buffer.getvalue().encode()
+        async for rows in ExportService.stream_rows(chunk_size):
+            buffer.seek(0)
+            buffer.truncate()
+            writer.writerows(
+                [value.isoformat() if isinstance(value, datetime) else value for value in row]
+                for row in rows
+            )
+            yield buffer.getvalue().encode()
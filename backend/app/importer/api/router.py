@@ -0,0 +1,11 @@
+from fastapi import APIRouter
+from .v1.importer import router as import_v1_router
+
+router = APIRouter()
+
+# Include v1 routes
+router.include_router(
+    import_v1_router,
+    prefix="/v1/import",
+    tags=["import"]
+)
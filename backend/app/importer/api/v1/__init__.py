@@ -0,0 +1,3 @@
+from .importer import router
+
+__all__ = ["router"]
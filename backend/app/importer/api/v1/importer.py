@@ -0,0 +1,54 @@
+import io
+import tempfile
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Literal
+from database.database import get_session
+from app.core.auth import get_current_user
+from app.core.responses import json_response
+from app.core.query_budget import query_budget
+from app.core.settings import settings
+from app.user.schema.user import UserResponse
+from ...schema.importer import ImportResult
+from ...service.import_service import ImportService
+
+router = APIRouter()
+
+# Uploads larger than this are spooled to disk instead of memory
+SPOOL_MAX_SIZE = 16 * 1024 * 1024
+
+
+def is_import_admin(email: str) -> bool:
+    """Whether `email` is listed in IMPORT_ADMIN_EMAILS"""
+    admins = {admin.strip().lower() for admin in settings.IMPORT_ADMIN_EMAILS.split(",") if admin.strip()}
+    return email.lower() in admins
+
+
+@router.post("", response_model=ImportResult)
+@query_budget(None, max_repeats=None)
+async def import_users_and_skills(
+    request: Request,
+    format: Literal["csv", "ndjson"] = "csv",
+    current_user: UserResponse = Depends(get_current_user),
+    db: AsyncSession = Depends(get_session)
+):
+    """Create or update users and their skills from a CSV or NDJSON request body.
+
+    Accepts the same layouts /export produces (plus a password or precomputed
+    password_hash column for new users) and returns counts with a per-row error report. An import can
+    create accounts and overwrite anyone's profile and skills, so only the
+    users listed in IMPORT_ADMIN_EMAILS may call it.
+    """
+    if not is_import_admin(current_user.email):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Bulk import is restricted to administrators"
+        )
+    with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE) as spool:
+        async for chunk in request.stream():
+            spool.write(chunk)
+        spool.seek(0)
+        lines = io.TextIOWrapper(spool, encoding="utf-8-sig", newline="")
+        records = ImportService.parse_csv(lines) if format == "csv" else ImportService.parse_ndjson(lines)
+        result = await ImportService.import_records(db, records)
+    return json_response(ImportResult, result)
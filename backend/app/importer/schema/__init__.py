@@ -0,0 +1,3 @@
+from .importer import ImportRowError, ImportResult
+
+__all__ = ["ImportRowError", "ImportResult"]
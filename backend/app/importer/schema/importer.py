@@ -0,0 +1,44 @@
+from pydantic import BaseModel, Field, field_validator, model_validator
+from typing import List, Optional
+from app.core.security import is_password_hash
+from app.user.schema.user import UserBase
+
+
+class ImportUserCreate(UserBase):
+    """A user row creating an account: a password, or a hash made elsewhere"""
+    password: Optional[str] = Field(None, min_length=6, max_length=255, description="Password, hashed on import")
+    password_hash: Optional[str] = Field(
+        None, max_length=255, description="Stored as is: a scrypt$n$r$p$salt$key hash, e.g. from hash_password_sync"
+    )
+    avatar_url: Optional[str] = Field(None, max_length=500, description="URL to user's avatar image")
+
+    @field_validator("password_hash")
+    @classmethod
+    def check_password_hash(cls, value: Optional[str]) -> Optional[str]:
+        if value is not None and not is_password_hash(value):
+            raise ValueError("Expected a scrypt$n$r$p$salt$key hash")
+        return value
+
+    @model_validator(mode="after")
+    def check_one_credential(self) -> "ImportUserCreate":
+        if (self.password is None) == (self.password_hash is None):
+            raise ValueError("Give either password or password_hash")
+        return self
+
+
+class ImportRowError(BaseModel):
+    """A rejected input row"""
+    line: int = Field(..., description="Line number in the uploaded file")
+    email: Optional[str] = Field(None, description="User email on the row, when present")
+    detail: str = Field(..., description="Why the row was rejected")
+
+
+class ImportResult(BaseModel):
+    """Summary of a bulk import"""
+    rows: int = Field(0, description="Input rows read")
+    users_created: int = Field(0, description="New users inserted")
+    users_updated: int = Field(0, description="Existing users whose profile was updated")
+    skills_created: int = Field(0, description="New skills inserted")
+    skills_updated: int = Field(0, description="Existing skills (same user and name) overwritten")
+    error_count: int = Field(0, description="Total rejected rows or skills")
+    errors: List[ImportRowError] = Field(default=[], description="Rejected rows, capped at IMPORT_MAX_ERRORS")
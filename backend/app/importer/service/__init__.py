@@ -0,0 +1,3 @@
+from .import_service import ImportService
+
+__all__ = ["ImportService"]
@@ -0,0 +1,385 @@
+import asyncio
+import csv
+import json
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import Table, MetaData, Column, Integer, String, Float, select, insert, update, delete, exists, and_, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.responses import adapter_for
+from app.core.security import hash_password
+from app.core.settings import settings
+from ...user.model.user import User
+from ...user.schema.user import UserUpdate
+from ...user.service.user_service import user_cache
+from ...skill.model.skill import Skill
+from ...skill.schema.skill import SkillBase
+from ...skill.service.skill_stats_service import SkillStatsService, StatsDelta
+from ...skill.service.similarity_service import skill_matrix
+from ...skill.service.skill_name_index import skill_name_index
+from ..schema.importer import ImportRowError, ImportResult, ImportUserCreate
+
+
+# Per-connection temporary tables, kept out of Base.metadata so migrations
+# never see them. They are created once per connection and reused, so plans
+# cached against them stay valid; PostgreSQL empties them on commit.
+_staging = MetaData()
+
+user_staging = Table(
+    "import_user_staging",
+    _staging,
+    Column("line", Integer, nullable=False),
+    Column("email", String(100), nullable=False),
+    Column("name", String(100)),
+    Column("position", String(100)),
+    Column("avatar_url", String(500)),
+    Column("password", String(255)),
+    prefixes=["TEMPORARY"],
+    postgresql_on_commit="DELETE ROWS",
+)
+
+skill_staging = Table(
+    "import_skill_staging",
+    _staging,
+    Column("line", Integer, nullable=False),
+    Column("user_id", Integer, nullable=False),
+    Column("name", String(100), nullable=False),
+    Column("category", String(100), nullable=False),
+    Column("description", String(500)),
+    Column("level", Float, nullable=False),
+    prefixes=["TEMPORARY"],
+    postgresql_on_commit="DELETE ROWS",
+)
+
+
+class ImportRecord(NamedTuple):
+    """One parsed input row: user fields plus (label, fields) for each skill"""
+    line: int
+    user: Dict[str, Any]
+    skills: List[Tuple[str, Dict[str, Any]]]
+    error: Optional[str] = None
+
+
+def _validate(model: type, items: List[Any]) -> Tuple[Dict[int, BaseModel], Dict[int, str]]:
+    """Validate a batch in one pydantic call, falling back to the passing rows on error"""
+    if not items:
+        return {}, {}
+    adapter = adapter_for(List[model])
+    try:
+        return dict(enumerate(adapter.validate_python(items))), {}
+    except ValidationError as exc:
+        errors: Dict[int, List[str]] = {}
+        for error in exc.errors():
+            index, *loc = error["loc"]
+            field = ".".join(str(part) for part in loc)
+            errors.setdefault(index, []).append(f"{field}: {error['msg']}" if field else error["msg"])
+    passing = [index for index in range(len(items)) if index not in errors]
+    valid = adapter.validate_python([items[index] for index in passing])
+    return dict(zip(passing, valid)), {index: "; ".join(messages) for index, messages in errors.items()}
+
+
+async def _stage(db: AsyncSession, table: Table, rows: List[dict]) -> None:
+    """Load rows into a staging table, with COPY when the driver is asyncpg"""
+    conn = await db.connection()
+    await conn.run_sync(table.create, checkfirst=True)
+    await conn.execute(delete(table))
+    if conn.dialect.driver == "asyncpg":
+        columns = [column.name for column in table.columns]
+        raw = await conn.get_raw_connection()
+        await raw.driver_connection.copy_records_to_table(
+            table.name,
+            records=[tuple(row[column] for column in columns) for row in rows],
+            columns=columns,
+        )
+    else:
+        await conn.execute(insert(table), rows)
+
+
+class ImportService:
+    """Service class for bulk loading users and skills"""
+
+    @staticmethod
+    def parse_csv(lines: Iterable[str]) -> Iterator[ImportRecord]:
+        """Rows shaped like the /export CSV: user_* columns plus optional skill_* columns.
+
+        Empty cells count as missing and unknown columns (ids, timestamps) are ignored.
+        """
+        reader = csv.reader(lines)
+        header = next(reader, None) or []
+        # (index, field) per column, split by prefix once rather than per row
+        user_columns = [(index, key[5:]) for index, key in enumerate(header) if key.startswith("user_")]
+        skill_columns = [(index, key[6:]) for index, key in enumerate(header) if key.startswith("skill_")]
+        for row in reader:
+            if not row:
+                continue
+            width = len(row)
+            user = {key: row[index] for index, key in user_columns if index < width and row[index] != ""}
+            skill = {key: row[index] for index, key in skill_columns if index < width and row[index] != ""}
+            yield ImportRecord(reader.line_num, user, [("skill", skill)] if skill else [])
+
+    @staticmethod
+    def parse_ndjson(lines: Iterable[str]) -> Iterator[ImportRecord]:
+        """Lines shaped like the /export NDJSON: a user object with an optional `skills` list"""
+        for line_number, line in enumerate(lines, 1):
+            if not line.strip():
+                continue
+            try:
+                user = json.loads(line)
+            except ValueError as exc:
+                yield ImportRecord(line_number, {}, [], f"Invalid JSON: {exc}")
+                continue
+            if not isinstance(user, dict):
+                yield ImportRecord(line_number, {}, [], "Expected a JSON object")
+                continue
+            skills = user.pop("skills", None) or []
+            if not isinstance(skills, list):
+                yield ImportRecord(line_number, user, [], "skills: Input should be a valid list")
+                continue
+            yield ImportRecord(
+                line_number, user, [(f"skills[{index}]", skill) for index, skill in enumerate(skills)]
+            )
+
+    @staticmethod
+    async def import_records(
+        db: AsyncSession, records: Iterable[ImportRecord], batch_size: Optional[int] = None
+    ) -> ImportResult:
+        """Create or update users and skills from parsed records, one transaction per batch.
+
+        A record with a password, or a precomputed `password_hash`, creates the
+        user, or updates the profile of an existing user with that email (the
+        password is then left alone). Plain passwords are hashed here, which
+        bounds the rate of new users; hashes are stored as given.
+        Without a password the email must already exist; any profile fields
+        given are updated. The first record for an email defines the user;
+        later ones only attach skills. Skills are keyed by (user, name): an
+        existing one is overwritten, otherwise it is inserted. Bad rows are
+        reported and skipped without failing the rest of the batch.
+        """
+        batch_size = batch_size or settings.IMPORT_BATCH_SIZE
+        result = ImportResult()
+        seen: Set[str] = set()
+        records = iter(records)
+        while True:
+            batch = list(islice(records, batch_size))
+            if not batch:
+                break
+            result.rows += len(batch)
+            await ImportService._import_batch(db, batch, seen, result)
+        result.errors.sort(key=lambda error: error.line)
+        return result
+
+    @staticmethod
+    def _reject(result: ImportResult, line: int, email: Optional[str], detail: str) -> None:
+        result.error_count += 1
+        if len(result.errors) < settings.IMPORT_MAX_ERRORS:
+            result.errors.append(ImportRowError(line=line, email=email, detail=detail))
+
+    @staticmethod
+    async def _import_batch(
+        db: AsyncSession, batch: List[ImportRecord], seen: Set[str], result: ImportResult
+    ) -> None:
+        reject = ImportService._reject
+        creates: List[Tuple[int, str, dict]] = []
+        updates: List[Tuple[int, str, dict]] = []
+        skills: List[Tuple[int, str, str, Any]] = []
+
+        for record in batch:
+            if record.error:
+                reject(result, record.line, record.user.get("email"), record.error)
+                continue
+            email = record.user.get("email")
+            if not isinstance(email, str) or not email:
+                reject(result, record.line, None, "email: Field required")
+                continue
+            if email not in seen:
+                seen.add(email)
+                if record.user.keys() & {"password", "password_hash"}:
+                    creates.append((record.line, email, record.user))
+                elif record.user.keys() & UserUpdate.model_fields.keys() - {"email"}:
+                    updates.append((record.line, email, record.user))
+            for label, skill in record.skills:
+                skills.append((record.line, email, label, skill))
+
+        valid_creates, errors = _validate(ImportUserCreate, [user for _, _, user in creates])
+        for index, detail in errors.items():
+            reject(result, creates[index][0], creates[index][1], detail)
+        valid_updates, errors = _validate(UserUpdate, [user for _, _, user in updates])
+        for index, detail in errors.items():
+            reject(result, updates[index][0], updates[index][1], detail)
+        valid_skills, errors = _validate(SkillBase, [skill for _, _, _, skill in skills])
+        for index, detail in errors.items():
+            line, email, label, _ = skills[index]
+            reject(result, line, email, f"{label}: {detail}")
+
+        # Every email this batch touches, resolved in one query
+        emails = {creates[index][1] for index in valid_creates}
+        emails |= {updates[index][1] for index in valid_updates}
+        emails |= {skills[index][1] for index in valid_skills}
+        user_ids: Dict[str, int] = {}
+        if emails:
+            rows = await db.execute(select(User.email, User.id).where(User.email.in_(emails)))
+            user_ids = dict(rows.all())
+
+        staged_users: List[dict] = []
+        new_users: List[Tuple[dict, str]] = []
+        for index, user in valid_creates.items():
+            line, email, _ = creates[index]
+            row = {
+                "line": line, "email": email, "name": user.name,
+                "position": user.position, "avatar_url": user.avatar_url, "password": None,
+            }
+            staged_users.append(row)
+            if email in user_ids:
+                continue
+            if user.password_hash is not None:
+                row["password"] = user.password_hash
+            else:
+                new_users.append((row, user.password))
+        for index, user in valid_updates.items():
+            line, email, _ = updates[index]
+            if email not in user_ids:
+                reject(result, line, email, "Unknown user email; include a password to create the user")
+                continue
+            staged_users.append({
+                "line": line, "email": email, "name": user.name,
+                "position": user.position, "avatar_url": user.avatar_url, "password": None,
+            })
+        hashes = await asyncio.gather(*(hash_password(password) for _, password in new_users))
+        for (row, _), hashed in zip(new_users, hashes):
+            row["password"] = hashed
+
+        updated_user_ids: List[int] = []
+        if staged_users:
+            await _stage(db, user_staging, staged_users)
+            staged = user_staging.c
+            updated = await db.execute(
+                update(User)
+                .where(User.email == staged.email)
+                .values(
+                    name=func.coalesce(staged.name, User.name),
+                    position=func.coalesce(staged.position, User.position),
+                    avatar_url=func.coalesce(staged.avatar_url, User.avatar_url),
+                    updated_at=func.now(),
+                )
+                .returning(User.id)
+                .execution_options(synchronize_session=False)
+            )
+            updated_user_ids = updated.scalars().all()
+            result.users_updated += len(updated_user_ids)
+
+            dialect = db.bind.dialect.name
+            stmt = (pg_insert if dialect == "postgresql" else sqlite_insert)(User).from_select(
+                ["email", "name", "position", "avatar_url", "password"],
+                select(staged.email, staged.name, staged.position, staged.avatar_url, staged.password)
+                .where(staged.password.is_not(None)),
+            )
+            # A concurrent signup may have taken the email since it was resolved
+            inserted = await db.execute(
+                stmt.on_conflict_do_nothing(index_elements=[User.email]).returning(User.email, User.id)
+            )
+            created = dict(inserted.all())
+            result.users_created += len(created)
+            user_ids.update(created)
+
+        staged_skills: List[dict] = []
+        owned: Set[Tuple[int, str]] = set()
+        for index, skill in valid_skills.items():
+            line, email, label, _ = skills[index]
+            user_id = user_ids.get(email)
+            if user_id is None:
+                reject(result, line, email, f"{label}: Unknown user email")
+                continue
+            if (user_id, skill.name) in owned:
+                reject(result, line, email, f"{label}: Skill listed more than once for this user")
+                continue
+            owned.add((user_id, skill.name))
+            staged_skills.append({
+                "line": line, "user_id": user_id, "name": skill.name, "category": skill.category,
+                "description": skill.description, "level": skill.level,
+            })
+
+        stats = StatsDelta()
+        written: List[Tuple[int, str, float]] = []
+        if staged_skills:
+            await _stage(db, skill_staging, staged_skills)
+            staged = skill_staging.c
+            same_skill = and_(Skill.user_id == staged.user_id, Skill.name == staged.name)
+            new_values = dict(
+                category=staged.category, description=staged.description, level=staged.level, updated_at=func.now(),
+            )
+            dialect = db.bind.dialect.name
+            if dialect == "postgresql":
+                # The rows locked by the CTE are exactly the rows updated, so
+                # the old values removed from the stats match what is replaced
+                old = (
+                    select(Skill.id, Skill.category, Skill.name, Skill.level)
+                    .where(same_skill)
+                    .with_for_update(of=Skill)
+                    .cte("old")
+                )
+                updated = await db.execute(
+                    update(Skill)
+                    .where(Skill.id == old.c.id, same_skill)
+                    .values(**new_values)
+                    .returning(Skill.user_id, Skill.name, Skill.level, old.c.category, old.c.name, old.c.level)
+                    .execution_options(synchronize_session=False)
+                )
+                replaced = updated.all()
+            else:
+                # SQLite allows one writer at a time, so a separate read cannot go stale
+                previous = await db.execute(
+                    select(Skill.user_id, Skill.name, Skill.category, Skill.level).where(same_skill)
+                )
+                old_values = {(user_id, name): (category, level) for user_id, name, category, level in previous.all()}
+                updated = await db.execute(
+                    update(Skill)
+                    .where(same_skill)
+                    .values(**new_values)
+                    .returning(Skill.user_id, Skill.name, Skill.level)
+                    .execution_options(synchronize_session=False)
+                )
+                replaced = [
+                    (user_id, name, level, old_values[user_id, name][0], name, old_values[user_id, name][1])
+                    for user_id, name, level in updated.all()
+                ]
+            for user_id, name, level, old_category, old_name, old_level in replaced:
+                stats.remove(old_category, old_name, old_level)
+                written.append((user_id, name, level))
+            result.skills_updated += len(replaced)
+
+            # A skill another transaction added since the update is left alone
+            # and reported, rather than overwritten without its stats removed
+            inserted = await db.execute(
+                (pg_insert if dialect == "postgresql" else sqlite_insert)(Skill)
+                .from_select(
+                    ["user_id", "name", "category", "description", "level"],
+                    select(staged.user_id, staged.name, staged.category, staged.description, staged.level)
+                    .where(~exists().where(same_skill)),
+                )
+                .on_conflict_do_nothing(index_elements=[Skill.user_id, Skill.name])
+                .returning(Skill.user_id, Skill.name, Skill.level)
+            )
+            created = inserted.all()
+            written += [tuple(row) for row in created]
+            result.skills_created += len(created)
+
+            applied = {(user_id, name) for user_id, name, _ in written}
+            email_for = {user_id: email for email, user_id in user_ids.items()}
+            for row in staged_skills:
+                if (row["user_id"], row["name"]) in applied:
+                    stats.add(row["category"], row["name"], row["level"])
+                else:
+                    reject(
+                        result, row["line"], email_for.get(row["user_id"]),
+                        f"{row['name']}: Skill was added concurrently; import the row again",
+                    )
+
+        added = await SkillStatsService.apply(db, stats)
+        await db.commit()
+        skill_name_index.add_names(added)
+        for user_id in updated_user_ids:
+            user_cache.invalidate(user_id)
+        for user_id, name, level in written:
+            skill_matrix.set_level(user_id, name, level)
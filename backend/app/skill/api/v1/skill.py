@@ -1,15 +1,35 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List, Optional
+from typing import List, Literal, NoReturn, Optional, Union
 from database.database import get_session
-from ...schema.skill import SkillCreate, SkillUpdate, SkillResponse
-from ...service.skill_service import SkillService
+from app.core.pagination import Page, decode_cursor
+from app.core.responses import json_response
+from app.core.query_budget import query_budget
+from ...schema.skill import SkillCreate, SkillUpdate, SkillResponse, SkillBatchRequest, SkillBatchResponse, SkillRadarResponse, SkillStatsResponse, SkillSearchHit, SkillHistorySeries
+from ...service.skill_service import SkillService, DuplicateSkill, SKILL_SORTS
+from ...service.skill_stats_service import SkillStatsService
+from ...service.skill_history_service import SkillHistoryService
 from app.core.auth import get_current_user
 from app.user.schema.user import UserResponse
 
 router = APIRouter()
 
+async def _raise_skill_miss(db: AsyncSession, skill_id: int, action: str) -> NoReturn:
+    """Raise 404 or 403 for a skill an ownership-scoped write did not match"""
+    owner_id = await SkillService.get_skill_owner_id(db, skill_id)
+    if owner_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Skill not found"
+        )
+    raise HTTPException(
+        status_code=status.HTTP_403_FORBIDDEN,
+        detail=f"You can only {action} your own skills"
+    )
+
 @router.post("/", response_model=SkillResponse, status_code=status.HTTP_201_CREATED)
+@query_budget(3)
 async def create_skill(
     skill_data: SkillCreate,
     current_user: UserResponse = Depends(get_current_user),
@@ -25,7 +45,12 @@ async def create_skill(
     
     try:
         db_skill = await SkillService.create_skill(db, skill_data)
-        return SkillResponse.model_validate(db_skill)
+        return json_response(SkillResponse, db_skill, status_code=status.HTTP_201_CREATED)
+    except DuplicateSkill as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e)
+        )
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -37,27 +62,116 @@ async def create_skill(
             detail=f"Error creating skill: {str(e)}"
         )
 
-@router.get("/", response_model=List[SkillResponse])
+@router.post("/batch", response_model=SkillBatchResponse)
+@query_budget(None)
+async def batch_skills(
+    batch: SkillBatchRequest,
+    current_user: UserResponse = Depends(get_current_user),
+    db: AsyncSession = Depends(get_session)
+):
+    """Apply several create/update/delete operations to the authenticated user's skills in one transaction"""
+    try:
+        results = await SkillService.apply_batch(db, current_user.id, batch.operations)
+    except DuplicateSkill as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e)
+        )
+    return json_response(SkillBatchResponse, {"results": results})
+
+@router.get("/", response_model=Union[List[SkillResponse], Page[SkillResponse]])
+@query_budget(2)
 async def get_my_skills(
-    skip: int = 0,
-    limit: int = 100,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
     category: Optional[str] = None,
+    min_level: Optional[float] = Query(None, ge=1.0, le=10.0),
+    max_level: Optional[float] = Query(None, ge=1.0, le=10.0),
+    name: Optional[str] = None,
+    sort: Literal["level", "name"] = "level",
+    cursor: Optional[str] = Query(None, description="Keyset cursor; pass an empty value for the first page"),
     current_user: UserResponse = Depends(get_current_user),
     db: AsyncSession = Depends(get_session)
 ):
-    """Get authenticated user's skills with optional category filter and pagination"""
-    if category:
-        skills = await SkillService.get_skills_by_category(db, category, skip=skip, limit=limit)
-        # Filter to only include current user's skills
-        skills = [skill for skill in skills if skill.user_id == current_user.id]
-    else:
-        skills = await SkillService.get_skills_by_user_id(db, current_user.id)
-        # Apply pagination manually since we're filtering by user
-        skills = skills[skip:skip + limit]
-    
-    return [SkillResponse.model_validate(skill) for skill in skills]
+    """Get authenticated user's skills with optional filters, sorting and pagination.
+
+    With `cursor` the result is a page ordered by (sort key, id) with a
+    `next_cursor`; without it the legacy skip/limit list is returned.
+    """
+    filters = dict(
+        user_id=current_user.id,
+        category=category,
+        min_level=min_level,
+        max_level=max_level,
+        name=name,
+        sort=sort,
+    )
+    if cursor is not None:
+        after = decode_cursor(cursor, sort, SKILL_SORTS[sort][0])
+        skills, next_cursor = await SkillService.get_skills_page(db, limit=limit, after=after, **filters)
+        return json_response(Page[SkillResponse], {"items": skills, "next_cursor": next_cursor})
+
+    skills = await SkillService.filter_skills(db, skip=skip, limit=limit, **filters)
+    return json_response(List[SkillResponse], skills)
+
+@router.get("/search", response_model=List[SkillSearchHit])
+@query_budget(2)
+async def search_skills(
+    q: str = Query(..., min_length=1, max_length=100, description="Text to match against skill names and descriptions"),
+    limit: int = Query(20, ge=1, le=100),
+    current_user: UserResponse = Depends(get_current_user),
+    db: AsyncSession = Depends(get_session)
+):
+    """Fuzzy search over the org's distinct skill names and skill descriptions"""
+    hits = await SkillService.search_skills(db, q, limit=limit)
+    return json_response(List[SkillSearchHit], hits)
+
+@router.get("/autocomplete", response_model=List[str])
+@query_budget(2)
+async def autocomplete_skills(
+    prefix: str = Query(..., min_length=1, max_length=100, description="Beginning of a skill name"),
+    limit: int = Query(10, ge=1, le=50),
+    current_user: UserResponse = Depends(get_current_user),
+    db: AsyncSession = Depends(get_session)
+):
+    """Skill name suggestions for a prefix, answered from memory"""
+    return await SkillService.autocomplete_skill_names(db, prefix, limit=limit)
+
+@router.get("/stats", response_model=List[SkillStatsResponse])
+@query_budget(2)
+async def get_skill_stats(
+    category: Optional[str] = None,
+    name: Optional[str] = None,
+    min_count: int = 1,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    current_user: UserResponse = Depends(get_current_user),
+    db: AsyncSession = Depends(get_session)
+):
+    """Org-wide count, mean and spread per skill, most common skills first"""
+    rows = await SkillStatsService.get_stats(
+        db, category=category, name=name, min_count=min_count, skip=skip, limit=limit
+    )
+    return json_response(List[SkillStatsResponse], [
+        SkillStatsResponse.from_totals(row.category, row.name, row.count, row.level_sum, row.level_sq_sum)
+        for row in rows
+    ])
+
+@router.get("/stats/categories", response_model=List[SkillStatsResponse])
+@query_budget(2)
+async def get_category_stats(
+    current_user: UserResponse = Depends(get_current_user),
+    db: AsyncSession = Depends(get_session)
+):
+    """Org-wide count, mean and spread per category"""
+    totals = await SkillStatsService.get_category_totals(db)
+    return json_response(List[SkillStatsResponse], [
+        SkillStatsResponse.from_totals(category, None, count, level_sum, level_sq_sum)
+        for category, count, level_sum, level_sq_sum in totals
+    ])
 
 @router.get("/{skill_id}", response_model=SkillResponse)
+@query_budget(2)
 async def get_skill(
     skill_id: int,
     current_user: UserResponse = Depends(get_current_user),
@@ -78,9 +192,10 @@ async def get_skill(
             detail="You can only access your own skills"
         )
     
-    return SkillResponse.model_validate(skill)
+    return json_response(SkillResponse, skill)
 
 @router.get("/user/{user_id}", response_model=List[SkillResponse])
+@query_budget(2)
 async def get_user_skills(
     user_id: int,
     current_user: UserResponse = Depends(get_current_user),
@@ -95,52 +210,77 @@ async def get_user_skills(
         )
     
     skills = await SkillService.get_skills_by_user_id(db, user_id)
-    return [SkillResponse.model_validate(skill) for skill in skills]
+    return json_response(List[SkillResponse], skills)
 
-@router.put("/{skill_id}", response_model=SkillResponse)
-async def update_skill(
-    skill_id: int,
-    skill_data: SkillUpdate,
+@router.get("/user/{user_id}/radar", response_model=SkillRadarResponse)
+@query_budget(3)
+async def get_user_skill_radar(
+    user_id: int,
+    include_org: bool = False,
     current_user: UserResponse = Depends(get_current_user),
     db: AsyncSession = Depends(get_session)
 ):
-    """Update skill by ID - only own skills allowed"""
-    # First check if skill exists and belongs to current user
-    existing_skill = await SkillService.get_skill_by_id(db, skill_id)
-    if not existing_skill:
+    """Per-category skill aggregates for the radar chart - only own skills allowed"""
+    if user_id != current_user.id:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Skill not found"
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You can only access your own skills"
         )
     
-    if existing_skill.user_id != current_user.id:
+    categories = await SkillService.get_category_aggregates(db, user_id, include_org=include_org)
+    return json_response(SkillRadarResponse, {"user_id": user_id, "categories": categories})
+
+@router.get("/user/{user_id}/history", response_model=List[SkillHistorySeries])
+@query_budget(2)
+async def get_user_skill_history(
+    user_id: int,
+    bucket: Literal["day", "week", "month"] = "week",
+    skill_id: Optional[int] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    current_user: UserResponse = Depends(get_current_user),
+    db: AsyncSession = Depends(get_session)
+):
+    """Level history per skill, downsampled to the last value per bucket - only own skills allowed"""
+    if user_id != current_user.id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
-            detail="You can only update your own skills"
+            detail="You can only access your own skills"
         )
     
-    updated_skill = await SkillService.update_skill(db, skill_id, skill_data)
-    return SkillResponse.model_validate(updated_skill)
+    series = await SkillHistoryService.get_history(
+        db, user_id, bucket=bucket, skill_id=skill_id, since=since, until=until
+    )
+    return json_response(List[SkillHistorySeries], series)
+
+@router.put("/{skill_id}", response_model=SkillResponse)
+@query_budget(4)
+async def update_skill(
+    skill_id: int,
+    skill_data: SkillUpdate,
+    current_user: UserResponse = Depends(get_current_user),
+    db: AsyncSession = Depends(get_session)
+):
+    """Update skill by ID - only own skills allowed"""
+    # Ownership is part of the UPDATE; only a miss pays for telling 404 from 403
+    try:
+        updated_skill = await SkillService.update_skill(db, skill_id, skill_data, owner_id=current_user.id)
+    except DuplicateSkill as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e)
+        )
+    if not updated_skill:
+        await _raise_skill_miss(db, skill_id, "update")
+    return json_response(SkillResponse, updated_skill)
 
 @router.delete("/{skill_id}", status_code=status.HTTP_204_NO_CONTENT)
+@query_budget(3)
 async def delete_skill(
     skill_id: int,
     current_user: UserResponse = Depends(get_current_user),
     db: AsyncSession = Depends(get_session)
 ):
     """Delete skill by ID - only own skills allowed"""
-    # First check if skill exists and belongs to current user
-    existing_skill = await SkillService.get_skill_by_id(db, skill_id)
-    if not existing_skill:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Skill not found"
-        )
-    
-    if existing_skill.user_id != current_user.id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="You can only delete your own skills"
-        )
-    
-    await SkillService.delete_skill(db, skill_id)
\ No newline at end of file
+    if not await SkillService.delete_skill(db, skill_id, owner_id=current_user.id):
+        await _raise_skill_miss(db, skill_id, "delete")
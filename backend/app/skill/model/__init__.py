@@ -1,3 +1,5 @@
 from .skill import Skill
+from .skill_stats import SkillStats
+from .skill_level_history import SkillLevelHistory
 
-__all__ = ["Skill"]
\ No newline at end of file
+__all__ = ["Skill", "SkillStats", "SkillLevelHistory"]
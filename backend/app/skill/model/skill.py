@@ -1,10 +1,17 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Float
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Float, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from database.base import Base
 
 class Skill(Base):
     __tablename__ = "skill"
+    __table_args__ = (
+        # One row per skill name and user; bulk import upserts on it
+        Index("uq_skill_user_id_name", "user_id", "name", unique=True),
+        # Supports per-user keyset pagination ordered by (name, id)
+        Index("ix_skill_user_id_name_id", "user_id", "name", "id"),
+        Index("ix_skill_user_id_category", "user_id", "category"),
+    )
     
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     name = Column(String(100), nullable=False, index=True)
@@ -31,3 +38,7 @@ class Skill(Base):
             "created_at": self.created_at.isoformat() if self.created_at else None,
             "updated_at": self.updated_at.isoformat() if self.updated_at else None
         }
+
+
+# Serves per-user listings sorted by level (descending, id as tie-breaker)
+Index("ix_skill_user_id_level_desc", Skill.user_id, Skill.level.desc(), Skill.id.desc())
@@ -0,0 +1,26 @@
+from sqlalchemy import Column, Integer, String, DateTime, Float, Index
+from database.base import Base
+
+class SkillLevelHistory(Base):
+    """Append-only log of skill levels, one row per create or level change.
+
+    Name and category are copied in so a series still reads correctly after
+    the skill is renamed. There are no foreign keys, as rows arrive through a
+    write-behind queue; deleting a skill or user deletes its rows explicitly.
+    """
+    __tablename__ = "skill_level_history"
+    __table_args__ = (
+        # Serves per-user history scans ordered by time
+        Index("ix_skill_level_history_user_id_recorded_at", "user_id", "recorded_at"),
+    )
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    skill_id = Column(Integer, nullable=False)
+    user_id = Column(Integer, nullable=False)
+    name = Column(String(100), nullable=False)
+    category = Column(String(100), nullable=False)
+    level = Column(Float, nullable=False)
+    recorded_at = Column(DateTime(timezone=True), nullable=False)
+    
+    def __repr__(self):
+        return f"<SkillLevelHistory(skill_id={self.skill_id}, level={self.level}, recorded_at={self.recorded_at})>"
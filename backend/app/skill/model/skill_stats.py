@@ -0,0 +1,27 @@
+from sqlalchemy import Column, Integer, String, DateTime, Float
+from sqlalchemy.sql import func
+from database.base import Base
+
+class SkillStats(Base):
+    """Org-wide running totals of skill levels, one row per (category, name)"""
+    __tablename__ = "skill_stats"
+    
+    category = Column(String(100), primary_key=True)
+    name = Column(String(100), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+    level_sum = Column(Float, nullable=False, default=0.0)
+    level_sq_sum = Column(Float, nullable=False, default=0.0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    
+    def __repr__(self):
+        return f"<SkillStats(category='{self.category}', name='{self.name}', count={self.count})>"
+    
+    def to_dict(self):
+        return {
+            "category": self.category,
+            "name": self.name,
+            "count": self.count,
+            "level_sum": self.level_sum,
+            "level_sq_sum": self.level_sq_sum,
+            "updated_at": self.updated_at.isoformat() if self.updated_at else None
+        }
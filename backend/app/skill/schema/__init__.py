@@ -1,3 +1,39 @@
-from .skill import SkillCreate, SkillUpdate, SkillResponse
+from .skill import (
+    SkillCreate,
+    SkillUpdate,
+    SkillResponse,
+    SkillBatchCreate,
+    SkillBatchUpdate,
+    SkillBatchDelete,
+    SkillBatchOperation,
+    SkillBatchRequest,
+    SkillBatchItemResult,
+    SkillBatchResponse,
+    OrgCategoryStats,
+    CategoryAggregate,
+    SkillRadarResponse,
+    SkillStatsResponse,
+    SkillSearchHit,
+    SkillHistoryPoint,
+    SkillHistorySeries,
+)
 
-__all__ = ["SkillCreate", "SkillUpdate", "SkillResponse"]
+__all__ = [
+    "SkillCreate",
+    "SkillUpdate",
+    "SkillResponse",
+    "SkillBatchCreate",
+    "SkillBatchUpdate",
+    "SkillBatchDelete",
+    "SkillBatchOperation",
+    "SkillBatchRequest",
+    "SkillBatchItemResult",
+    "SkillBatchResponse",
+    "OrgCategoryStats",
+    "CategoryAggregate",
+    "SkillRadarResponse",
+    "SkillStatsResponse",
+    "SkillSearchHit",
+    "SkillHistoryPoint",
+    "SkillHistorySeries",
+]
@@ -1,6 +1,7 @@
-from pydantic import BaseModel, Field, ConfigDict
-from typing import Optional
-from datetime import datetime
+from pydantic import BaseModel, Field, ConfigDict, field_validator
+import math
+from typing import Annotated, Optional, List, Literal, Union
+from datetime import date, datetime
 
 
 class SkillBase(BaseModel):
@@ -23,6 +24,14 @@ class SkillUpdate(BaseModel):
     description: Optional[str] = Field(None, max_length=500, description="Skill description")
     level: Optional[float] = Field(None, ge=1.0, le=10.0, description="Skill level from 1-10")
 
+    @field_validator("name", "category", "level")
+    @classmethod
+    def not_null(cls, value):
+        """These columns are NOT NULL: the field may be omitted, but not sent as null"""
+        if value is None:
+            raise ValueError("may be omitted but cannot be null")
+        return value
+
 
 class SkillResponse(SkillBase):
     """Schema for skill response"""
@@ -32,3 +41,117 @@ class SkillResponse(SkillBase):
     user_id: int = Field(..., description="ID of the user this skill belongs to")
     created_at: datetime = Field(..., description="When the skill was created")
     updated_at: datetime = Field(..., description="When the skill was last updated")
+
+
+class SkillBatchCreate(SkillBase):
+    """Batch operation creating a skill for the authenticated user"""
+    op: Literal["create"] = Field(..., description="Operation type")
+
+
+class SkillBatchUpdate(SkillUpdate):
+    """Batch operation updating one of the authenticated user's skills"""
+    op: Literal["update"] = Field(..., description="Operation type")
+    id: int = Field(..., description="ID of the skill to update")
+
+
+class SkillBatchDelete(BaseModel):
+    """Batch operation deleting one of the authenticated user's skills"""
+    op: Literal["delete"] = Field(..., description="Operation type")
+    id: int = Field(..., description="ID of the skill to delete")
+
+
+SkillBatchOperation = Annotated[
+    Union[SkillBatchCreate, SkillBatchUpdate, SkillBatchDelete],
+    Field(discriminator="op"),
+]
+
+
+class SkillBatchRequest(BaseModel):
+    """Schema for applying several skill mutations in one request"""
+    operations: List[SkillBatchOperation] = Field(..., min_length=1, max_length=500, description="Operations to apply in a single transaction")
+
+
+class SkillBatchItemResult(BaseModel):
+    """Outcome of a single batch operation"""
+    index: int = Field(..., description="Position of the operation in the request")
+    op: str = Field(..., description="Operation type")
+    status: int = Field(..., description="HTTP-style status code for this operation")
+    skill: Optional[SkillResponse] = Field(None, description="Resulting skill for successful create/update")
+    detail: Optional[str] = Field(None, description="Error detail when the operation failed")
+
+
+class SkillBatchResponse(BaseModel):
+    """Schema for batch mutation results, in request order"""
+    results: List[SkillBatchItemResult] = Field(default=[], description="Per-operation results")
+
+
+class OrgCategoryStats(BaseModel):
+    """Org-wide level distribution for one category"""
+    count: int = Field(..., description="Number of skills in this category across all users")
+    mean: float = Field(..., description="Mean level across all users")
+    p25: Optional[float] = Field(None, description="25th percentile level")
+    p50: Optional[float] = Field(None, description="Median level")
+    p75: Optional[float] = Field(None, description="75th percentile level")
+    p90: Optional[float] = Field(None, description="90th percentile level")
+
+
+class CategoryAggregate(BaseModel):
+    """Per-category summary of a user's skill levels"""
+    category: str = Field(..., description="Skill category")
+    count: int = Field(..., description="Number of skills in this category")
+    mean: float = Field(..., description="Mean level")
+    max: float = Field(..., description="Highest level")
+    min: float = Field(..., description="Lowest level")
+    org: Optional[OrgCategoryStats] = Field(None, description="Org-wide comparison, when requested")
+
+
+class SkillRadarResponse(BaseModel):
+    """Schema for the per-category radar chart payload"""
+    user_id: int = Field(..., description="ID of the user the aggregates belong to")
+    categories: List[CategoryAggregate] = Field(default=[], description="One entry per category, sorted by name")
+
+
+class SkillStatsResponse(BaseModel):
+    """Org-wide statistics for a skill (or a whole category when name is null)"""
+    category: str = Field(..., description="Skill category")
+    name: Optional[str] = Field(None, description="Skill name, null for category roll-ups")
+    count: int = Field(..., description="Number of people with this skill")
+    mean: float = Field(..., description="Mean level")
+    stddev: float = Field(..., description="Population standard deviation of the level")
+
+    @classmethod
+    def from_totals(
+        cls, category: str, name: Optional[str], count: int, level_sum: float, level_sq_sum: float
+    ) -> "SkillStatsResponse":
+        """Derive mean and standard deviation from running sums"""
+        mean = level_sum / count if count else 0.0
+        variance = level_sq_sum / count - mean * mean if count else 0.0
+        return cls(
+            category=category,
+            name=name,
+            count=count,
+            mean=mean,
+            stddev=math.sqrt(max(variance, 0.0)),
+        )
+
+
+class SkillSearchHit(BaseModel):
+    """A skill matching a search, aggregated across users"""
+    name: str = Field(..., description="Skill name")
+    category: str = Field(..., description="Skill category")
+    count: int = Field(..., description="Number of matching skill entries")
+    score: float = Field(..., description="Match score between 0 and 1, higher is better")
+
+
+class SkillHistoryPoint(BaseModel):
+    """A skill's level at the end of one time bucket"""
+    bucket: date = Field(..., description="Start of the day, week (Monday) or month")
+    level: float = Field(..., description="Last recorded level within the bucket")
+
+
+class SkillHistorySeries(BaseModel):
+    """Downsampled level history of one skill"""
+    skill_id: int = Field(..., description="ID of the skill (it may since have been deleted)")
+    name: str = Field(..., description="Skill name as last recorded")
+    category: str = Field(..., description="Skill category as last recorded")
+    points: List[SkillHistoryPoint] = Field(default=[], description="One point per bucket with a change, oldest first")
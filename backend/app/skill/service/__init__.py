@@ -1,3 +1,6 @@
 from .skill_service import SkillService
+from .skill_stats_service import SkillStatsService
+from .similarity_service import SimilarityService
+from .skill_history_service import SkillHistoryService
 
-__all__ = ["SkillService"]
+__all__ = ["SkillService", "SkillStatsService", "SimilarityService", "SkillHistoryService"]
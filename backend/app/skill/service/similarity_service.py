@@ -0,0 +1,276 @@
+"""
+Vectorized user similarity over a user x skill-name level matrix
+"""
+import asyncio
+import contextvars
+import logging
+import time
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+import numpy as np
+from sqlalchemy import select
+from app.core.cache_bus import cache_bus
+from app.core.settings import settings
+from database.database import async_session_factory
+from ..model.skill import Skill
+
+logger = logging.getLogger(__name__)
+
+
+class MatrixState(NamedTuple):
+    """A fully built matrix, ready to be swapped in"""
+    levels: np.ndarray
+    norms: np.ndarray
+    user_rows: Dict[int, int]
+    row_users: List[int]
+    skill_columns: Dict[str, int]
+
+
+class SkillMatrix:
+    """Dense float32 matrix of skill levels, one row per user and one column per skill name.
+
+    Row norms are cached so a query is one matrix-vector product plus an
+    argpartition. Writes update single cells and the affected row norm.
+    If a user holds several skills with the same name the highest level is
+    kept; deleting one of them zeroes the cell until the next rebuild.
+
+    A rebuild is split so the slow part stays off the event loop: `build`
+    is a pure function of the rows and can run in a thread, while
+    `install` swaps the result in. Writes made between `begin_rebuild` and
+    `install` are applied to the current matrix as usual and also logged,
+    then replayed on top of the new one, so they are not lost to a snapshot
+    read before them.
+
+    Each worker holds its own matrix. `on_write` lets the cache bus send
+    every write to the other workers, which replay it with `apply`.
+    """
+
+    def __init__(self, ttl: float = 600.0, on_write: Optional[Callable[[str, Tuple[Any, ...]], None]] = None) -> None:
+        self.ttl = ttl
+        self.on_write = on_write
+        self._loaded_at = 0.0
+        self._expired = False
+        self._writes: Optional[List[Tuple[str, Tuple[Any, ...]]]] = None
+        self._reset(0, 0)
+
+    def _reset(self, user_capacity: int, skill_capacity: int) -> None:
+        self.levels = np.zeros((max(user_capacity, 16), max(skill_capacity, 16)), dtype=np.float32)
+        self.norms = np.zeros(self.levels.shape[0], dtype=np.float32)
+        self.user_rows: Dict[int, int] = {}
+        self.row_users: List[int] = []
+        self.skill_columns: Dict[str, int] = {}
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded_at > 0.0
+
+    def is_stale(self) -> bool:
+        return not self.loaded or self._expired or time.monotonic() - self._loaded_at > self.ttl
+
+    def expire(self) -> None:
+        """Keep serving the current matrix but rebuild it on next use"""
+        self._expired = True
+
+    @staticmethod
+    def build(rows: Iterable[Tuple[int, str, float]]) -> MatrixState:
+        """Build matrix state from (user_id, skill name, level) rows without touching any instance"""
+        rows = list(rows)
+        user_rows: Dict[int, int] = {}
+        skill_columns: Dict[str, int] = {}
+        row_index = np.fromiter(
+            (user_rows.setdefault(user_id, len(user_rows)) for user_id, _, _ in rows), dtype=np.intp, count=len(rows)
+        )
+        column_index = np.fromiter(
+            (skill_columns.setdefault(name.casefold(), len(skill_columns)) for _, name, _ in rows),
+            dtype=np.intp, count=len(rows),
+        )
+        levels = np.zeros((max(len(user_rows), 16), max(len(skill_columns), 16)), dtype=np.float32)
+        values = np.fromiter((level for _, _, level in rows), dtype=np.float32, count=len(rows))
+        np.maximum.at(levels, (row_index, column_index), values)
+        norms = np.linalg.norm(levels, axis=1).astype(np.float32)
+        return MatrixState(levels, norms, user_rows, list(user_rows), skill_columns)
+
+    def begin_rebuild(self) -> None:
+        """Start logging writes so `install` can replay them over a snapshot read after this call"""
+        self._writes = []
+
+    def abort_rebuild(self) -> None:
+        """Stop logging writes after a failed rebuild; the current matrix stays in place"""
+        self._writes = None
+
+    def install(self, state: MatrixState) -> None:
+        """Swap in a built matrix, then replay the writes logged since `begin_rebuild`"""
+        writes, self._writes = self._writes or [], None
+        self.levels, self.norms = state.levels, state.norms
+        self.user_rows, self.row_users, self.skill_columns = state.user_rows, state.row_users, state.skill_columns
+        self._loaded_at = time.monotonic()
+        self._expired = False
+        for op, args in writes:
+            getattr(self, "_" + op)(*args)
+
+    def load(self, rows: Iterable[Tuple[int, str, float]]) -> None:
+        """Rebuild the matrix from (user_id, skill name, level) rows"""
+        self.install(self.build(rows))
+
+    def _row(self, user_id: int) -> int:
+        row = self.user_rows.get(user_id)
+        if row is None:
+            row = len(self.row_users)
+            if row >= self.levels.shape[0]:
+                self._grow(rows=row * 2)
+            self.user_rows[user_id] = row
+            self.row_users.append(user_id)
+        return row
+
+    def _column(self, name: str) -> int:
+        key = name.casefold()
+        column = self.skill_columns.get(key)
+        if column is None:
+            column = len(self.skill_columns)
+            if column >= self.levels.shape[1]:
+                self._grow(columns=column * 2)
+            self.skill_columns[key] = column
+        return column
+
+    def _grow(self, rows: Optional[int] = None, columns: Optional[int] = None) -> None:
+        old_rows, old_columns = self.levels.shape
+        levels = np.zeros((rows or old_rows, columns or old_columns), dtype=np.float32)
+        levels[:old_rows, :old_columns] = self.levels
+        norms = np.zeros(levels.shape[0], dtype=np.float32)
+        norms[:old_rows] = self.norms
+        self.levels, self.norms = levels, norms
+
+    def _refresh_norm(self, row: int) -> None:
+        self.norms[row] = np.linalg.norm(self.levels[row])
+
+    def set_level(self, user_id: int, name: str, level: float) -> None:
+        """Record a created or updated skill"""
+        self._write("set_level", (user_id, name, level))
+
+    def clear_level(self, user_id: int, name: str) -> None:
+        """Record a deleted skill"""
+        self._write("clear_level", (user_id, name))
+
+    def clear_user(self, user_id: int) -> None:
+        """Record that all of a user's skills were deleted"""
+        self._write("clear_user", (user_id,))
+
+    def _write(self, op: str, args: Tuple[Any, ...]) -> None:
+        if self.on_write is not None:
+            self.on_write(op, args)
+        self.apply(op, args)
+
+    def apply(self, op: str, args: Sequence[Any]) -> None:
+        """Apply a write without passing it to `on_write`, e.g. one received from another worker"""
+        if op not in ("set_level", "clear_level", "clear_user"):
+            raise ValueError(f"Unknown matrix write {op!r}")
+        if self._writes is not None:
+            self._writes.append((op, tuple(args)))
+        getattr(self, "_" + op)(*args)
+
+    def _set_level(self, user_id: int, name: str, level: float) -> None:
+        if not self.loaded:
+            return
+        row, column = self._row(user_id), self._column(name)
+        self.levels[row, column] = level
+        self._refresh_norm(row)
+
+    def _clear_level(self, user_id: int, name: str) -> None:
+        row = self.user_rows.get(user_id)
+        column = self.skill_columns.get(name.casefold())
+        if row is None or column is None:
+            return
+        self.levels[row, column] = 0.0
+        self._refresh_norm(row)
+
+    def _clear_user(self, user_id: int) -> None:
+        row = self.user_rows.get(user_id)
+        if row is None:
+            return
+        self.levels[row] = 0.0
+        self.norms[row] = 0.0
+
+    def most_similar(self, user_id: int, k: int = 10) -> List[Tuple[int, float]]:
+        """Top-k (user_id, cosine similarity) pairs, best first, excluding the user"""
+        row = self.user_rows.get(user_id)
+        count = len(self.row_users)
+        if row is None or self.norms[row] == 0.0 or count < 2:
+            return []
+
+        norms = self.norms[:count]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            scores = self.levels[:count] @ self.levels[row] / (norms * norms[row])
+        scores = np.nan_to_num(scores, nan=-1.0, posinf=-1.0, neginf=-1.0)
+        scores[row] = -1.0
+        scores[norms == 0.0] = -1.0
+
+        k = min(k, count - 1)
+        candidates = np.argpartition(-scores, k - 1)[:k]
+        ranked = candidates[np.argsort(-scores[candidates])]
+        return [
+            (self.row_users[index], float(scores[index]))
+            for index in ranked
+            if scores[index] > 0.0
+        ]
+
+
+skill_matrix = SkillMatrix(
+    ttl=settings.SIMILARITY_MATRIX_TTL,
+    on_write=lambda op, args: cache_bus.publish("skill_matrix", op, args),
+)
+cache_bus.register("skill_matrix", skill_matrix.apply, skill_matrix.expire)
+
+# The one rebuild in flight, shared by every request that finds the matrix missing or stale
+_rebuild_task: Optional[asyncio.Task] = None
+
+
+async def _rebuild() -> None:
+    skill_matrix.begin_rebuild()
+    try:
+        async with async_session_factory() as db:
+            result = await db.execute(select(Skill.user_id, Skill.name, Skill.level))
+            rows = result.all()
+        state = await asyncio.get_running_loop().run_in_executor(None, SkillMatrix.build, rows)
+    except BaseException:
+        skill_matrix.abort_rebuild()
+        raise
+    skill_matrix.install(state)
+
+
+def _log_failure(task: asyncio.Task) -> None:
+    if not task.cancelled() and task.exception() is not None:
+        logger.error("Similarity matrix rebuild failed", exc_info=task.exception())
+
+
+class SimilarityService:
+    """Service class for skill-profile similarity between users"""
+    
+    @staticmethod
+    def start_rebuild() -> asyncio.Task:
+        """Start a rebuild on its own session unless one is already running; returns its task"""
+        global _rebuild_task
+        if _rebuild_task is None or _rebuild_task.done():
+            # A fresh context keeps the rebuild's queries out of the current request's timings
+            _rebuild_task = asyncio.get_running_loop().create_task(_rebuild(), context=contextvars.Context())
+            _rebuild_task.add_done_callback(_log_failure)
+        return _rebuild_task
+    
+    @staticmethod
+    async def ensure_loaded() -> SkillMatrix:
+        """The matrix, built on first use and refreshed in the background once past its TTL.
+
+        Only the first build is waited for. Afterwards a stale matrix keeps
+        serving, kept current by the incremental writes, while a single
+        rebuild reads the skill table and builds the new arrays in a worker
+        thread.
+        """
+        if not skill_matrix.loaded:
+            await asyncio.shield(SimilarityService.start_rebuild())
+        elif skill_matrix.is_stale():
+            SimilarityService.start_rebuild()
+        return skill_matrix
+    
+    @staticmethod
+    async def get_similar_users(user_id: int, k: int = 10) -> List[Tuple[int, float]]:
+        """Top-k users whose skill vectors are closest to `user_id`'s by cosine similarity"""
+        matrix = await SimilarityService.ensure_loaded()
+        return matrix.most_similar(user_id, k)
@@ -0,0 +1,216 @@
+"""
+Skill level history: a write-behind recorder and downsampled reads
+"""
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import Any, Callable, Collection, Dict, List, Literal, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, insert, func, cast, Date
+from app.core.settings import settings
+from database.database import async_session_factory
+from ..model.skill_level_history import SkillLevelHistory
+from ..schema.skill import SkillHistorySeries
+
+logger = logging.getLogger(__name__)
+
+Bucket = Literal["day", "week", "month"]
+
+# SQLite date() modifiers truncating a timestamp to the start of each bucket
+SQLITE_BUCKETS = {
+    "day": (),
+    "week": ("-6 days", "weekday 1"),
+    "month": ("start of month",),
+}
+
+
+class SkillHistoryRecorder:
+    """Write-behind buffer for skill level history rows.
+
+    `record` only appends to an in-memory list, so request latency never
+    includes the history write. A background task drains the list every
+    `flush_interval` seconds, or as soon as `batch_size` rows are waiting,
+    with one multi-row INSERT per batch on its own session. Beyond
+    `max_pending` waiting rows new ones are dropped and counted rather than
+    letting memory grow without bound. Rows still queued when the process is
+    killed are lost; `close` flushes them on a clean shutdown.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession],
+        flush_interval: float = 1.0,
+        batch_size: int = 500,
+        max_pending: int = 100_000,
+    ) -> None:
+        self.session_factory = session_factory
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.max_pending = max_pending
+        self._pending: List[Dict[str, Any]] = []
+        self._task: Optional[asyncio.Task] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._closing = False
+        # Held while a batch is being written, so discarding rows can wait it out
+        self._flushing = asyncio.Lock()
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+
+    def record(
+        self, skill_id: int, user_id: int, name: str, category: str, level: float,
+        recorded_at: Optional[datetime] = None,
+    ) -> None:
+        """Queue one history row; never touches the database"""
+        if len(self._pending) >= self.max_pending:
+            self.dropped += 1
+            return
+        self._pending.append({
+            "skill_id": skill_id,
+            "user_id": user_id,
+            "name": name,
+            "category": category,
+            "level": level,
+            "recorded_at": recorded_at or datetime.now(timezone.utc),
+        })
+        self._ensure_task()
+        if len(self._pending) >= self.batch_size:
+            self._wake.set()
+
+    def _ensure_task(self) -> None:
+        if self._task is None or self._task.done():
+            self._closing = False
+            self._wake = asyncio.Event()
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            await self.flush()
+            if self._closing:
+                return
+
+    async def flush(self) -> int:
+        """Write everything queued so far; returns the number of rows written"""
+        written = 0
+        while self._pending:
+            batch = self._pending[:self.batch_size]
+            del self._pending[:self.batch_size]
+            try:
+                async with self._flushing, self.session_factory() as db:
+                    await db.execute(insert(SkillLevelHistory), batch)
+                    await db.commit()
+            except Exception:
+                self.failed += len(batch)
+                logger.exception("Dropped %d skill history rows", len(batch))
+                continue
+            written += len(batch)
+        self.written += written
+        return written
+
+    async def discard_user(self, user_id: int) -> int:
+        """Drop a user's queued rows before their history is deleted; returns how many.
+
+        Waits for a batch already being written, so its rows are committed
+        before the caller's DELETE runs instead of landing after it.
+        """
+        return await self._discard(lambda row: row["user_id"] == user_id)
+
+    async def discard_skills(self, skill_ids: Collection[int]) -> int:
+        """Drop queued rows of deleted skills, as `discard_user` does for a user"""
+        return await self._discard(lambda row: row["skill_id"] in skill_ids)
+
+    async def _discard(self, matches: Callable[[Dict[str, Any]], bool]) -> int:
+        async with self._flushing:
+            kept = [row for row in self._pending if not matches(row)]
+            discarded = len(self._pending) - len(kept)
+            self._pending[:] = kept
+        return discarded
+
+    async def close(self) -> None:
+        """Stop the background task after a final flush"""
+        if self._task is not None and not self._task.done():
+            self._closing = True
+            self._wake.set()
+            await self._task
+        self._task = None
+        await self.flush()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "pending": len(self._pending),
+            "written": self.written,
+            "dropped": self.dropped,
+            "failed": self.failed,
+        }
+
+
+skill_history_recorder = SkillHistoryRecorder(
+    async_session_factory,
+    flush_interval=settings.SKILL_HISTORY_FLUSH_INTERVAL,
+    batch_size=settings.SKILL_HISTORY_BATCH_SIZE,
+    max_pending=settings.SKILL_HISTORY_MAX_PENDING,
+)
+
+
+class SkillHistoryService:
+    """Service class for reading skill level history"""
+
+    @staticmethod
+    def bucket_start(dialect: str, bucket: Bucket, column):
+        """SQL expression truncating `column` to the start of its bucket as a date"""
+        if dialect == "postgresql":
+            return cast(func.date_trunc(bucket, column), Date)
+        return func.date(column, *SQLITE_BUCKETS[bucket])
+
+    @staticmethod
+    async def get_history(
+        db: AsyncSession,
+        user_id: int,
+        bucket: Bucket = "week",
+        skill_id: Optional[int] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+    ) -> List[SkillHistorySeries]:
+        """A user's skill levels downsampled to the last value per bucket.
+
+        Downsampling runs in SQL with a window function, so the payload is
+        bounded by the number of buckets however many changes were recorded.
+        """
+        history = SkillLevelHistory
+        start = SkillHistoryService.bucket_start(db.bind.dialect.name, bucket, history.recorded_at)
+        query = select(
+            history.skill_id,
+            history.name,
+            history.category,
+            history.level,
+            start.label("bucket"),
+            func.row_number().over(
+                partition_by=(history.skill_id, start),
+                order_by=(history.recorded_at.desc(), history.id.desc()),
+            ).label("rank"),
+        ).where(history.user_id == user_id)
+        if skill_id is not None:
+            query = query.where(history.skill_id == skill_id)
+        if since is not None:
+            query = query.where(history.recorded_at >= since)
+        if until is not None:
+            query = query.where(history.recorded_at < until)
+        ranked = query.subquery()
+
+        result = await db.execute(
+            select(ranked.c.skill_id, ranked.c.name, ranked.c.category, ranked.c.level, ranked.c.bucket)
+            .where(ranked.c.rank == 1)
+            .order_by(ranked.c.skill_id, ranked.c.bucket)
+        )
+        series: Dict[int, Dict[str, Any]] = {}
+        for row in result.all():
+            entry = series.setdefault(row.skill_id, {"skill_id": row.skill_id, "points": []})
+            # Rows arrive oldest first, so the last one seen carries the current label
+            entry["name"], entry["category"] = row.name, row.category
+            entry["points"].append({"bucket": row.bucket, "level": row.level})
+        return [SkillHistorySeries.model_validate(entry) for entry in series.values()]
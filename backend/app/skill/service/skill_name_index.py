@@ -0,0 +1,78 @@
+"""
+In-process prefix index of distinct skill names for autocomplete
+"""
+import time
+from bisect import bisect_left, insort
+from typing import Dict, Iterable, List
+from app.core.cache_bus import cache_bus
+from app.core.settings import settings
+
+
+class SkillNameIndex:
+    """Sorted, case-folded list of skill names answering prefix queries with bisect.
+
+    Loaded from the skill_stats table (one row per distinct skill) and kept
+    warm by the skill writes, which add new names once they have committed. Entries are only ever
+    added between reloads, so a name whose last holder was deleted lingers
+    until the next refresh after `ttl` seconds. New names are also sent
+    to the other workers over the cache bus.
+    """
+
+    def __init__(self, ttl: float = 300.0) -> None:
+        self.ttl = ttl
+        self._keys: List[str] = []
+        self._names: Dict[str, str] = {}
+        self._loaded_at: float = 0.0
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded_at > 0.0
+
+    def is_stale(self) -> bool:
+        return not self.loaded or time.monotonic() - self._loaded_at > self.ttl
+
+    def load(self, names: Iterable[str]) -> None:
+        """Replace the index contents"""
+        folded = {}
+        for name in names:
+            folded.setdefault(name.casefold(), name)
+        self._names = folded
+        self._keys = sorted(folded)
+        self._loaded_at = time.monotonic()
+
+    def add(self, name: str) -> None:
+        """Insert a single name if it is not indexed yet"""
+        key = name.casefold()
+        if key not in self._names:
+            self._names[key] = name
+            insort(self._keys, key)
+
+    def add_names(self, names: List[str], publish: bool = True) -> None:
+        """Insert newly used names if the index is loaded; otherwise the next load picks them up"""
+        if publish and names:
+            cache_bus.publish("skill_names", names)
+        if self.loaded:
+            for name in names:
+                self.add(name)
+
+    def expire(self) -> None:
+        """Reload from skill_stats on next use"""
+        self._loaded_at = 0.0
+
+    def complete(self, prefix: str, limit: int = 10) -> List[str]:
+        """Names starting with `prefix` (case-insensitive), alphabetically"""
+        key = prefix.casefold()
+        start = bisect_left(self._keys, key)
+        matches = []
+        for candidate in self._keys[start:start + limit]:
+            if not candidate.startswith(key):
+                break
+            matches.append(self._names[candidate])
+        return matches
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+
+skill_name_index = SkillNameIndex(ttl=settings.SKILL_NAME_INDEX_TTL)
+cache_bus.register("skill_names", lambda names: skill_name_index.add_names(names, publish=False), skill_name_index.expire)
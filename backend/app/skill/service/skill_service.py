@@ -1,114 +1,668 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, delete
-from typing import Optional, List
+from sqlalchemy import select, delete, insert, update, exists, case, func, literal, tuple_, union_all, Select
+from sqlalchemy.exc import IntegrityError
+import re
+from datetime import datetime
+from typing import Dict, Optional, List, Tuple
+from app.core.pagination import keyset_filter, split_page
 from ..model.skill import Skill
-from ..schema.skill import SkillCreate, SkillUpdate, SkillResponse
+from ..model.skill_stats import SkillStats
+from ..model.skill_level_history import SkillLevelHistory
+from ..schema.skill import (
+    SkillCreate,
+    SkillUpdate,
+    SkillResponse,
+    SkillBatchOperation,
+    SkillBatchCreate,
+    SkillBatchUpdate,
+    SkillBatchItemResult,
+    OrgCategoryStats,
+    CategoryAggregate,
+    SkillSearchHit,
+)
+from .skill_stats_service import SkillStatsService, StatsDelta
+from .skill_name_index import skill_name_index
+from .similarity_service import skill_matrix
+from .skill_history_service import skill_history_recorder
 from ...user.model.user import User
 
+class DuplicateSkill(ValueError):
+    """The user already has a skill with this name"""
+
+
+# Percentiles reported in the org-wide radar comparison
+RADAR_PERCENTILES = {"p25": 0.25, "p50": 0.5, "p75": 0.75, "p90": 0.9}
+
+# Search queries whose longest word is shorter than this match name prefixes
+# rather than trigrams
+SHORT_QUERY_LENGTH = 3
+# Score of a name found only through a skill description: below every name
+# containing the query, above every name that is merely similar to it
+DESCRIPTION_MATCH_SCORE = 0.55
+# Skill rows read per search when matching descriptions
+DESCRIPTION_SCAN_ROWS = 200
+
+# Sort name -> (ordering columns ending in the primary key, descending?)
+SKILL_SORTS = {
+    "id": ((Skill.id,), False),
+    "name": ((Skill.name, Skill.id), False),
+    "level": ((Skill.level, Skill.id), True),
+}
+
 
 class SkillService:
     """Service class for Skill operations"""
     
     @staticmethod
     async def create_skill(db: AsyncSession, skill_data: SkillCreate) -> Skill:
-        """Create a new skill for a user"""
-        result = await db.execute(select(User).filter(User.id == skill_data.user_id))
-        user = result.scalar_one_or_none()
-        if not user:
+        """Create a new skill for a user with one INSERT ... RETURNING.
+
+        The foreign key and the unique (user_id, name) index stand in for
+        separate lookups, so only a failed insert pays for telling them
+        apart: DuplicateSkill when the name is taken, otherwise ValueError
+        for an unknown user_id.
+        """
+        try:
+            db_skill = await db.scalar(
+                insert(Skill)
+                .values(**skill_data.model_dump())
+                .returning(Skill)
+            )
+        except IntegrityError:
+            await db.rollback()
+            if await SkillService.skill_exists_for_user(db, skill_data.user_id, skill_data.name):
+                raise DuplicateSkill(f"You already have a skill named '{skill_data.name}'")
             raise ValueError(f"User with id {skill_data.user_id} not found")
         
-        db_skill = Skill(
-            name=skill_data.name,
-            category=skill_data.category,
-            description=skill_data.description,
-            level=skill_data.level,
-            user_id=skill_data.user_id
+        added = await SkillStatsService.apply(
+            db, SkillStatsService.delta_for([(db_skill.category, db_skill.name, db_skill.level)])
         )
-        db.add(db_skill)
         await db.commit()
-        await db.refresh(db_skill)
+        skill_name_index.add_names(added)
+        skill_matrix.set_level(db_skill.user_id, db_skill.name, db_skill.level)
+        SkillService._record_level(db_skill, db_skill.created_at)
         return db_skill
     
+    @staticmethod
+    def _record_level(skill: Skill, recorded_at: Optional[datetime]) -> None:
+        """Queue a committed skill's level for the history table (write-behind)"""
+        skill_history_recorder.record(
+            skill.id, skill.user_id, skill.name, skill.category, skill.level, recorded_at
+        )
+    
     @staticmethod
     async def get_skill_by_id(db: AsyncSession, skill_id: int) -> Optional[Skill]:
         """Get skill by ID"""
         result = await db.execute(select(Skill).filter(Skill.id == skill_id))
         return result.scalar_one_or_none()
     
+    @staticmethod
+    async def get_skill_owner_id(db: AsyncSession, skill_id: int) -> Optional[int]:
+        """Get the user_id owning a skill, or None when the skill does not exist"""
+        return await db.scalar(select(Skill.user_id).filter(Skill.id == skill_id))
+    
+    @staticmethod
+    def build_skill_query(
+        user_id: Optional[int] = None,
+        category: Optional[str] = None,
+        min_level: Optional[float] = None,
+        max_level: Optional[float] = None,
+        name: Optional[str] = None,
+    ) -> Select:
+        """Compose a skill SELECT with the given filters applied in SQL"""
+        query = select(Skill)
+        if user_id is not None:
+            query = query.filter(Skill.user_id == user_id)
+        if category:
+            query = query.filter(Skill.category == category)
+        if min_level is not None:
+            query = query.filter(Skill.level >= min_level)
+        if max_level is not None:
+            query = query.filter(Skill.level <= max_level)
+        if name:
+            query = query.filter(Skill.name == name)
+        return query
+    
+    @staticmethod
+    async def filter_skills(
+        db: AsyncSession,
+        user_id: Optional[int] = None,
+        category: Optional[str] = None,
+        min_level: Optional[float] = None,
+        max_level: Optional[float] = None,
+        name: Optional[str] = None,
+        sort: str = "level",
+        skip: int = 0,
+        limit: Optional[int] = None,
+    ) -> List[Skill]:
+        """Get filtered skills sorted and paginated (OFFSET/LIMIT) in SQL"""
+        columns, descending = SKILL_SORTS[sort]
+        query = SkillService.build_skill_query(user_id, category, min_level, max_level, name)
+        query = query.order_by(*[column.desc() for column in columns] if descending else columns)
+        if skip:
+            query = query.offset(skip)
+        if limit is not None:
+            query = query.limit(limit)
+        result = await db.execute(query)
+        return result.scalars().all()
+    
+    @staticmethod
+    async def get_skills_page(
+        db: AsyncSession,
+        user_id: Optional[int] = None,
+        category: Optional[str] = None,
+        min_level: Optional[float] = None,
+        max_level: Optional[float] = None,
+        name: Optional[str] = None,
+        sort: str = "level",
+        limit: int = 100,
+        after: Optional[Tuple] = None,
+    ) -> Tuple[List[Skill], Optional[str]]:
+        """Get a page of filtered skills using keyset pagination on (sort key, id)"""
+        columns, descending = SKILL_SORTS[sort]
+        query = SkillService.build_skill_query(user_id, category, min_level, max_level, name)
+        query = keyset_filter(query, columns, after, limit, descending=descending)
+        result = await db.execute(query)
+        return split_page(
+            result.scalars().all(), limit, sort,
+            lambda skill: tuple(getattr(skill, column.key) for column in columns)
+        )
+    
     @staticmethod
     async def get_skills_by_user_id(db: AsyncSession, user_id: int) -> List[Skill]:
         """Get all skills for a specific user"""
-        result = await db.execute(select(Skill).filter(Skill.user_id == user_id))
-        return result.scalars().all()
+        return await SkillService.filter_skills(db, user_id=user_id, sort="id")
     
     @staticmethod
     async def get_all_skills(db: AsyncSession, skip: int = 0, limit: int = 100) -> List[Skill]:
         """Get all skills with pagination"""
-        result = await db.execute(select(Skill).offset(skip).limit(limit))
-        return result.scalars().all()
+        return await SkillService.filter_skills(db, sort="id", skip=skip, limit=limit)
     
     @staticmethod
     async def get_skills_by_category(db: AsyncSession, category: str, skip: int = 0, limit: int = 100) -> List[Skill]:
         """Get skills filtered by category"""
-        result = await db.execute(
-            select(Skill)
-            .filter(Skill.category == category)
-            .offset(skip)
-            .limit(limit)
-        )
-        return result.scalars().all()
+        return await SkillService.filter_skills(db, category=category, sort="id", skip=skip, limit=limit)
     
     @staticmethod
-    async def update_skill(db: AsyncSession, skill_id: int, skill_data: SkillUpdate) -> Optional[Skill]:
-        """Update skill by ID"""
-        db_skill = await SkillService.get_skill_by_id(db, skill_id)
-        if not db_skill:
-            return None
-        
+    async def update_skill(
+        db: AsyncSession, skill_id: int, skill_data: SkillUpdate, owner_id: Optional[int] = None
+    ) -> Optional[Skill]:
+        """Update skill by ID in a single UPDATE ... RETURNING.
+
+        With `owner_id` the statement only matches that user's skill, so the
+        ownership check costs nothing extra. The previous category, name and
+        level for the stats delta are returned alongside the new row (see
+        `_update_returning_old`). Returns None when no row matched. Raises
+        DuplicateSkill when renaming onto another of the user's skills.
+        """
+        scope = [Skill.id == skill_id]
+        if owner_id is not None:
+            scope.append(Skill.user_id == owner_id)
         update_data = skill_data.model_dump(exclude_unset=True)
-        for field, value in update_data.items():
-            setattr(db_skill, field, value)
+        if not update_data:
+            result = await db.execute(select(Skill).where(*scope))
+            return result.scalar_one_or_none()
+
+        try:
+            rows = await SkillService._update_returning_old(db, scope, update_data)
+        except IntegrityError:
+            await db.rollback()
+            raise DuplicateSkill(f"You already have a skill named '{update_data['name']}'")
+        if not rows:
+            return None
         
+        db_skill, old_category, old_name, old_level = rows[0]
+        delta = StatsDelta()
+        delta.remove(old_category, old_name, old_level)
+        delta.add(db_skill.category, db_skill.name, db_skill.level)
+        added = await SkillStatsService.apply(db, delta)
         await db.commit()
-        await db.refresh(db_skill)
+        skill_name_index.add_names(added)
+        if old_name != db_skill.name:
+            skill_matrix.clear_level(db_skill.user_id, old_name)
+        skill_matrix.set_level(db_skill.user_id, db_skill.name, db_skill.level)
+        if old_level != db_skill.level:
+            SkillService._record_level(db_skill, db_skill.updated_at)
         return db_skill
     
     @staticmethod
-    async def delete_skill(db: AsyncSession, skill_id: int) -> bool:
-        """Delete skill by ID"""
-        db_skill = await SkillService.get_skill_by_id(db, skill_id)
-        if not db_skill:
+    async def _update_returning_old(
+        db: AsyncSession, where: list, values: dict
+    ) -> List[Tuple[Skill, str, str, float]]:
+        """UPDATE the skills matching `where`, returning each with its prior category, name and level.
+
+        On PostgreSQL the prior values come from a locked CTE joined into the
+        same UPDATE ... RETURNING, so the read costs no extra round trip.
+        SQLite evaluates that CTE after the update, so there they are read
+        with a separate SELECT first.
+        """
+        if db.bind.dialect.name == "postgresql":
+            old = (
+                select(Skill.id, Skill.category, Skill.name, Skill.level)
+                .where(*where)
+                .with_for_update()
+                .cte("old")
+            )
+            result = await db.execute(
+                update(Skill)
+                .where(Skill.id == old.c.id)
+                .values(**values)
+                .returning(Skill, old.c.category, old.c.name, old.c.level)
+                .execution_options(synchronize_session=False, populate_existing=True)
+            )
+            return [tuple(row) for row in result.all()]
+
+        result = await db.execute(
+            select(Skill.id, Skill.category, Skill.name, Skill.level).where(*where)
+        )
+        previous = {skill_id: (category, name, level) for skill_id, category, name, level in result.all()}
+        if not previous:
+            return []
+        result = await db.execute(
+            update(Skill)
+            .where(Skill.id.in_(previous))
+            .values(**values)
+            .returning(Skill)
+            .execution_options(synchronize_session=False, populate_existing=True)
+        )
+        return [(skill, *previous[skill.id]) for skill in result.scalars().all()]
+    
+    @staticmethod
+    async def delete_skill(db: AsyncSession, skill_id: int, owner_id: Optional[int] = None) -> bool:
+        """Delete skill by ID with one DELETE ... RETURNING, along with its history.
+
+        With `owner_id` only that user's skill can match. Returns False when
+        nothing was deleted.
+        """
+        scope = [Skill.id == skill_id]
+        if owner_id is not None:
+            scope.append(Skill.user_id == owner_id)
+        result = await db.execute(
+            delete(Skill)
+            .where(*scope)
+            .returning(Skill.user_id, Skill.category, Skill.name, Skill.level)
+            .execution_options(synchronize_session=False)
+        )
+        row = result.first()
+        if row is None:
             return False
         
-        await db.delete(db_skill)
+        user_id, category, name, level = row
+        await SkillService._delete_history(db, user_id, [skill_id])
+        await SkillStatsService.apply(
+            db, SkillStatsService.delta_for([(category, name, level)], removed=True)
+        )
         await db.commit()
+        skill_matrix.clear_level(user_id, name)
         return True
     
     @staticmethod
-    async def delete_skills_by_user_id(db: AsyncSession, user_id: int) -> int:
-        """Delete all skills for a user. Returns count of deleted skills"""
-        result = await db.execute(select(Skill).filter(Skill.user_id == user_id))
-        skills = result.scalars().all()
-        deleted_count = len(skills)
-        
-        await db.execute(delete(Skill).filter(Skill.user_id == user_id))
-        await db.commit()
-        return deleted_count
+    async def _delete_history(db: AsyncSession, user_id: int, skill_ids: List[int]) -> None:
+        """Delete the history of skills being deleted in the caller's transaction.
+
+        The table has no foreign key, so nothing else removes these rows.
+        Queued rows are dropped first, so none is written after the DELETE.
+        """
+        await skill_history_recorder.discard_skills(set(skill_ids))
+        await db.execute(
+            delete(SkillLevelHistory)
+            .where(SkillLevelHistory.user_id == user_id, SkillLevelHistory.skill_id.in_(skill_ids))
+        )
+
+    @staticmethod
+    async def delete_skills_by_user_id(db: AsyncSession, user_id: int, commit: bool = True) -> int:
+        """Delete all skills for a user. Returns count of deleted skills.
+
+        Pass commit=False to fold the delete into a larger transaction.
+        """
+        result = await db.execute(
+            delete(Skill)
+            .filter(Skill.user_id == user_id)
+            .returning(Skill.category, Skill.name, Skill.level)
+            .execution_options(synchronize_session=False)
+        )
+        deleted = result.all()
+        await SkillStatsService.apply(db, SkillStatsService.delta_for(deleted, removed=True))
+        if commit:
+            await db.commit()
+        skill_matrix.clear_user(user_id)
+        return len(deleted)
     
     @staticmethod
     async def skill_exists_for_user(db: AsyncSession, user_id: int, skill_name: str) -> bool:
         """Check if a skill with given name already exists for a user"""
-        result = await db.execute(
-            select(Skill).filter(Skill.user_id == user_id, Skill.name == skill_name)
+        return await db.scalar(
+            select(exists().where(Skill.user_id == user_id, Skill.name == skill_name))
         )
-        return result.scalar_one_or_none() is not None
     
     @staticmethod
-    async def get_user_skills_for_profile(db: AsyncSession, user_id: int) -> List[Skill]:
-        """Get user skills ordered by level"""
+    async def apply_batch(
+        db: AsyncSession, user_id: int, operations: List[SkillBatchOperation]
+    ) -> List[SkillBatchItemResult]:
+        """Apply create/update/delete operations for one user in a single transaction.
+
+        Deletes run as one DELETE ... RETURNING, updates as one UPDATE with a
+        CASE per column, and creates as one multi-row INSERT ... RETURNING.
+        All statements are scoped to `user_id`, so skills owned by someone
+        else are never touched. Returns one result per operation, in order.
+        Raises DuplicateSkill, with nothing applied, when the batch would
+        leave the user two skills with the same name.
+        """
+        results: Dict[int, SkillBatchItemResult] = {}
+        stats = StatsDelta()
+        # (name, level) pairs to mirror into the similarity matrix after commit
+        cleared: List[str] = []
+        written: List[Tuple[str, float]] = []
+        # (skill, recorded_at) level changes queued for the history table after commit
+        history: List[Tuple[Skill, datetime]] = []
+        creates: List[Tuple[int, SkillBatchCreate]] = []
+        updates: Dict[int, Tuple[int, SkillBatchUpdate]] = {}
+        deletes: Dict[int, int] = {}
+
+        for index, operation in enumerate(operations):
+            if isinstance(operation, SkillBatchCreate):
+                creates.append((index, operation))
+                continue
+            if operation.id in updates or operation.id in deletes:
+                results[index] = SkillBatchItemResult(
+                    index=index, op=operation.op, status=400,
+                    detail="Skill referenced more than once in this batch"
+                )
+            elif isinstance(operation, SkillBatchUpdate):
+                updates[operation.id] = (index, operation)
+            else:
+                deletes[operation.id] = index
+
+        if deletes:
+            result = await db.execute(
+                delete(Skill)
+                .where(Skill.id.in_(deletes), Skill.user_id == user_id)
+                .returning(Skill.id, Skill.category, Skill.name, Skill.level)
+                .execution_options(synchronize_session=False)
+            )
+            deleted = []
+            for skill_id, category, name, level in result.all():
+                stats.remove(category, name, level)
+                cleared.append(name)
+                deleted.append(skill_id)
+                index = deletes.pop(skill_id)
+                results[index] = SkillBatchItemResult(index=index, op="delete", status=204)
+            if deleted:
+                await SkillService._delete_history(db, user_id, deleted)
+
+        if updates:
+            values = {}
+            for column in SkillUpdate.model_fields:
+                changes = {
+                    skill_id: getattr(operation, column)
+                    for skill_id, (_, operation) in updates.items()
+                    if column in operation.model_fields_set
+                }
+                if changes:
+                    attribute = getattr(Skill, column)
+                    values[column] = case(changes, value=Skill.id, else_=attribute)
+            if values:
+                # Old values feed the stats delta
+                try:
+                    rows = await SkillService._update_returning_old(
+                        db, [Skill.id.in_(updates), Skill.user_id == user_id], values
+                    )
+                except IntegrityError:
+                    await db.rollback()
+                    raise DuplicateSkill("An update renames a skill onto a name you already have")
+                updated = []
+                for skill, category, name, level in rows:
+                    stats.remove(category, name, level)
+                    cleared.append(name)
+                    updated.append(skill)
+                    if skill.level != level:
+                        history.append((skill, skill.updated_at))
+            else:
+                # Nothing to change; still confirm ownership and return the rows
+                result = await db.execute(
+                    select(Skill).where(Skill.id.in_(updates), Skill.user_id == user_id)
+                )
+                updated = result.scalars().all()
+            for skill in updated:
+                if values:
+                    stats.add(skill.category, skill.name, skill.level)
+                    written.append((skill.name, skill.level))
+                index, _ = updates.pop(skill.id)
+                results[index] = SkillBatchItemResult(
+                    index=index, op="update", status=200,
+                    skill=SkillResponse.model_validate(skill)
+                )
+
+        if creates:
+            rows = [
+                {**operation.model_dump(exclude={"op"}), "user_id": user_id}
+                for _, operation in creates
+            ]
+            try:
+                result = await db.scalars(
+                    insert(Skill).returning(Skill, sort_by_parameter_order=True), rows
+                )
+            except IntegrityError:
+                await db.rollback()
+                raise DuplicateSkill("A create uses a skill name you already have or repeats one in this batch")
+            for (index, _), skill in zip(creates, result.all()):
+                stats.add(skill.category, skill.name, skill.level)
+                written.append((skill.name, skill.level))
+                history.append((skill, skill.created_at))
+                results[index] = SkillBatchItemResult(
+                    index=index, op="create", status=201,
+                    skill=SkillResponse.model_validate(skill)
+                )
+
+        # Whatever is left did not match a row owned by this user
+        missing = {**{skill_id: index for skill_id, (index, _) in updates.items()}, **deletes}
+        if missing:
+            result = await db.execute(select(Skill.id).where(Skill.id.in_(missing)))
+            foreign = set(result.scalars().all())
+            for skill_id, index in missing.items():
+                op = "delete" if skill_id in deletes else "update"
+                if skill_id in foreign:
+                    results[index] = SkillBatchItemResult(
+                        index=index, op=op, status=403,
+                        detail=f"You can only {op} your own skills"
+                    )
+                else:
+                    results[index] = SkillBatchItemResult(
+                        index=index, op=op, status=404, detail="Skill not found"
+                    )
+
+        added = await SkillStatsService.apply(db, stats)
+        await db.commit()
+        skill_name_index.add_names(added)
+        for name in cleared:
+            skill_matrix.clear_level(user_id, name)
+        for name, level in written:
+            skill_matrix.set_level(user_id, name, level)
+        for skill, recorded_at in history:
+            SkillService._record_level(skill, recorded_at)
+        return [results[index] for index in range(len(operations))]
+    
+    @staticmethod
+    async def get_category_aggregates(
+        db: AsyncSession, user_id: int, include_org: bool = False
+    ) -> List[CategoryAggregate]:
+        """Per-category count/mean/max/min of a user's levels via one GROUP BY.
+
+        With `include_org`, a second GROUP BY over the same categories adds the
+        org-wide mean and, on PostgreSQL, percentile_cont percentiles.
+        """
         result = await db.execute(
-            select(Skill)
+            select(
+                Skill.category,
+                func.count(Skill.id),
+                func.avg(Skill.level),
+                func.max(Skill.level),
+                func.min(Skill.level),
+            )
             .filter(Skill.user_id == user_id)
-            .order_by(Skill.level.desc())
+            .group_by(Skill.category)
+            .order_by(Skill.category)
+        )
+        aggregates = [
+            CategoryAggregate(category=category, count=count, mean=mean, max=max_level, min=min_level)
+            for category, count, mean, max_level, min_level in result.all()
+        ]
+        if not include_org or not aggregates:
+            return aggregates
+
+        columns = [Skill.category, func.count(Skill.id), func.avg(Skill.level)]
+        with_percentiles = db.bind.dialect.name == "postgresql"
+        if with_percentiles:
+            columns += [
+                func.percentile_cont(fraction).within_group(Skill.level)
+                for fraction in RADAR_PERCENTILES.values()
+            ]
+        user_categories = select(Skill.category).filter(Skill.user_id == user_id).distinct()
+        result = await db.execute(
+            select(*columns)
+            .filter(Skill.category.in_(user_categories))
+            .group_by(Skill.category)
         )
-        return result.scalars().all()
\ No newline at end of file
+        org_stats = {}
+        for category, count, mean, *percentiles in result.all():
+            org_stats[category] = OrgCategoryStats(
+                count=count, mean=mean, **dict(zip(RADAR_PERCENTILES, percentiles))
+            )
+        for aggregate in aggregates:
+            aggregate.org = org_stats.get(aggregate.category)
+        return aggregates
+    
+    @staticmethod
+    async def search_skills(db: AsyncSession, q: str, limit: int = 20) -> List[SkillSearchHit]:
+        """Fuzzy search over the org's distinct skill names and skill descriptions.
+
+        Names come from skill_stats, which holds one row per (category, name)
+        with its running count, so the cost of name lookups follows the number
+        of distinct skills rather than the number of skill rows. Hits are
+        ranked in tiers, each filling only the slots the previous one left
+        within a single statement:
+
+        1. names containing the query (score 0.6 to 1),
+        2. names whose skill descriptions contain it, looked up in at most
+           DESCRIPTION_SCAN_ROWS skill rows (DESCRIPTION_MATCH_SCORE),
+        3. on PostgreSQL, names similar to it by pg_trgm, for typos (half
+           their similarity).
+
+        A tier whose slots are already taken is never executed. The pg_trgm
+        GIN indexes on skill_stats.name and skill.description serve the
+        substring and similarity matches. Queries without a word of at least
+        SHORT_QUERY_LENGTH characters only match name prefixes, through the
+        lower(name) index.
+        """
+        pattern = "%" + q.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+        name_match = SkillStats.name.ilike(pattern, escape="\\")
+        columns = (SkillStats.name, SkillStats.category, SkillStats.count)
+
+        if max(map(len, re.findall(r"\w+", q)), default=0) < SHORT_QUERY_LENGTH:
+            # Too few trigrams to be selective: match name prefixes only
+            prefix_match = func.lower(SkillStats.name).like(pattern[1:].lower(), escape="\\")
+            score = case((func.lower(SkillStats.name) == q.lower(), 1.0), else_=0.8).label("score")
+            statement = (
+                select(*columns, score)
+                .filter(prefix_match, SkillStats.count > 0)
+                .order_by(score.desc(), SkillStats.count.desc(), SkillStats.name)
+                .limit(limit)
+            )
+        else:
+            postgresql = db.bind.dialect.name == "postgresql"
+            if postgresql:
+                name_score = func.greatest(func.similarity(SkillStats.name, q), 0.6)
+            else:
+                name_score = case(
+                    (func.lower(SkillStats.name) == q.lower(), 1.0),
+                    (SkillStats.name.ilike(pattern[1:], escape="\\"), 0.8),
+                    else_=0.6,
+                )
+            name_score = name_score.label("score")
+            name_hits = (
+                select(*columns, name_score)
+                .filter(name_match, SkillStats.count > 0)
+                .order_by(name_score.desc(), SkillStats.count.desc(), SkillStats.name)
+                .limit(limit)
+                .cte("name_hits")
+            )
+            tiers = [name_hits]
+
+            def remaining():
+                # Slots left after the tiers so far; a LIMIT of 0 skips its scan
+                taken = sum(select(func.count()).select_from(tier).scalar_subquery() for tier in tiers)
+                return literal(limit) - taken
+
+            described = (
+                select(Skill.category, Skill.name)
+                .filter(Skill.description.ilike(pattern, escape="\\"))
+                .limit(DESCRIPTION_SCAN_ROWS)
+                .subquery()
+            )
+            pairs = (
+                select(described.c.category, described.c.name)
+                .distinct()
+                .filter(
+                    tuple_(described.c.category, described.c.name).not_in(
+                        select(name_hits.c.category, name_hits.c.name)
+                    )
+                )
+                .subquery()
+            )
+            # A primary key lookup per pair; joining instead lets the planner
+            # hash all of skill_stats for a few hundred pairs
+            pair_count = (
+                select(SkillStats.count)
+                .filter(SkillStats.category == pairs.c.category, SkillStats.name == pairs.c.name)
+                .scalar_subquery()
+            )
+            counted = select(pairs.c.name, pairs.c.category, pair_count.label("count")).subquery()
+            tiers.append(
+                select(counted, literal(DESCRIPTION_MATCH_SCORE).label("score"))
+                .filter(counted.c.count > 0)
+                .order_by(counted.c.count.desc(), counted.c.name)
+                .limit(remaining())
+                .cte("description_hits")
+            )
+            if postgresql:
+                similar_score = (func.similarity(SkillStats.name, q) / 2).label("score")
+                tiers.append(
+                    select(*columns, similar_score)
+                    # `%` is the index-backed pg_trgm similarity operator
+                    .filter(
+                        SkillStats.name.op("%")(q),
+                        ~name_match,
+                        tuple_(SkillStats.category, SkillStats.name).not_in(
+                            select(tiers[1].c.category, tiers[1].c.name)
+                        ),
+                        SkillStats.count > 0,
+                    )
+                    .order_by(similar_score.desc(), SkillStats.count.desc(), SkillStats.name)
+                    .limit(remaining())
+                    .cte("similar_hits")
+                )
+            hits = union_all(*(select(tier) for tier in tiers)).subquery()
+            statement = select(hits).order_by(hits.c.score.desc(), hits.c.count.desc(), hits.c.name)
+
+        result = await db.execute(statement)
+        return [
+            SkillSearchHit(name=name, category=category, count=count, score=round(float(hit_score), 4))
+            for name, category, count, hit_score in result.all()
+        ]
+    
+    @staticmethod
+    async def ensure_name_index(db: AsyncSession) -> None:
+        """Load the autocomplete index from skill_stats if missing or past its TTL"""
+        if skill_name_index.is_stale():
+            skill_name_index.load(await SkillStatsService.get_skill_names(db))
+    
+    @staticmethod
+    async def autocomplete_skill_names(db: AsyncSession, prefix: str, limit: int = 10) -> List[str]:
+        """Skill names starting with `prefix`, served from the in-process index"""
+        await SkillService.ensure_name_index(db)
+        return skill_name_index.complete(prefix, limit)
+    
+    @staticmethod
+    async def get_user_skills_for_profile(db: AsyncSession, user_id: int) -> List[Skill]:
+        """Get user skills ordered by level"""
+        return await SkillService.filter_skills(db, user_id=user_id, sort="level")
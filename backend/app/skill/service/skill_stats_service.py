@@ -0,0 +1,147 @@
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, delete, insert, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from ..model.skill import Skill
+from ..model.skill_stats import SkillStats
+
+
+class StatsDelta:
+    """Accumulates (count, sum, sum of squares) changes per (category, name)"""
+
+    def __init__(self) -> None:
+        self._rows: Dict[Tuple[str, str], List[float]] = defaultdict(lambda: [0, 0.0, 0.0])
+
+    def add(self, category: str, name: str, level: float) -> None:
+        row = self._rows[(category, name)]
+        row[0] += 1
+        row[1] += level
+        row[2] += level * level
+
+    def remove(self, category: str, name: str, level: float) -> None:
+        row = self._rows[(category, name)]
+        row[0] -= 1
+        row[1] -= level
+        row[2] -= level * level
+
+    def rows(self) -> List[dict]:
+        return [
+            {"category": category, "name": name, "count": count, "level_sum": total, "level_sq_sum": squares}
+            for (category, name), (count, total, squares) in self._rows.items()
+            if count or total or squares
+        ]
+
+    def __bool__(self) -> bool:
+        return bool(self.rows())
+
+
+class SkillStatsService:
+    """Service class for the incrementally maintained org-wide skill statistics"""
+    
+    @staticmethod
+    async def apply(db: AsyncSession, delta: StatsDelta) -> List[str]:
+        """Fold a delta into skill_stats with one batched upsert.
+
+        Does not commit: callers run this inside the same transaction as the
+        skill write it describes, so the totals never drift from the table.
+        Returns the names whose count grew; callers add them to
+        skill_name_index once the commit succeeded, so a rolled back write
+        never reaches autocomplete.
+        """
+        rows = delta.rows()
+        if not rows:
+            return []
+
+        dialect = db.bind.dialect.name
+        stmt = (pg_insert if dialect == "postgresql" else sqlite_insert)(SkillStats)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[SkillStats.category, SkillStats.name],
+            set_={
+                "count": SkillStats.count + stmt.excluded.count,
+                "level_sum": SkillStats.level_sum + stmt.excluded.level_sum,
+                "level_sq_sum": SkillStats.level_sq_sum + stmt.excluded.level_sq_sum,
+                "updated_at": func.now(),
+            },
+        )
+        # Passed as executemany parameters, so the statement compiles once and is
+        # cached, where .values(rows) would compile a new one per number of rows
+        await db.execute(stmt, rows)
+        return [row["name"] for row in rows if row["count"] > 0]
+    
+    @staticmethod
+    def delta_for(skills: Iterable[Tuple[str, str, float]], removed: bool = False) -> StatsDelta:
+        """Build a delta from (category, name, level) tuples"""
+        delta = StatsDelta()
+        for category, name, level in skills:
+            (delta.remove if removed else delta.add)(category, name, level)
+        return delta
+    
+    @staticmethod
+    async def rebuild(db: AsyncSession) -> int:
+        """Recompute skill_stats from the skill table. Returns number of rows written"""
+        await db.execute(delete(SkillStats))
+        aggregate = (
+            select(
+                Skill.category,
+                Skill.name,
+                func.count(Skill.id),
+                func.sum(Skill.level),
+                func.sum(Skill.level * Skill.level),
+            )
+            .group_by(Skill.category, Skill.name)
+        )
+        await db.execute(
+            insert(SkillStats).from_select(
+                ["category", "name", "count", "level_sum", "level_sq_sum"], aggregate
+            )
+        )
+        await db.commit()
+        result = await db.execute(select(func.count()).select_from(SkillStats))
+        return result.scalar_one()
+    
+    @staticmethod
+    async def get_stats(
+        db: AsyncSession,
+        category: Optional[str] = None,
+        name: Optional[str] = None,
+        min_count: int = 1,
+        skip: int = 0,
+        limit: int = 100,
+    ) -> List[SkillStats]:
+        """Get stats rows, most common skills first"""
+        query = select(SkillStats).filter(SkillStats.count >= max(min_count, 1))
+        if category:
+            query = query.filter(SkillStats.category == category)
+        if name:
+            query = query.filter(SkillStats.name == name)
+        query = query.order_by(
+            SkillStats.count.desc(), SkillStats.category, SkillStats.name
+        ).offset(skip).limit(limit)
+        result = await db.execute(query)
+        return result.scalars().all()
+    
+    @staticmethod
+    async def get_skill_names(db: AsyncSession) -> List[str]:
+        """Distinct skill names currently held by at least one user"""
+        result = await db.execute(
+            select(SkillStats.name).filter(SkillStats.count > 0).distinct()
+        )
+        return result.scalars().all()
+    
+    @staticmethod
+    async def get_category_totals(db: AsyncSession) -> List[tuple]:
+        """Roll the per-skill rows up to (category, count, level_sum, level_sq_sum)"""
+        result = await db.execute(
+            select(
+                SkillStats.category,
+                func.sum(SkillStats.count),
+                func.sum(SkillStats.level_sum),
+                func.sum(SkillStats.level_sq_sum),
+            )
+            .filter(SkillStats.count > 0)
+            .group_by(SkillStats.category)
+            .order_by(SkillStats.category)
+        )
+        return result.all()
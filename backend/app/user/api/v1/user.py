@@ -1,14 +1,20 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Request
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
+from typing import List, Optional, Union
 from database.database import get_session
-from ...schema.user import UserCreate, UserUpdate, UserResponse, UserLogin, UserProfile
-from ...service.user_service import UserService
+from app.core.pagination import Page, decode_cursor
+from app.core.etag import make_etag, etag_matches, set_etag, not_modified
+from app.core.responses import json_response
+from app.core.query_budget import query_budget
+from ...schema.user import UserCreate, UserUpdate, UserResponse, UserLogin, UserProfile, SimilarUser
+from ...service.user_service import UserService, USER_PAGE_COLUMNS
 from app.core.auth import AuthService, get_current_user
+from app.skill.service.similarity_service import SimilarityService
 
 router = APIRouter()
 
 @router.post("/", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
+@query_budget(2)
 async def create_user(
     user_data: UserCreate,
     db: AsyncSession = Depends(get_session)
@@ -22,44 +28,78 @@ async def create_user(
     
     try:
         db_user = await UserService.create_user(db, user_data)
-        return UserResponse.model_validate(db_user)
+        return json_response(UserResponse, db_user, status_code=status.HTTP_201_CREATED)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error creating user: {str(e)}"
         )
 
-@router.get("/", response_model=List[UserResponse])
+@router.get("/", response_model=Union[List[UserResponse], Page[UserResponse]])
+@query_budget(1)
 async def get_users(
-    skip: int = 0,
-    limit: int = 100,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="Keyset cursor; pass an empty value for the first page"),
     db: AsyncSession = Depends(get_session)
 ):
-    """Get all users with pagination"""
+    """Get all users with pagination.
+
+    With `cursor` the result is a page ordered by (name, id) with a
+    `next_cursor`; without it the legacy skip/limit list is returned.
+    """
+    if cursor is not None:
+        after = decode_cursor(cursor, "name", USER_PAGE_COLUMNS)
+        users, next_cursor = await UserService.get_users_page(db, limit=limit, after=after)
+        return json_response(Page[UserResponse], {"items": users, "next_cursor": next_cursor})
+
     users = await UserService.get_all_users(db, skip=skip, limit=limit)
-    return [UserResponse.model_validate(user) for user in users]
+    return json_response(List[UserResponse], users)
+
+# Declared before /{user_id} so "me" is not parsed as an id
+@router.get("/me", response_model=UserResponse)
+@query_budget(1)
+async def get_current_user_info(
+    current_user: UserResponse = Depends(get_current_user)
+):
+    """Get current authenticated user info"""
+    return json_response(UserResponse, current_user)
 
 @router.get("/{user_id}", response_model=UserResponse)
+@query_budget(1)
 async def get_user(
     user_id: int,
+    request: Request,
     db: AsyncSession = Depends(get_session)
 ):
-    """Get user by ID"""
+    """Get user by ID, honouring If-None-Match"""
     user = await UserService.get_user_by_id(db, user_id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found"
         )
-    return UserResponse.model_validate(user)
+
+    etag = make_etag("user", user.id, user.updated_at)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response = json_response(UserResponse, user)
+    set_etag(response, etag)
+    return response
 
 @router.get("/{user_id}/profile", response_model=UserProfile)
+@query_budget(4)
 async def get_user_profile(
     user_id: int,
+    request: Request,
     current_user: UserResponse = Depends(get_current_user),
     db: AsyncSession = Depends(get_session)
 ):
-    """Get user profile with skills for profile page - only own profile allowed"""
+    """Get user profile with skills for profile page - only own profile allowed.
+
+    Supports conditional GET: a matching If-None-Match returns 304 without
+    loading the skills or building the response body.
+    """
     # Users can only access their own profile
     if current_user.id != user_id:
         raise HTTPException(
@@ -67,15 +107,47 @@ async def get_user_profile(
             detail="You can only access your own profile"
         )
     
+    # Revalidate against a single aggregate row before loading any skills
+    fingerprint = await UserService.get_profile_fingerprint(db, user_id)
+    if not fingerprint:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found"
+        )
+
+    etag = make_etag("profile", user_id, *fingerprint)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
     user = await UserService.get_user_profile(db, user_id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found"
         )
-    return UserProfile.model_validate(user)
+    response = json_response(UserProfile, user)
+    set_etag(response, etag)
+    return response
+
+@router.get("/{user_id}/similar", response_model=List[SimilarUser])
+@query_budget(3)
+async def get_similar_users(
+    user_id: int,
+    k: int = Query(10, ge=1, le=100),
+    current_user: UserResponse = Depends(get_current_user),
+    db: AsyncSession = Depends(get_session)
+):
+    """Top-k users whose skill profiles are most similar to this user's"""
+    matches = await SimilarityService.get_similar_users(user_id, k=k)
+    users = await UserService.get_users_by_ids(db, [match_id for match_id, _ in matches])
+    scores = dict(matches)
+    return json_response(
+        List[SimilarUser],
+        [{"user": user, "score": scores[user.id]} for user in users]
+    )
 
 @router.put("/{user_id}", response_model=UserResponse)
+@query_budget(1)
 async def update_user(
     user_id: int,
     user_data: UserUpdate,
@@ -88,9 +160,10 @@ async def update_user(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found"
         )
-    return UserResponse.model_validate(updated_user)
+    return json_response(UserResponse, updated_user)
 
 @router.delete("/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
+@query_budget(4)
 async def delete_user(
     user_id: int,
     db: AsyncSession = Depends(get_session)
@@ -102,8 +175,10 @@ async def delete_user(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found"
         )
+    await AuthService.revoke_user_sessions(user_id)
 
 @router.post("/login")
+@query_budget(3)
 async def login_user(
     credentials: UserLogin,
     request: Request,
@@ -127,6 +202,7 @@ async def login_user(
     }
 
 @router.post("/logout")
+@query_budget(1)
 async def logout_user(
     request: Request,
     current_user: UserResponse = Depends(get_current_user)
@@ -135,14 +211,8 @@ async def logout_user(
     AuthService.logout_user(request)
     return {"message": "Logout successful"}
 
-@router.get("/me", response_model=UserResponse)
-async def get_current_user_info(
-    current_user: UserResponse = Depends(get_current_user)
-):
-    """Get current authenticated user info"""
-    return current_user
-
 @router.get("/email/{email}", response_model=UserResponse)
+@query_budget(1)
 async def get_user_by_email(
     email: str,
     db: AsyncSession = Depends(get_session)
@@ -154,4 +224,4 @@ async def get_user_by_email(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found"
         )
-    return UserResponse.model_validate(user)
\ No newline at end of file
+    return json_response(UserResponse, user)
\ No newline at end of file
@@ -1,10 +1,14 @@
-from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy import Column, Integer, String, DateTime, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from database.base import Base
 
 class User(Base):
     __tablename__ = "user"
+    __table_args__ = (
+        # Supports keyset pagination ordered by (name, id)
+        Index("ix_user_name_id", "name", "id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     name = Column(String(100), nullable=False, index=True)
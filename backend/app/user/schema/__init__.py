@@ -1,3 +1,3 @@
-from .user import UserCreate, UserUpdate, UserResponse, UserLogin, UserProfile, UserSkillForProfile
+from .user import UserCreate, UserUpdate, UserResponse, UserLogin, UserProfile, UserSkillForProfile, SimilarUser
 
-__all__ = ["UserCreate", "UserUpdate", "UserResponse", "UserLogin", "UserProfile", "UserSkillForProfile"]
+__all__ = ["UserCreate", "UserUpdate", "UserResponse", "UserLogin", "UserProfile", "UserSkillForProfile", "SimilarUser"]
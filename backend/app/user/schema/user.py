@@ -54,3 +54,9 @@ class UserSkillForProfile(BaseModel):
 class UserProfile(UserResponse):
     """Extended user schema for profile page with skills"""
     skills: List[UserSkillForProfile] = Field(default=[], description="User's skills for spider chart")
+
+
+class SimilarUser(BaseModel):
+    """A user with a similar skill profile"""
+    user: UserResponse = Field(..., description="The similar user")
+    score: float = Field(..., description="Cosine similarity of skill levels, from 0 to 1")
@@ -1,10 +1,37 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, delete
-from sqlalchemy.orm import selectinload
-from typing import Optional, List
+from sqlalchemy import select, insert, update, delete, exists, func
+from sqlalchemy.orm import selectinload, make_transient_to_detached
+from typing import Optional, List, Tuple
+from app.core.cache import TTLCache
+from app.core.cache_bus import cache_bus
+from app.core.security import hash_password, verify_password, DUMMY_HASH
+from app.core.pagination import keyset_filter, split_page
+from app.core.settings import settings
 from ..model.user import User
 from ..schema.user import UserCreate, UserUpdate, UserResponse, UserProfile
 from ...skill.model.skill import Skill
+from ...skill.model.skill_level_history import SkillLevelHistory
+from ...skill.service.skill_service import SkillService
+from ...skill.service.skill_history_service import skill_history_recorder
+
+
+# Snapshots of user rows keyed by id, used to authenticate requests
+user_cache: TTLCache[User] = TTLCache(
+    maxsize=settings.USER_CACHE_MAXSIZE,
+    ttl=settings.USER_CACHE_TTL,
+    on_invalidate=lambda user_id: cache_bus.publish("user", user_id),
+)
+cache_bus.register("user", user_cache.forget, user_cache.clear)
+
+# Keyset order of the cursor-paginated user listing
+USER_PAGE_COLUMNS = (User.name, User.id)
+
+
+def _detached_copy(user: User) -> User:
+    """Copy a user's column values into a detached instance safe to share"""
+    copy = User(**{column.key: getattr(user, column.key) for column in User.__table__.columns})
+    make_transient_to_detached(copy)
+    return copy
 
 
 class UserService:
@@ -13,16 +40,18 @@ class UserService:
     @staticmethod
     async def create_user(db: AsyncSession, user_data: UserCreate) -> User:
         """Create a new user"""
-        db_user = User(
-            name=user_data.name,
-            position=user_data.position,
-            email=user_data.email,
-            password=user_data.password,
-            avatar_url=user_data.avatar_url
+        db_user = await db.scalar(
+            insert(User)
+            .values(
+                name=user_data.name,
+                position=user_data.position,
+                email=user_data.email,
+                password=await hash_password(user_data.password),
+                avatar_url=user_data.avatar_url
+            )
+            .returning(User)
         )
-        db.add(db_user)
         await db.commit()
-        await db.refresh(db_user)
         return db_user
     
     @staticmethod
@@ -31,6 +60,27 @@ class UserService:
         result = await db.execute(select(User).filter(User.id == user_id))
         return result.scalar_one_or_none()
     
+    @staticmethod
+    async def get_cached_user(db: AsyncSession, user_id: int) -> Optional[User]:
+        """Get user by ID, serving from the in-process cache when possible"""
+        cached = user_cache.get(user_id)
+        if cached is not None:
+            return cached
+
+        user = await UserService.get_user_by_id(db, user_id)
+        if user:
+            user_cache.set(user_id, _detached_copy(user))
+        return user
+    
+    @staticmethod
+    async def get_users_by_ids(db: AsyncSession, user_ids: List[int]) -> List[User]:
+        """Get several users by ID in one query, preserving the given order"""
+        if not user_ids:
+            return []
+        result = await db.execute(select(User).filter(User.id.in_(user_ids)))
+        users = {user.id: user for user in result.scalars().all()}
+        return [users[user_id] for user_id in user_ids if user_id in users]
+    
     @staticmethod
     async def get_user_by_email(db: AsyncSession, email: str) -> Optional[User]:
         """Get user by email"""
@@ -41,43 +91,81 @@ class UserService:
     async def get_all_users(db: AsyncSession, skip: int = 0, limit: int = 100) -> List[User]:
         """Get all users with pagination"""
         result = await db.execute(select(User).offset(skip).limit(limit))
-        return result.scalars().all()    
+        return result.scalars().all()
+
+    @staticmethod
+    async def get_users_page(
+        db: AsyncSession, limit: int = 100, after: Optional[Tuple] = None
+    ) -> Tuple[List[User], Optional[str]]:
+        """Get a page of users ordered by (name, id) using keyset pagination"""
+        query = keyset_filter(select(User), USER_PAGE_COLUMNS, after, limit)
+        result = await db.execute(query)
+        return split_page(result.scalars().all(), limit, "name", lambda user: (user.name, user.id))
+
     @staticmethod
     async def update_user(db: AsyncSession, user_id: int, user_data: UserUpdate) -> Optional[User]:
-        """Update user by ID"""
-        db_user = await UserService.get_user_by_id(db, user_id)
+        """Update user by ID with one UPDATE ... RETURNING; None if no such user"""
+        update_data = user_data.model_dump(exclude_unset=True)
+        if not update_data:
+            return await UserService.get_user_by_id(db, user_id)
+
+        db_user = await db.scalar(
+            update(User)
+            .where(User.id == user_id)
+            .values(**update_data)
+            .returning(User)
+            .execution_options(synchronize_session=False, populate_existing=True)
+        )
         if not db_user:
             return None
 
-        update_data = user_data.model_dump(exclude_unset=True)
-        for field, value in update_data.items():
-            setattr(db_user, field, value)
-
         await db.commit()
-        await db.refresh(db_user)
+        user_cache.invalidate(user_id)
         return db_user
     
     @staticmethod
     async def delete_user(db: AsyncSession, user_id: int) -> bool:
-        """Delete user by ID"""
-        db_user = await UserService.get_user_by_id(db, user_id)
-        if not db_user:
-            return False
+        """Delete user by ID with DELETE ... RETURNING; False if no such user"""
+        # Delete all skills associated with the user first, keeping org stats in step
+        await SkillService.delete_skills_by_user_id(db, user_id, commit=False)
+        # Queued history rows would otherwise be written after the DELETE below
+        await skill_history_recorder.discard_user(user_id)
+        await db.execute(delete(SkillLevelHistory).where(SkillLevelHistory.user_id == user_id))
         
-        # Delete all skills associated with the user first
-        await db.execute(delete(Skill).filter(Skill.user_id == user_id))
+        result = await db.execute(
+            delete(User)
+            .where(User.id == user_id)
+            .returning(User.id)
+            .execution_options(synchronize_session=False)
+        )
+        if result.scalar_one_or_none() is None:
+            await db.rollback()
+            return False
         
-        await db.delete(db_user)
         await db.commit()
+        user_cache.invalidate(user_id)
         return True
     
     @staticmethod
     async def authenticate_user(db: AsyncSession, email: str, password: str) -> Optional[User]:
         """Authenticate user with email and password"""
         user = await UserService.get_user_by_email(db, email)
-        if user and user.password == password: 
-            return user
-        return None
+        if not user:
+            # Spend the same hashing time as a real check so timing does not reveal the email
+            await verify_password(password, DUMMY_HASH)
+            return None
+
+        matches, needs_rehash = await verify_password(password, user.password)
+        if not matches:
+            return None
+
+        if needs_rehash:
+            # Upgrade legacy plaintext (or outdated) hashes on a successful login
+            user.password = await hash_password(password)
+            await db.commit()
+            user_cache.invalidate(user.id)
+            await db.refresh(user)
+        return user
     
     @staticmethod
     async def get_user_profile(db: AsyncSession, user_id: int) -> Optional[User]:
@@ -89,14 +177,37 @@ class UserService:
         )
         return result.scalar_one_or_none()
     
+    @staticmethod
+    async def get_profile_fingerprint(db: AsyncSession, user_id: int) -> Optional[tuple]:
+        """Cheap freshness key for a user's profile without loading its skills.
+
+        Combines the user's updated_at with the count, newest updated_at and
+        id sum of its skills, so creates, updates and deletes all change it.
+        Returns None when the user does not exist.
+        """
+        result = await db.execute(
+            select(
+                User.updated_at,
+                func.count(Skill.id),
+                func.max(Skill.updated_at),
+                func.coalesce(func.sum(Skill.id), 0),
+            )
+            .select_from(User)
+            .outerjoin(Skill, Skill.user_id == User.id)
+            .filter(User.id == user_id)
+            .group_by(User.id, User.updated_at)
+        )
+        row = result.first()
+        return tuple(row) if row else None
+    
     @staticmethod
     async def user_exists(db: AsyncSession, email: str) -> bool:
         """Check if user exists by email"""
-        result = await db.execute(select(User).filter(User.email == email))
-        return result.scalar_one_or_none() is not None
+        return await db.scalar(select(exists().where(User.email == email)))
     
     @staticmethod
     async def get_user_skills_count(db: AsyncSession, user_id: int) -> int:
         """Get count of skills for a user"""
-        result = await db.execute(select(Skill).filter(Skill.user_id == user_id))
-        return len(result.scalars().all())
+        return await db.scalar(
+            select(func.count()).select_from(Skill).filter(Skill.user_id == user_id)
+        )
@@ -0,0 +1,356 @@
+"""
+Load benchmark for the HTTP API, with JSON baselines and regression checks.
+
+Starts `main:app` under uvicorn in a subprocess, seeds a dataset, logs in
+one virtual client per connection and drives every scenario with a fixed
+number of requests at a fixed concurrency. Throughput and p50/p95/p99
+latency are reported per endpoint and saved as JSON. By default the
+server runs against a throwaway SQLite database; --database uses the
+configured DATABASE_URL (a migrated PostgreSQL) instead. --workers runs
+`serve.py` with that many processes instead of a single uvicorn; more
+than one needs SESSION_BACKEND=redis, as serve.py refuses to share
+in-memory sessions between workers.
+
+    python -m benchmarks.api_load run --requests 500 --concurrency 16
+    python -m benchmarks.api_load run --output benchmarks/baselines/main.json
+    python -m benchmarks.api_load run --workers 4 --concurrency 64
+    python -m benchmarks.api_load compare benchmarks/baselines/main.json new.json --threshold 0.1
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from benchmarks.skill_search import percentile
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+PASSWORD = "benchmark"
+
+# Scenario name -> (share of --requests, expected status)
+SCENARIOS: Dict[str, Tuple[float, int]] = {
+    "login": (0.1, 200),
+    "me": (1.0, 200),
+    "users_list": (1.0, 200),
+    "users_page": (1.0, 200),
+    "user_get": (1.0, 200),
+    "user_profile": (1.0, 200),
+    "user_update": (1.0, 200),
+    "skills_list": (1.0, 200),
+    "skill_get": (1.0, 200),
+    "skill_create": (1.0, 201),
+    "skill_update": (1.0, 200),
+    "skill_delete": (1.0, 204),
+}
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR, text=True, stderr=subprocess.DEVNULL
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def seed(users: int, skills_per_user: int, clients: int, rng: random.Random) -> List[str]:
+    """Insert background users/skills plus one login per virtual client"""
+    from sqlalchemy import insert
+    from app.core.security import hash_password_sync
+    from app.skill.model.skill import Skill
+    from app.skill.service.skill_stats_service import SkillStatsService
+    from app.user.model.user import User
+    from database.database import async_session_factory, engine
+
+    password = hash_password_sync(PASSWORD)
+    tag = f"{time.time_ns():x}"
+    rows = [
+        {"name": f"Load User {index}", "position": "Engineer", "email": f"load-{tag}-{index}@example.com", "password": password}
+        for index in range(users + clients)
+    ]
+    async with async_session_factory() as db:
+        result = await db.scalars(insert(User).returning(User.id, sort_by_parameter_order=True), rows)
+        user_ids = result.all()
+        skills = [
+            {"user_id": user_id, "name": f"Skill {index}", "category": f"Category {index % 8}", "level": float(rng.randint(1, 10))}
+            for user_id in user_ids
+            for index in rng.sample(range(skills_per_user * 5), skills_per_user)
+        ]
+        await (await db.connection()).execute(insert(Skill), skills)
+        await db.commit()
+        await SkillStatsService.rebuild(db)
+    await engine.dispose()
+    return [row["email"] for row in rows[users:]]
+
+
+class Client:
+    """One logged-in virtual user with its own cookie jar"""
+
+    def __init__(self, http, user_id: int, skill_ids: List[int]) -> None:
+        self.http = http
+        self.user_id = user_id
+        self.skill_ids = skill_ids
+        self.created: List[int] = []
+        self.email = ""
+
+
+def scenario_request(name: str, client: Client, others: List[int], rng: random.Random) -> Callable[[], Awaitable[Any]]:
+    """Build the request a scenario sends for one iteration"""
+    http = client.http
+    if name == "login":
+        return lambda: http.post("/api/v1/users/login", json={"email": client.email, "password": PASSWORD})
+    if name == "me":
+        return lambda: http.get("/api/v1/users/me")
+    if name == "users_list":
+        return lambda: http.get("/api/v1/users/", params={"limit": 50})
+    if name == "users_page":
+        return lambda: http.get("/api/v1/users/", params={"limit": 50, "cursor": ""})
+    if name == "user_get":
+        return lambda: http.get(f"/api/v1/users/{rng.choice(others)}")
+    if name == "user_profile":
+        return lambda: http.get(f"/api/v1/users/{client.user_id}/profile")
+    if name == "user_update":
+        return lambda: http.put(f"/api/v1/users/{client.user_id}", json={"position": f"Engineer {rng.randint(1, 9)}"})
+    if name == "skills_list":
+        return lambda: http.get("/api/v1/skills/")
+    if name == "skill_get":
+        return lambda: http.get(f"/api/v1/skills/{rng.choice(client.skill_ids)}")
+    if name == "skill_create":
+        async def create():
+            response = await http.post("/api/v1/skills/", json={
+                "name": f"Load {rng.random():.12f}", "category": "Load", "level": rng.randint(1, 10),
+                "user_id": client.user_id,
+            })
+            if response.status_code == 201:
+                client.created.append(response.json()["id"])
+            return response
+        return create
+    if name == "skill_update":
+        return lambda: http.put(
+            f"/api/v1/skills/{rng.choice(client.created or client.skill_ids)}", json={"level": rng.randint(1, 10)}
+        )
+    if name == "skill_delete":
+        async def delete():
+            if not client.created:
+                return None
+            return await http.delete(f"/api/v1/skills/{client.created.pop()}")
+        return delete
+    raise ValueError(f"Unknown scenario {name}")
+
+
+async def run_scenario(name: str, clients: List[Client], others: List[int], requests: int, rng: random.Random) -> Dict[str, Any]:
+    expected = SCENARIOS[name][1]
+    remaining = requests
+    latencies: List[float] = []
+    errors = 0
+
+    async def worker(client: Client) -> None:
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            send = scenario_request(name, client, others, rng)
+            start = time.perf_counter()
+            response = await send()
+            if response is None:
+                continue
+            latencies.append(time.perf_counter() - start)
+            if response.status_code != expected:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(client) for client in clients))
+    elapsed = time.perf_counter() - start
+    if not latencies:
+        return {"requests": 0, "errors": errors}
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "throughput": round(len(latencies) / elapsed, 2),
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 3),
+        "max_ms": round(max(latencies) * 1000, 3),
+    }
+
+
+async def drive(base_url: str, emails: List[str], args: argparse.Namespace) -> Dict[str, Dict[str, Any]]:
+    import httpx
+
+    rng = random.Random(args.seed)
+    limits = httpx.Limits(max_connections=1)
+    clients: List[Client] = []
+    for email in emails:
+        http = httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60)
+        response = await http.post("/api/v1/users/login", json={"email": email, "password": PASSWORD})
+        response.raise_for_status()
+        user_id = response.json()["user"]["id"]
+        skills = (await http.get("/api/v1/skills/")).json()
+        client = Client(http, user_id, [skill["id"] for skill in skills])
+        client.email = email
+        clients.append(client)
+    others = [client.user_id for client in clients]
+
+    selected = args.only or list(SCENARIOS)
+    results: Dict[str, Dict[str, Any]] = {}
+    try:
+        for name in selected:
+            requests = max(1, int(args.requests * SCENARIOS[name][0]))
+            results[name] = await run_scenario(name, clients, others, requests, rng)
+            print(format_row(name, results[name]), flush=True)
+    finally:
+        for client in clients:
+            await client.http.aclose()
+    return results
+
+
+def format_row(name: str, result: Dict[str, Any]) -> str:
+    if not result.get("requests"):
+        return f"{name:<14} no requests"
+    return (
+        f"{name:<14} n={result['requests']:<6} err={result['errors']:<4} "
+        f"{result['throughput']:>9.1f} req/s  p50={result['p50_ms']:.2f}ms "
+        f"p95={result['p95_ms']:.2f}ms p99={result['p99_ms']:.2f}ms"
+    )
+
+
+def wait_for_server(base_url: str, process: subprocess.Popen, timeout: float = 30.0) -> None:
+    import httpx
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError("server exited during startup")
+        try:
+            if httpx.get(f"{base_url}/health").status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError("server did not become healthy in time")
+
+
+def run(args: argparse.Namespace) -> int:
+    env = dict(os.environ)
+    if not args.database:
+        env.setdefault("APP_NAME", "API load benchmark")
+        env.setdefault("APP_VERSION", "0")
+        env.setdefault("HOST", "127.0.0.1")
+        env["DATABASE_URL"] = f"sqlite+aiosqlite:///{tempfile.mkdtemp(prefix='api-load-')}/bench.db"
+        os.environ.update({key: env[key] for key in ("APP_NAME", "APP_VERSION", "HOST", "DATABASE_URL")})
+
+    async def prepare() -> List[str]:
+        if not args.database:
+            from database.base import Base
+            from database.database import engine
+            import app.skill.model  # noqa: F401
+            import app.user.model  # noqa: F401
+            async with engine.begin() as conn:
+                await conn.run_sync(Base.metadata.create_all)
+        return await seed(args.users, args.skills_per_user, args.concurrency, random.Random(args.seed))
+
+    emails = asyncio.run(prepare())
+    from database.database import DATABASE_URL
+
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    if args.workers:
+        command = [sys.executable, "serve.py"]
+        env.update(HOST="127.0.0.1", PORT=str(port), WEB_CONCURRENCY=str(args.workers), DEBUG="false")
+    else:
+        command = [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port),
+                   "--log-level", "warning", "--no-access-log"]
+    server = subprocess.Popen(command, cwd=BACKEND_DIR, env=env)
+    try:
+        wait_for_server(base_url, server)
+        results = asyncio.run(drive(base_url, emails, args))
+    finally:
+        server.terminate()
+        server.wait()
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "database": DATABASE_URL.split(":", 1)[0],
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "users": args.users,
+            "skills_per_user": args.skills_per_user,
+            "seed": args.seed,
+            "workers": args.workers or 1,
+        },
+        "results": results,
+    }
+    output = Path(args.output or BACKEND_DIR / "benchmarks" / "baselines" / f"{report['meta']['commit'] or 'local'}.json")
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2) + "\n")
+    print(f"saved {output}")
+    return 0
+
+
+def compare(args: argparse.Namespace) -> int:
+    """Flag endpoints whose p95 grew or throughput fell by more than the threshold"""
+    base = json.loads(Path(args.baseline).read_text())
+    new = json.loads(Path(args.candidate).read_text())
+    print(f"baseline {base['meta'].get('commit')}  candidate {new['meta'].get('commit')}  threshold {args.threshold:.0%}")
+    regressions = 0
+    for name, before in base["results"].items():
+        after = new["results"].get(name)
+        if not after or not before.get("requests") or not after.get("requests"):
+            continue
+        p95 = after["p95_ms"] / before["p95_ms"] - 1 if before["p95_ms"] else 0.0
+        throughput = after["throughput"] / before["throughput"] - 1
+        regressed = p95 > args.threshold or throughput < -args.threshold or after["errors"] > before["errors"]
+        regressions += regressed
+        print(
+            f"{'REGRESSION' if regressed else 'ok':<10} {name:<14} "
+            f"p95 {before['p95_ms']:.2f} -> {after['p95_ms']:.2f}ms ({p95:+.1%})  "
+            f"throughput {before['throughput']:.1f} -> {after['throughput']:.1f} ({throughput:+.1%})  "
+            f"errors {before['errors']} -> {after['errors']}"
+        )
+    print(f"{regressions} regression(s)")
+    return 1 if regressions else 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="run the load benchmark and save a JSON report")
+    run_parser.add_argument("--requests", type=int, default=500, help="requests per scenario (login uses a tenth)")
+    run_parser.add_argument("--concurrency", type=int, default=16, help="virtual clients, each with one connection")
+    run_parser.add_argument("--users", type=int, default=1_000, help="background users to seed")
+    run_parser.add_argument("--skills-per-user", type=int, default=10)
+    run_parser.add_argument("--only", nargs="+", choices=list(SCENARIOS), help="run a subset of scenarios")
+    run_parser.add_argument("--seed", type=int, default=42)
+    run_parser.add_argument("--workers", type=int, help="serve with serve.py and this many worker processes (more than one needs SESSION_BACKEND=redis)")
+    run_parser.add_argument("--database", action="store_true", help="use DATABASE_URL instead of a temp SQLite file")
+    run_parser.add_argument("--output", help="report path (default benchmarks/baselines/<commit>.json)")
+
+    compare_parser = commands.add_parser("compare", help="compare two reports and exit 1 on regressions")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("candidate")
+    compare_parser.add_argument("--threshold", type=float, default=0.10, help="allowed relative change (0.10 = 10%%)")
+
+    args = parser.parse_args()
+    sys.exit(run(args) if args.command == "run" else compare(args))
+
+
+if __name__ == "__main__":
+    main()
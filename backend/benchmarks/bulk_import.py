@@ -0,0 +1,87 @@
+"""
+Throughput benchmark for the bulk import pipeline.
+
+Generates CSVs in memory and imports them in three phases: users with
+plain passwords (scrypt hashing bounds the rate), users with precomputed
+password hashes (no hashing on import), then skill rows that reference
+the first users by email, which is the bulk of a real import.
+By default a throwaway SQLite database is used; --database imports into
+the configured DATABASE_URL instead (PostgreSQL takes the COPY path).
+
+    python -m benchmarks.bulk_import --users 500 --skills-per-user 100
+    python -m benchmarks.bulk_import --users 500 --skills-per-user 100 --database
+"""
+import argparse
+import asyncio
+import io
+import os
+import random
+import tempfile
+import time
+import uuid
+
+
+def generate(users: int, skills_per_user: int, rng: random.Random, tag: str, password_hash: str):
+    """Return (users CSV, hashed users CSV, skills CSV) with emails unique to this run"""
+    emails = [f"bulk-{tag}-{index}@example.com" for index in range(users)]
+    user_rows = ["user_email,user_name,user_position,user_password"]
+    user_rows += [f"{email},Bulk User {index},Engineer,bulk-password" for index, email in enumerate(emails)]
+    hashed_rows = ["user_email,user_name,user_position,user_password_hash"]
+    hashed_rows += [
+        f"bulk-{tag}-hashed-{index}@example.com,Bulk User {index},Engineer,{password_hash}" for index in range(users)
+    ]
+    skill_rows = ["user_email,skill_name,skill_category,skill_level"]
+    for email in emails:
+        for index in rng.sample(range(skills_per_user * 4), skills_per_user):
+            skill_rows.append(f"{email},Skill {index},Category {index % 12},{rng.randint(1, 10)}")
+    return tuple("\n".join(rows) + "\n" for rows in (user_rows, hashed_rows, skill_rows))
+
+
+async def run(args: argparse.Namespace) -> None:
+    from app.core.security import hash_password_sync
+    from app.importer.service.import_service import ImportService
+    from database.base import Base
+    from database.database import async_session_factory, engine
+    import app.skill.model  # noqa: F401
+    import app.user.model  # noqa: F401
+
+    if not args.database:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+    users_csv, hashed_csv, skills_csv = generate(
+        args.users, args.skills_per_user, random.Random(args.seed), uuid.uuid4().hex[:8],
+        hash_password_sync("bulk-password"),
+    )
+    for label, body in (("users", users_csv), ("hashed", hashed_csv), ("skills", skills_csv)):
+        records = ImportService.parse_csv(io.StringIO(body))
+        async with async_session_factory() as db:
+            start = time.perf_counter()
+            result = await ImportService.import_records(db, records, batch_size=args.batch_size)
+            elapsed = time.perf_counter() - start
+        print(
+            f"{label:<7} rows={result.rows:<8} {elapsed:.2f}s {result.rows / elapsed:,.0f} rows/s "
+            f"(users +{result.users_created} skills +{result.skills_created}, errors={result.error_count})"
+        )
+    await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument("--skills-per-user", type=int, default=100)
+    parser.add_argument("--batch-size", type=int, default=None)
+    parser.add_argument("--database", action="store_true", help="use DATABASE_URL instead of a temp SQLite file")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    if not args.database:
+        os.environ.setdefault("APP_NAME", "Bulk import benchmark")
+        os.environ.setdefault("APP_VERSION", "0")
+        os.environ.setdefault("HOST", "127.0.0.1")
+        os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{tempfile.mkdtemp(prefix='bulk-import-')}/bench.db"
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Shows that a burst of logins does not stall unrelated requests.
+
+Runs the FastAPI app in-process against a throwaway SQLite database,
+fires a burst of concurrent logins and meanwhile probes GET /health.
+Probe latency is reported for the worker-pool hashing path and, for
+comparison, with hashing forced onto the event loop (--inline).
+
+    python -m benchmarks.login_burst --logins 200
+    python -m benchmarks.login_burst --logins 200 --inline
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+from benchmarks.skill_search import report
+
+_db_dir = tempfile.mkdtemp(prefix="login-burst-")
+os.environ.setdefault("APP_NAME", "Login burst benchmark")
+os.environ.setdefault("APP_VERSION", "0")
+os.environ.setdefault("HOST", "127.0.0.1")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{_db_dir}/bench.db"
+
+
+async def probe(client, stop: asyncio.Event, samples: list, interval: float = 0.005) -> None:
+    """Request /health every `interval` seconds and record how late each answer was.
+
+    Latency is measured from when the probe was due, so time spent waiting
+    for a blocked event loop counts against it.
+    """
+    while not stop.is_set():
+        due = time.perf_counter() + interval
+        await asyncio.sleep(interval)
+        await client.get("/health")
+        samples.append(time.perf_counter() - due)
+
+async def run(logins: int, inline: bool) -> None:
+    import httpx
+    from app.core import security
+    from app.user.schema.user import UserCreate
+    from app.user.service.user_service import UserService
+    from database.base import Base
+    from database.database import async_session_factory, engine
+    from main import app
+
+    if inline:
+        async def _inline(func, *args):
+            return func(*args)
+        security._run = _inline
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with async_session_factory() as db:
+        await UserService.create_user(db, UserCreate(
+            name="Bench", position="Benchmark", email="bench@example.com", password="benchmark"
+        ))
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        idle: list = []
+        stop = asyncio.Event()
+        task = asyncio.create_task(probe(client, stop, idle))
+        await asyncio.sleep(1.0)
+        stop.set()
+        await task
+        report("idle /health", idle)
+
+        busy: list = []
+        stop = asyncio.Event()
+        task = asyncio.create_task(probe(client, stop, busy))
+        credentials = {"email": "bench@example.com", "password": "benchmark"}
+        start = time.perf_counter()
+        responses = await asyncio.gather(*[
+            client.post("/api/v1/users/login", json=credentials) for _ in range(logins)
+        ])
+        elapsed = time.perf_counter() - start
+        stop.set()
+        await task
+        report("burst /health", busy)
+        ok = sum(response.status_code == 200 for response in responses)
+        print(f"{ok}/{logins} logins in {elapsed:.2f}s ({logins / elapsed:.0f}/s), hashing {'inline' if inline else 'in worker pool'}")
+    await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--inline", action="store_true", help="hash on the event loop for comparison")
+    args = parser.parse_args()
+    asyncio.run(run(args.logins, args.inline))
+
+
+if __name__ == "__main__":
+    main()
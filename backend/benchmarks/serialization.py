@@ -0,0 +1,67 @@
+"""
+CPU benchmark for encoding a list response.
+
+Compares the previous path (model_validate per row, then FastAPI's
+response_model validation and jsonable_encoder inside JSONResponse) with
+json_response, which validates and encodes once in pydantic-core. No
+database or server is needed; rows are transient User instances.
+
+    python -m benchmarks.serialization --rows 100 --requests 2000
+"""
+import argparse
+import asyncio
+import time
+from datetime import datetime, timezone
+from typing import List
+
+from benchmarks.skill_search import report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100, help="objects per response")
+    parser.add_argument("--requests", type=int, default=2_000)
+    args = parser.parse_args()
+
+    from fastapi.responses import JSONResponse
+    from fastapi.routing import serialize_response
+    from fastapi.utils import create_model_field
+    from app.core.responses import json_response
+    from app.skill.model.skill import Skill  # noqa: F401 - registers the User.skills target
+    from app.user.model.user import User
+    from app.user.schema.user import UserResponse
+
+    now = datetime.now(timezone.utc)
+    users = [
+        User(
+            id=index, name=f"User {index}", position="Engineer", email=f"user{index}@example.com",
+            password="x", avatar_url=None, created_at=now, updated_at=now
+        )
+        for index in range(1, args.rows + 1)
+    ]
+    field = create_model_field(name="response", type_=List[UserResponse], mode="serialization")
+
+    async def legacy() -> bytes:
+        content = await serialize_response(
+            field=field, response_content=[UserResponse.model_validate(user) for user in users]
+        )
+        return JSONResponse(content).body
+
+    async def single_pass() -> bytes:
+        return json_response(List[UserResponse], users).body
+
+    async def run() -> None:
+        assert (await legacy()).replace(b" ", b"") == (await single_pass()).replace(b" ", b"")
+        for label, encode in (("legacy", legacy), ("json_response", single_pass)):
+            samples = []
+            for _ in range(args.requests):
+                start = time.process_time()
+                await encode()
+                samples.append(time.process_time() - start)
+            report(label, samples)
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
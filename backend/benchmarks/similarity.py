@@ -0,0 +1,59 @@
+"""
+Latency benchmark for the skill similarity matrix.
+
+Builds a synthetic matrix in-process (no database needed) and times
+top-k queries and single-cell updates.
+
+    python -m benchmarks.similarity --users 50000 --skills 2000
+"""
+import argparse
+import random
+import time
+
+from benchmarks.skill_search import report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=50_000)
+    parser.add_argument("--skills", type=int, default=2_000, help="distinct skill names")
+    parser.add_argument("--per-user", type=int, default=15, help="skills per user")
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("-k", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    from app.skill.service.similarity_service import SkillMatrix
+
+    rng = random.Random(args.seed)
+    names = [f"skill-{index}" for index in range(args.skills)]
+    # Zipf-like popularity so a few skills are very common
+    weights = [1.0 / (rank + 1) for rank in range(args.skills)]
+    rows = []
+    for user_id in range(1, args.users + 1):
+        for name in set(rng.choices(names, weights=weights, k=args.per_user)):
+            rows.append((user_id, name, float(rng.randint(1, 10))))
+
+    matrix = SkillMatrix()
+    start = time.perf_counter()
+    matrix.load(rows)
+    print(f"built {args.users}x{args.skills} matrix from {len(rows)} rows in {time.perf_counter() - start:.2f}s")
+
+    user_ids = [rng.randint(1, args.users) for _ in range(args.queries)]
+    samples = []
+    for user_id in user_ids:
+        start = time.perf_counter()
+        matrix.most_similar(user_id, args.k)
+        samples.append(time.perf_counter() - start)
+    report("top-k", samples)
+
+    samples = []
+    for user_id in user_ids:
+        start = time.perf_counter()
+        matrix.set_level(user_id, rng.choice(names), float(rng.randint(1, 10)))
+        samples.append(time.perf_counter() - start)
+    report("update", samples)
+
+
+if __name__ == "__main__":
+    main()
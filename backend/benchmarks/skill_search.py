@@ -0,0 +1,129 @@
+"""
+Latency benchmark for skill autocomplete and search.
+
+Autocomplete is measured in-process against a synthetic name set, so it
+needs no database. With --database, the SQL search is also timed against
+DATABASE_URL (seed it first, e.g. with one million skill rows).
+
+    python -m benchmarks.skill_search --names 200000
+    python -m benchmarks.skill_search --database --queries 500
+"""
+import argparse
+import asyncio
+import random
+import string
+import time
+from typing import Callable, List
+
+
+def percentile(samples: List[float], fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def report(label: str, samples: List[float]) -> None:
+    print(
+        f"{label:<14} n={len(samples):<7} "
+        f"p50={percentile(samples, 0.50) * 1000:.3f}ms "
+        f"p95={percentile(samples, 0.95) * 1000:.3f}ms "
+        f"p99={percentile(samples, 0.99) * 1000:.3f}ms "
+        f"max={max(samples) * 1000:.3f}ms"
+    )
+
+
+def synthetic_names(count: int, rng: random.Random) -> List[str]:
+    names = set()
+    while len(names) < count:
+        length = rng.randint(3, 14)
+        names.add(rng.choice(string.ascii_uppercase) + "".join(rng.choices(string.ascii_lowercase, k=length)))
+    return list(names)
+
+
+def time_calls(call: Callable[[str], object], inputs: List[str]) -> List[float]:
+    samples = []
+    for value in inputs:
+        start = time.perf_counter()
+        call(value)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def bench_autocomplete(names: int, queries: int, seed: int) -> None:
+    from app.skill.service.skill_name_index import SkillNameIndex
+
+    rng = random.Random(seed)
+    corpus = synthetic_names(names, rng)
+    index = SkillNameIndex()
+    start = time.perf_counter()
+    index.load(corpus)
+    print(f"loaded {len(index)} names in {(time.perf_counter() - start) * 1000:.1f}ms")
+
+    prefixes = [rng.choice(corpus)[: rng.randint(1, 4)] for _ in range(queries)]
+    report("autocomplete", time_calls(lambda prefix: index.complete(prefix, 10), prefixes))
+
+
+async def bench_search(queries: int, seed: int) -> None:
+    from sqlalchemy import select
+    from database.database import async_session_factory, engine
+    from app.skill.model.skill import Skill
+    from app.skill.service.skill_service import SkillService
+    from app.skill.service.skill_stats_service import SkillStatsService
+    import app.user.model  # noqa: F401
+
+    rng = random.Random(seed)
+    async with async_session_factory() as db:
+        names = await SkillStatsService.get_skill_names(db)
+        if not names:
+            print("no skills found; seed the database first")
+            return
+        terms = []
+        for _ in range(queries):
+            name = rng.choice(names)
+            # Mix exact substrings with single-character typos
+            if rng.random() < 0.3 and len(name) > 3:
+                position = rng.randrange(len(name))
+                name = name[:position] + rng.choice(string.ascii_lowercase) + name[position + 1:]
+            terms.append(name[: rng.randint(3, max(3, len(name)))])
+        # One- and two-character queries get no help from trigrams
+        short_terms = [rng.choice(names)[: rng.randint(1, 2)] for _ in range(max(1, queries // 5))]
+        # Runs of one to three words taken from skill descriptions
+        descriptions = (await db.execute(
+            select(Skill.description).filter(Skill.description.is_not(None)).limit(10_000)
+        )).scalars().all()
+        description_terms = []
+        for _ in range(max(1, queries // 5) if descriptions else 0):
+            words = rng.choice(descriptions).split()
+            start = rng.randrange(len(words))
+            description_terms.append(" ".join(words[start:start + rng.randint(1, 3)]))
+
+        for label, inputs in (
+            ("search (SQL)", terms),
+            ("search 1-2ch", short_terms),
+            ("search descr", description_terms),
+        ):
+            if not inputs:
+                continue
+            samples = []
+            for term in inputs:
+                start = time.perf_counter()
+                await SkillService.search_skills(db, term, limit=20)
+                samples.append(time.perf_counter() - start)
+            report(label, samples)
+    await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--names", type=int, default=100_000, help="distinct skill names for the autocomplete index")
+    parser.add_argument("--queries", type=int, default=10_000, help="number of lookups to time")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--database", action="store_true", help="also time SQL search against DATABASE_URL")
+    args = parser.parse_args()
+
+    bench_autocomplete(args.names, args.queries, args.seed)
+    if args.database:
+        asyncio.run(bench_search(min(args.queries, 1000), args.seed))
+
+
+if __name__ == "__main__":
+    main()
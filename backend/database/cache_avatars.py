@@ -0,0 +1,51 @@
+import argparse
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.database import async_session_factory, engine
+from app.avatar.service.avatar_service import AvatarService, avatar_source
+import app.skill.model  # noqa: F401  (register the Skill mapper)
+
+
+async def cache_avatars(concurrency: int) -> tuple:
+    """Copy every external avatar into the local store and repoint avatar_url at it"""
+    async with async_session_factory() as session:
+        users = await AvatarService.get_users_with_remote_avatars(session)
+
+    slots = asyncio.Semaphore(concurrency)
+    cached = failed = 0
+
+    async def cache(user) -> None:
+        nonlocal cached, failed
+        async with slots:
+            try:
+                async with async_session_factory() as session:
+                    await AvatarService.cache_remote_avatar(session, user)
+                cached += 1
+            except Exception as exc:
+                failed += 1
+                print(f"   ⚠️  {user.email}: {exc}")
+
+    await asyncio.gather(*(cache(user) for user in users))
+    return cached, failed
+
+
+async def main(concurrency: int) -> tuple:
+    try:
+        return await cache_avatars(concurrency)
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Cache external user avatars locally")
+    parser.add_argument("--concurrency", type=int, default=8, help="Avatars fetched at once")
+    args = parser.parse_args()
+
+    print(f"🖼️  Caching avatars (source: {avatar_source.name})")
+    print("=" * 50)
+    cached, failed = asyncio.run(main(args.concurrency))
+    print(f"✅ {cached} avatars cached, {failed} failed")
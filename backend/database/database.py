@@ -1,24 +1,184 @@
+import asyncio
+import time
+from typing import Any, Dict, Optional, Tuple
+from fastapi import Request
 from sqlmodel import SQLModel
 from sqlmodel.ext.asyncio.session import AsyncSession
-from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from app.core.settings import settings
+from database.pool import TimedQueuePool, pool_stats
+from database.replicas import Replica, ReplicaSet
+from app.core.metrics import instrument_engine
+from app.core.workers import serving_workers
 
-DATABASE_URL = settings.DATABASE_URL
+# Requests with these methods read from a replica when one is configured
+READ_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
 
-# Use psycopg2 for async operations
-if DATABASE_URL.startswith("postgresql://"):
-    DATABASE_URL = DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://", 1)
+# Session key holding the time until which a user's reads stay on the primary
+PRIMARY_UNTIL_KEY = "db_primary_until"
 
-engine = create_async_engine(DATABASE_URL, echo=True, future=True)
+
+def async_url(url: str) -> str:
+    """Use asyncpg for plain postgresql:// URLs"""
+    if url.startswith("postgresql://"):
+        return url.replace("postgresql://", "postgresql+asyncpg://", 1)
+    return url
+
+
+DATABASE_URL = async_url(settings.DATABASE_URL)
+
+
+def pool_limits() -> Tuple[int, int]:
+    """pool_size and max_overflow for this process.
+
+    With DATABASE_MAX_CONNECTIONS set, the budget is split evenly across the
+    workers serve.py forked; a single-process server keeps all of it. Each keeps at most DATABASE_POOL_SIZE idle connections
+    and overflows up to its share, so the workers together never open more
+    than the budget.
+    """
+    size, overflow = settings.DATABASE_POOL_SIZE, settings.DATABASE_MAX_OVERFLOW
+    if settings.DATABASE_MAX_CONNECTIONS <= 0:
+        return size, overflow
+    share = max(1, settings.DATABASE_MAX_CONNECTIONS // serving_workers())
+    size = min(size, share)
+    return size, min(overflow, share - size)
+
+
+def build_engine_kwargs(url: str) -> Dict[str, Any]:
+    """Engine options derived from settings for the given database URL"""
+    kwargs: Dict[str, Any] = {"echo": settings.DATABASE_ECHO, "future": True}
+    if url.startswith("sqlite"):
+        return kwargs
+
+    pool_size, max_overflow = pool_limits()
+    kwargs.update(
+        poolclass=TimedQueuePool,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=settings.DATABASE_POOL_TIMEOUT,
+        pool_recycle=settings.DATABASE_POOL_RECYCLE,
+        pool_pre_ping=settings.DATABASE_POOL_PRE_PING,
+    )
+    if "+asyncpg" in url:
+        kwargs["connect_args"] = {
+            "statement_cache_size": settings.DATABASE_STATEMENT_CACHE_SIZE,
+        }
+    return kwargs
+
+
+def create_engine_for(url: str):
+    """Engine with pool settings applied and, when enabled, request instrumentation"""
+    built = create_async_engine(url, **build_engine_kwargs(url))
+    if settings.METRICS_ENABLED or settings.QUERY_BUDGET_MODE != "off":
+        instrument_engine(built.sync_engine)
+    return built
+
+
+engine = create_engine_for(DATABASE_URL)
+
+# Built once at import time; creating a sessionmaker per request is pure overhead
+async_session_factory = sessionmaker(
+    engine, class_=AsyncSession, expire_on_commit=False
+)
+
+
+def build_replica_set() -> ReplicaSet:
+    """Replica engines for the URLs in DATABASE_REPLICA_URLS (may be empty)"""
+    replicas = []
+    for url in filter(None, (url.strip() for url in settings.DATABASE_REPLICA_URLS.split(","))):
+        replica_engine = create_engine_for(async_url(url))
+        replicas.append(Replica(
+            replica_engine,
+            sessionmaker(replica_engine, class_=AsyncSession, expire_on_commit=False),
+        ))
+    return ReplicaSet(
+        replicas,
+        max_lag=settings.DATABASE_REPLICA_MAX_LAG,
+        retry_after=settings.DATABASE_REPLICA_RETRY_SECONDS,
+        lag_check_interval=settings.DATABASE_REPLICA_LAG_CHECK_INTERVAL,
+    )
+
+
+replica_set = build_replica_set()
+
+async def warm_engine(target: AsyncEngine, connections: Optional[int] = None) -> int:
+    """Open `connections` pooled connections (default: the pool's base size) at once.
+
+    Each runs a trivial query and is then returned to the pool, so the first
+    requests after a start reuse them instead of paying for the connect.
+    """
+    if connections is None:
+        size = getattr(target.sync_engine.pool, "size", None)
+        connections = size() if callable(size) else 1
+
+    async def open_one():
+        conn = await target.connect()
+        try:
+            await conn.execute(text("SELECT 1"))
+        except BaseException:
+            await conn.close()
+            raise
+        return conn
+
+    # Held open together; opened one after another the pool would hand back the same connection
+    opened = await asyncio.gather(*(open_one() for _ in range(connections)), return_exceptions=True)
+    failures = [conn for conn in opened if isinstance(conn, BaseException)]
+    for conn in opened:
+        if not isinstance(conn, BaseException):
+            await conn.close()
+    if failures:
+        raise failures[0]
+    return connections
+
+async def warm_pools() -> int:
+    """Warm the primary engine and every replica; returns the connections opened"""
+    opened = await warm_engine(engine)
+    for replica in replica_set.replicas:
+        opened += await warm_engine(replica.engine)
+    return opened
 
 async def init_db():
     async with engine.begin() as conn:
         await conn.run_sync(SQLModel.metadata.create_all)
 
-async def get_session() -> AsyncSession: # type: ignore
-    async_session = sessionmaker(
-        engine, class_=AsyncSession, expire_on_commit=False
-    )
-    async with async_session() as session:
-        yield session
\ No newline at end of file
+def reads_from_primary(request: Request) -> bool:
+    """Whether this request must use the primary rather than a replica.
+
+    Writes always do. An authenticated user's write also pins their reads to
+    the primary for DATABASE_READ_YOUR_WRITES_SECONDS, so they see their own
+    changes before the replicas catch up. The pin lives in the server-side
+    session, so it holds across workers with a shared session backend.
+    """
+    session = request.scope.get("session")
+    now = time.time()
+    if request.method not in READ_METHODS:
+        if session is not None and "user_id" in session and settings.DATABASE_READ_YOUR_WRITES_SECONDS > 0:
+            session[PRIMARY_UNTIL_KEY] = now + settings.DATABASE_READ_YOUR_WRITES_SECONDS
+        return True
+    return session is not None and session.get(PRIMARY_UNTIL_KEY, 0) > now
+
+async def get_session(request: Request) -> AsyncSession: # type: ignore
+    """Session for the current request: a replica for reads, the primary otherwise"""
+    if replica_set and not reads_from_primary(request):
+        session = await replica_set.open_session()
+        if session is not None:
+            async with session:
+                try:
+                    yield session
+                except Exception as exc:
+                    replica_set.report_failure(session, exc)
+                    raise
+            return
+
+    async with async_session_factory() as session:
+        yield session
+
+def get_pool_stats() -> Dict[str, Any]:
+    """Current connection pool usage for the main engine and any replicas"""
+    stats = pool_stats(engine.sync_engine.pool)
+    if replica_set:
+        stats["replicas"] = replica_set.stats()
+        stats["replica_fallbacks"] = replica_set.fallbacks
+    return stats
@@ -0,0 +1,43 @@
+import argparse
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.database import async_session_factory, engine
+from app.importer.schema.importer import ImportResult
+from app.importer.service.import_service import ImportService
+
+
+async def import_file(path: str, format: str, batch_size: int) -> ImportResult:
+    with open(path, encoding="utf-8-sig", newline="") as lines:
+        records = ImportService.parse_csv(lines) if format == "csv" else ImportService.parse_ndjson(lines)
+        async with async_session_factory() as session:
+            return await ImportService.import_records(session, records, batch_size=batch_size)
+
+
+async def main(path: str, format: str, batch_size: int) -> ImportResult:
+    try:
+        return await import_file(path, format, batch_size)
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk import users and skills from CSV or NDJSON")
+    parser.add_argument("path", help="file in the /export CSV or NDJSON layout")
+    parser.add_argument("--format", choices=["csv", "ndjson"], help="defaults to the file extension")
+    parser.add_argument("--batch-size", type=int, default=None)
+    args = parser.parse_args()
+    format = args.format or ("ndjson" if args.path.endswith((".ndjson", ".jsonl")) else "csv")
+
+    print(f"📥 Importing {args.path} ({format})")
+    print("=" * 50)
+    result = asyncio.run(main(args.path, format, args.batch_size))
+    print(f"✅ {result.rows} rows: {result.users_created} users created, {result.users_updated} updated; "
+          f"{result.skills_created} skills created, {result.skills_updated} updated")
+    if result.error_count:
+        print(f"⚠️  {result.error_count} rejected")
+        for error in result.errors:
+            print(f"   line {error.line} {error.email or ''}: {error.detail}")
@@ -0,0 +1,93 @@
+"""
+Data fix: merge skills a user holds more than once under the same name
+
+Run before migrating to e6a2b8d4f1c7, which makes skill names unique per
+user and refuses to upgrade while duplicates exist:
+
+    python database/merge_duplicate_skills.py           # list the duplicates
+    python database/merge_duplicate_skills.py --apply   # merge them
+
+Of each (user_id, name) group the most recently updated row is kept, with
+its level, category and description; the others are deleted together with
+their skill_level_history rows, and skill_stats is recounted.
+"""
+import argparse
+import asyncio
+import os
+import sys
+from typing import List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from database.database import async_session_factory, engine
+from app.skill.model.skill import Skill
+from app.skill.model.skill_level_history import SkillLevelHistory
+from app.skill.service.skill_stats_service import SkillStatsService
+import app.user.model  # noqa: F401  (register the User mapper)
+
+# Skill ids per DELETE, well below SQLite's bound parameter limit
+CHUNK_SIZE = 1000
+
+
+async def duplicate_groups(db: AsyncSession) -> List[Tuple[int, str, int]]:
+    """(user_id, name, rows) for every name a user holds more than once"""
+    result = await db.execute(
+        select(Skill.user_id, Skill.name, func.count(Skill.id))
+        .group_by(Skill.user_id, Skill.name)
+        .having(func.count(Skill.id) > 1)
+        .order_by(Skill.user_id, Skill.name)
+    )
+    return [tuple(row) for row in result.all()]
+
+
+async def merge_duplicates(db: AsyncSession) -> int:
+    """Keep the newest row of each duplicate group; returns the number of rows deleted"""
+    ranked = select(
+        Skill.id,
+        func.row_number().over(
+            partition_by=(Skill.user_id, Skill.name),
+            order_by=(func.coalesce(Skill.updated_at, Skill.created_at).desc(), Skill.id.desc()),
+        ).label("rank"),
+    ).subquery()
+    result = await db.execute(select(ranked.c.id).where(ranked.c.rank > 1))
+    removed = result.scalars().all()
+    for start in range(0, len(removed), CHUNK_SIZE):
+        chunk = removed[start:start + CHUNK_SIZE]
+        # skill_level_history has no foreign key, so its rows would outlive the skill
+        await db.execute(delete(SkillLevelHistory).where(SkillLevelHistory.skill_id.in_(chunk)))
+        await db.execute(
+            delete(Skill).where(Skill.id.in_(chunk)).execution_options(synchronize_session=False)
+        )
+    # Commits the deletes together with the recount
+    await SkillStatsService.rebuild(db)
+    return len(removed)
+
+
+async def main(apply: bool) -> Tuple[List[Tuple[int, str, int]], int]:
+    try:
+        async with async_session_factory() as session:
+            groups = await duplicate_groups(session)
+            removed = await merge_duplicates(session) if apply and groups else 0
+            return groups, removed
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Merge skills a user holds more than once under the same name")
+    parser.add_argument("--apply", action="store_true", help="Delete the older duplicates; without it only list them")
+    args = parser.parse_args()
+
+    print("🧹 Merging duplicate skills")
+    print("=" * 50)
+    groups, removed = asyncio.run(main(args.apply))
+    for user_id, name, rows in groups:
+        print(f"   user {user_id}: {name!r} x{rows}")
+    if not groups:
+        print("✅ No duplicate skills")
+    elif args.apply:
+        print(f"✅ {len(groups)} duplicate groups merged, {removed} rows deleted")
+    else:
+        print(f"⚠️  {len(groups)} duplicate groups; run again with --apply to keep the newest row of each")
@@ -0,0 +1,70 @@
+"""
+Container prestart: migrate and seed only when the database needs it
+"""
+import argparse
+import os
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from alembic import command
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.pool import NullPool
+from app.core.settings import settings
+
+
+def database_state(url: str) -> tuple:
+    """Applied Alembic revisions and whether any user exists, over one connection"""
+    engine = create_engine(url, poolclass=NullPool)
+    try:
+        with engine.connect() as conn:
+            current = set(MigrationContext.configure(conn).get_current_heads())
+            has_users = inspect(conn).has_table("user") and bool(
+                conn.scalar(text('SELECT EXISTS (SELECT 1 FROM "user")'))
+            )
+    finally:
+        engine.dispose()
+    return current, has_users
+
+
+def prestart(seed: bool, force: bool) -> None:
+    """Run `alembic upgrade head` and the seeder only when something changed.
+
+    The target revisions are read from the migration scripts, without
+    importing env.py or the models, and compared with the alembic_version
+    table. A database already at head is left alone. Seeding runs after a
+    migration, or when the user table is still empty.
+    """
+    started = time.perf_counter()
+    config = Config(os.path.join(BACKEND_DIR, "alembic.ini"))
+    heads = set(ScriptDirectory.from_config(config).get_heads())
+    current, has_users = database_state(settings.DATABASE_URL)
+
+    migrate = force or current != heads
+    if migrate:
+        print(f"🔄 Migrating {', '.join(sorted(current)) or 'empty database'} → {', '.join(sorted(heads))}")
+        command.upgrade(config, "head")
+    else:
+        print(f"✅ Schema already at {', '.join(sorted(heads))}, skipping migrations")
+
+    if seed and (migrate or not has_users):
+        from database.seeder import seed_database
+        seed_database()
+    elif seed:
+        print("⏭️  Database already seeded, skipping seeding")
+
+    print(f"⏱️  Prestart finished in {time.perf_counter() - started:.2f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Migrate and seed the database when needed")
+    parser.add_argument("--seed", action="store_true", help="Seed the demo users after a migration or into an empty database")
+    parser.add_argument("--force", action="store_true", help="Run `alembic upgrade head` even if the schema looks current")
+    args = parser.parse_args()
+
+    prestart(args.seed, args.force)
@@ -0,0 +1,28 @@
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.database import async_session_factory, engine
+from app.skill.service.skill_stats_service import SkillStatsService
+import app.user.model  # noqa: F401  (register the User mapper)
+
+
+async def rebuild_skill_stats() -> int:
+    async with async_session_factory() as session:
+        return await SkillStatsService.rebuild(session)
+
+
+async def main() -> int:
+    try:
+        return await rebuild_skill_stats()
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    print("📊 Rebuilding skill statistics")
+    print("=" * 50)
+    rows = asyncio.run(main())
+    print(f"✅ skill_stats rebuilt with {rows} rows")
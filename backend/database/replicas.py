@@ -0,0 +1,126 @@
+"""
+Read-replica selection with health tracking and a replay-lag cutoff
+"""
+import itertools
+import logging
+import time
+from typing import Any, Callable, Dict, List, Optional
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, AsyncSession
+from database.pool import pool_stats
+
+logger = logging.getLogger(__name__)
+
+# Seconds since the last replayed transaction; 0 on a primary
+PG_REPLAY_LAG = text(
+    "SELECT CASE WHEN pg_is_in_recovery() "
+    "THEN COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) "
+    "ELSE 0 END"
+)
+
+
+class Replica:
+    """One replica engine plus what the router knows about its health"""
+
+    def __init__(self, engine: AsyncEngine, session_factory: Callable[[], AsyncSession]) -> None:
+        self.engine = engine
+        self.session_factory = session_factory
+        self.down_until = 0.0
+        self.lag_checked_at = 0.0
+        self.lag: Optional[float] = None
+        self.failures = 0
+
+    @property
+    def name(self) -> str:
+        return self.engine.url.render_as_string(hide_password=True)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "url": self.name,
+            "healthy": self.down_until <= time.monotonic(),
+            "lag_seconds": None if self.lag is None else round(self.lag, 3),
+            "failures": self.failures,
+            **pool_stats(self.engine.sync_engine.pool),
+        }
+
+
+class ReplicaSet:
+    """Hands out read sessions from replicas in round-robin order.
+
+    A replica that fails to connect, or whose replay lag is above `max_lag`,
+    is skipped for `retry_after` seconds. Lag is measured on PostgreSQL at
+    most once per `lag_check_interval` per replica, on the connection the
+    session is about to use; other databases (e.g. SQLite files in local
+    testing) are treated as lag-free. When no replica is usable
+    `open_session` returns None and the caller reads from the primary.
+    """
+
+    def __init__(
+        self,
+        replicas: List[Replica],
+        max_lag: float = 10.0,
+        retry_after: float = 30.0,
+        lag_check_interval: float = 5.0,
+    ) -> None:
+        self.replicas = replicas
+        self.max_lag = max_lag
+        self.retry_after = retry_after
+        self.lag_check_interval = lag_check_interval
+        self._order = itertools.cycle(range(len(replicas))) if replicas else None
+        self.fallbacks = 0
+
+    def __bool__(self) -> bool:
+        return bool(self.replicas)
+
+    def mark_down(self, replica: Replica, reason: str) -> None:
+        replica.down_until = time.monotonic() + self.retry_after
+        replica.failures += 1
+        logger.warning("Replica %s unavailable for %.0fs: %s", replica.name, self.retry_after, reason)
+
+    async def _lag(self, conn: AsyncConnection) -> float:
+        if conn.dialect.name != "postgresql":
+            return 0.0
+        return float(await conn.scalar(PG_REPLAY_LAG) or 0.0)
+
+    async def open_session(self) -> Optional[AsyncSession]:
+        """A session bound to a healthy replica, or None to use the primary"""
+        if not self.replicas:
+            return None
+
+        now = time.monotonic()
+        start = next(self._order)
+        for offset in range(len(self.replicas)):
+            replica = self.replicas[(start + offset) % len(self.replicas)]
+            if replica.down_until > now:
+                continue
+
+            session = replica.session_factory()
+            try:
+                # Check the connection out now so a dead replica is noticed here, not mid-request
+                conn = await session.connection()
+                if now - replica.lag_checked_at >= self.lag_check_interval:
+                    replica.lag = await self._lag(conn)
+                    replica.lag_checked_at = now
+                if replica.lag is not None and replica.lag > self.max_lag:
+                    await session.close()
+                    self.mark_down(replica, f"replay lag {replica.lag:.1f}s")
+                    continue
+                return session
+            except (DBAPIError, OSError) as exc:
+                await session.close()
+                self.mark_down(replica, str(exc).splitlines()[0])
+
+        self.fallbacks += 1
+        return None
+
+    def report_failure(self, session: AsyncSession, exc: BaseException) -> None:
+        """Take the replica behind `session` out of rotation after a connection error"""
+        if not isinstance(exc, DBAPIError) or not exc.connection_invalidated:
+            return
+        for replica in self.replicas:
+            if session.bind is replica.engine:
+                self.mark_down(replica, str(exc).splitlines()[0])
+
+    def stats(self) -> List[Dict[str, Any]]:
+        return [replica.stats() for replica in self.replicas]
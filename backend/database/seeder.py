@@ -1,5 +1,13 @@
 import psycopg2
+import argparse
+import io
+import math
 import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from multiprocessing import Pool
 from pathlib import Path
 
 def load_env():
@@ -82,6 +90,9 @@ def seed_database():
         
         conn.commit()
         
+        rebuild_skill_stats(cur)
+        conn.commit()
+        
         print("🎉 Database seeding completed successfully!")
         print("\n🔑 Test credentials:")
         print("   Email: juan.perez@example.com | Password: password123")
@@ -96,7 +107,198 @@ def seed_database():
         cur.close()
         conn.close()
 
+def rebuild_skill_stats(cur):
+    """Recompute skill_stats from the skill table (rows inserted here bypass the service layer)"""
+    cur.execute("DELETE FROM skill_stats")
+    cur.execute("""
+        INSERT INTO skill_stats (category, name, count, level_sum, level_sq_sum)
+        SELECT category, name, count(*), sum(level), sum(level * level)
+        FROM skill
+        GROUP BY category, name
+    """)
+
+
+# Synthetic mode: realistic-looking data at capacity-testing scale
+
+CATALOG = {
+    "Programming": ["Python", "JavaScript", "TypeScript", "Java", "Go", "C#", "Rust", "Kotlin", "C++", "Ruby", "R", "Scala"],
+    "Database": ["SQL", "PostgreSQL", "MySQL", "MongoDB", "Redis", "Elasticsearch", "Cassandra", "SQLite"],
+    "Framework": ["FastAPI", "Django", "React", "Vue", "Angular", "Spring", "Flask", "Express", "Next.js"],
+    "DevOps": ["Docker", "Kubernetes", "CI/CD", "Ansible", "Jenkins", "GitHub Actions", "Helm"],
+    "Cloud": ["AWS", "GCP", "Azure", "Serverless", "CloudFormation"],
+    "Data Science": ["Machine Learning", "Statistics", "Deep Learning", "NLP", "Computer Vision", "Pandas"],
+    "Big Data": ["Apache Spark", "Kafka", "Airflow", "Hadoop", "dbt", "Flink"],
+    "Visualization": ["Tableau", "Power BI", "D3.js", "Matplotlib", "Looker"],
+    "Infrastructure": ["Terraform", "Linux", "Networking", "Nginx", "Prometheus"],
+    "Soft Skills": ["Communication", "Leadership", "Mentoring", "Public Speaking", "Negotiation"],
+}
+FIRST_NAMES = ["Ana", "Luis", "Sofia", "Mateo", "Valentina", "Diego", "Camila", "Andres", "Laura", "Felipe",
+               "Daniela", "Santiago", "Paula", "Juan", "Maria", "Carlos", "Isabel", "Tomas", "Lucia", "Pedro"]
+LAST_NAMES = ["Gomez", "Rodriguez", "Martinez", "Lopez", "Garcia", "Perez", "Sanchez", "Ramirez", "Torres",
+              "Flores", "Rivera", "Castro", "Vargas", "Rojas", "Moreno", "Ortiz", "Silva", "Mendoza"]
+POSITIONS = ["Software Engineer", "Senior Developer", "Data Scientist", "Data Engineer", "DevOps Engineer",
+             "QA Engineer", "Tech Lead", "Engineering Manager", "ML Engineer", "Frontend Developer"]
+# Synthetic skill descriptions, filled with the skill name and a context
+DESCRIPTION_TEMPLATES = [
+    "Used {name} daily on {context}",
+    "Built and maintained {context} with {name}",
+    "Led the move of {context} to {name}",
+    "Mentored teammates on {name} best practices",
+    "Certified in {name}; applied it to {context}",
+    "Occasional {name} work on {context}",
+]
+DESCRIPTION_CONTEXTS = ["payment services", "internal tooling", "the data platform", "customer dashboards",
+                        "mobile backends", "reporting pipelines", "the search service", "onboarding flows"]
+
+# Users generated (and committed) per COPY round trip
+SYNTHETIC_CHUNK_USERS = 10_000
+
+
+def build_vocabulary(skill_names, category_skew):
+    """(name, category) pairs with Zipf-like cumulative weights.
+
+    Categories are weighted by rank ** -category_skew and popularity within a
+    category falls off the same way, so a few skills are very common.
+    Names beyond the catalog are numbered variants of the catalog entries.
+    """
+    categories = list(CATALOG)
+    vocabulary, weights = [], []
+    for rank, category in enumerate(categories, 1):
+        names = list(CATALOG[category])
+        extra = max(0, skill_names - sum(len(entries) for entries in CATALOG.values())) // len(categories)
+        names += [f"{names[index % len(names)]} {index // len(names) + 2}" for index in range(extra)]
+        for position, name in enumerate(names, 1):
+            vocabulary.append((name, category))
+            weights.append(rank ** -category_skew * position ** -1.0)
+    cumulative, total = [], 0.0
+    for weight in weights:
+        total += weight
+        cumulative.append(total)
+    return vocabulary, cumulative
+
+
+def _copy(cur, table, columns, rows):
+    """Stream rows through COPY ... FROM STDIN in text format"""
+    buffer = io.StringIO()
+    for row in rows:
+        buffer.write("\t".join("\\N" if value is None else str(value) for value in row))
+        buffer.write("\n")
+    buffer.seek(0)
+    cur.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN", buffer)
+
+
+_worker = {}
+
+
+def _init_worker(options, vocabulary, cumulative, password_hash):
+    conn = psycopg2.connect(DATABASE_URL)
+    with conn.cursor() as cur:
+        # Seeding can be rerun from scratch, so trade durability for speed
+        cur.execute("SET synchronous_commit TO off")
+    _worker.update(conn=conn, options=options, vocabulary=vocabulary, cumulative=cumulative, password_hash=password_hash)
+
+
+def _seed_chunk(task):
+    """Generate and COPY one chunk of users and their skills; returns (users, skills)"""
+    chunk, first_id, count = task
+    options, vocabulary, cumulative = _worker["options"], _worker["vocabulary"], _worker["cumulative"]
+    # Seeded per chunk so the data does not depend on the worker count
+    rng = random.Random(f"{options['seed']}:{chunk}")
+    now = datetime.now(timezone.utc)
+    mu = math.log(options["skills_per_user"]) - 0.125
+
+    users, skills = [], []
+    for user_id in range(first_id, first_id + count):
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        created = (now - timedelta(seconds=rng.randrange(3 * 365 * 86400))).isoformat()
+        users.append((
+            user_id, f"{first} {last}", rng.choice(POSITIONS), f"{first}.{last}.{user_id}@example.com".lower(),
+            _worker["password_hash"], f"https://api.dicebear.com/7.x/avataaars/svg?seed={user_id}", created, created,
+        ))
+        # Log-normal skill counts (mean skills_per_user) and a per-person ability offset
+        wanted = min(len(vocabulary), max(1, round(rng.lognormvariate(mu, 0.5))))
+        ability = rng.gauss(0, options["level_sd"] / 2)
+        picked = dict.fromkeys(rng.choices(range(len(vocabulary)), cum_weights=cumulative, k=wanted * 2))
+        for index in list(picked)[:wanted]:
+            name, category = vocabulary[index]
+            level = rng.gauss(options["level_mean"] + ability, options["level_sd"] / 2)
+            description = None
+            if rng.random() < options["description_rate"]:
+                description = rng.choice(DESCRIPTION_TEMPLATES).format(name=name, context=rng.choice(DESCRIPTION_CONTEXTS))
+            skills.append((user_id, name, category, description, min(10, max(1, round(level))), created, created))
+
+    conn = _worker["conn"]
+    with conn.cursor() as cur:
+        _copy(cur, '"user"', ["id", "name", "position", "email", "password", "avatar_url", "created_at", "updated_at"], users)
+        _copy(cur, "skill", ["user_id", "name", "category", "description", "level", "created_at", "updated_at"], skills)
+    conn.commit()
+    return len(users), len(skills)
+
+
+def seed_synthetic(options):
+    """Bulk-generate options['users'] users with COPY across options['workers'] connections.
+
+    Every synthetic user can log in with options['password']. Rerunning adds
+    a new batch of users after the current highest id.
+    """
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+    from app.core.security import hash_password_sync
+
+    print(f"🏭 Generating {options['users']} users (~{options['skills_per_user']} skills each) "
+          f"with {options['workers']} workers, seed {options['seed']}")
+    vocabulary, cumulative = build_vocabulary(options["skill_names"], options["category_skew"])
+    password_hash = hash_password_sync(options["password"])
+
+    conn = psycopg2.connect(DATABASE_URL)
+    try:
+        with conn.cursor() as cur:
+            cur.execute('SELECT COALESCE(MAX(id), 0) FROM "user"')
+            base = cur.fetchone()[0]
+
+        tasks = []
+        for chunk, offset in enumerate(range(0, options["users"], SYNTHETIC_CHUNK_USERS)):
+            tasks.append((chunk, base + offset + 1, min(SYNTHETIC_CHUNK_USERS, options["users"] - offset)))
+
+        start = time.perf_counter()
+        users = skills = 0
+        with Pool(options["workers"], _init_worker, (options, vocabulary, cumulative, password_hash)) as pool:
+            for chunk_users, chunk_skills in pool.imap_unordered(_seed_chunk, tasks):
+                users += chunk_users
+                skills += chunk_skills
+                elapsed = time.perf_counter() - start
+                print(f"   ✅ {users} users, {skills} skills ({(users + skills) / elapsed:,.0f} rows/s)", flush=True)
+
+        print("📊 Updating sequences and skill statistics...")
+        with conn.cursor() as cur:
+            # Ids were assigned explicitly; move the sequence past them
+            cur.execute("""SELECT setval(pg_get_serial_sequence('"user"', 'id'), (SELECT MAX(id) FROM "user"))""")
+            rebuild_skill_stats(cur)
+            cur.execute('ANALYZE "user"')
+            cur.execute("ANALYZE skill")
+        conn.commit()
+        print(f"🎉 Seeded {users} users and {skills} skills in {time.perf_counter() - start:.1f}s")
+        print(f"🔑 Any synthetic user logs in with password: {options['password']}")
+    finally:
+        conn.close()
+
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Seed the database with demo or synthetic data")
+    parser.add_argument("--synthetic", action="store_true", help="generate a large synthetic dataset instead of the demo users")
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--skills-per-user", type=float, default=20.0, help="mean skills per user (log-normal)")
+    parser.add_argument("--skill-names", type=int, default=500, help="distinct skill names to draw from")
+    parser.add_argument("--category-skew", type=float, default=1.1, help="Zipf exponent for category popularity")
+    parser.add_argument("--level-mean", type=float, default=6.0)
+    parser.add_argument("--level-sd", type=float, default=2.0)
+    parser.add_argument("--description-rate", type=float, default=0.3, help="share of skills given a description")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="parallel connections")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--password", default="password123", help="password shared by all synthetic users")
+    args = parser.parse_args()
+
     print("🚀 Database Seeder")
     print("=" * 50)
-    seed_database()
+    if args.synthetic:
+        seed_synthetic(vars(args))
+    else:
+        seed_database()
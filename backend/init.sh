@@ -3,17 +3,16 @@ set -e
 
 echo "🚀 Starting application initialization..."
 
-# Run database migrations
-echo "🔄 Running database migrations..."
-alembic upgrade head
-
-# Seed database if in development mode or if SEED_DATABASE is set
+# Migrate and seed only when the schema revision changed (or the database is empty)
+PRESTART_ARGS=""
 if [ "${ENVIRONMENT:-development}" = "development" ] || [ "${SEED_DATABASE:-false}" = "true" ]; then
-    echo "🌱 Seeding database with sample data..."
-    python database/seeder.py
-else
-    echo "⏭️  Skipping database seeding (not in development mode)"
+    PRESTART_ARGS="--seed"
+fi
+if [ "${FORCE_MIGRATIONS:-false}" = "true" ]; then
+    PRESTART_ARGS="$PRESTART_ARGS --force"
 fi
+echo "🔄 Checking database schema..."
+python database/prestart.py $PRESTART_ARGS
 
 echo "✅ Application initialization completed!"
 
@@ -1,9 +1,48 @@
+from contextlib import asynccontextmanager
+# Imported first so the startup timer also covers loading the app's modules
+from app.core.startup import startup_timer
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.settings import settings
 from app.user.api.router import router as user_router
 from app.skill.api.router import router as skill_router
-from starlette.middleware.sessions import SessionMiddleware
+from app.export.api.router import router as export_router
+from app.importer.api.router import router as import_router
+from app.avatar.api.router import router as avatar_router
+from app.core.session import ServerSessionMiddleware, session_store
+from app.core.cache_bus import cache_bus
+from app.core.metrics import MetricsMiddleware, registry
+from app.core.query_budget import QueryBudgetMiddleware
+from database.database import async_session_factory, get_pool_stats, warm_pools
+from app.user.service.user_service import user_cache
+from app.skill.service.skill_history_service import skill_history_recorder
+from app.skill.service.skill_service import SkillService
+from app.skill.service.similarity_service import SimilarityService
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Pay for connections and caches before the first request, not during it
+    if settings.STARTUP_WARM_POOL:
+        async with startup_timer.step("database_pool"):
+            await warm_pools()
+    async with startup_timer.step("session_store"):
+        await session_store.load("warmup")
+    # Subscribed before the caches load, so no write from another worker falls in between
+    async with startup_timer.step("cache_bus"):
+        await cache_bus.start()
+    if settings.STARTUP_WARM_CACHES:
+        async with startup_timer.step("skill_name_index"), async_session_factory() as db:
+            await SkillService.ensure_name_index(db)
+        async with startup_timer.step("similarity_matrix"):
+            await SimilarityService.ensure_loaded()
+    startup_timer.ready()
+    yield
+    # Write out skill history rows still queued in memory
+    await skill_history_recorder.close()
+    await cache_bus.close()
+
 
 # Create FastAPI app
 app = FastAPI(
@@ -12,6 +51,7 @@ app = FastAPI(
     debug=settings.DEBUG,
     docs_url="/docs" if settings.ENVIRONMENT == "development" else None,
     redoc_url="/redoc" if settings.ENVIRONMENT == "development" else None,
+    lifespan=lifespan,
 )
 
 # CORS middleware
@@ -24,14 +64,31 @@ app.add_middleware(
 )
 
 app.add_middleware(
-    SessionMiddleware,
-    secret_key=settings.SECRET_KEY,
-    max_age=86400,
+    ServerSessionMiddleware,
+    backend=session_store,
+    cookie_name=settings.SESSION_COOKIE_NAME,
+    max_age=settings.SESSION_TTL,
 )
 
+if settings.QUERY_BUDGET_MODE != "off":
+    app.add_middleware(
+        QueryBudgetMiddleware,
+        mode=settings.QUERY_BUDGET_MODE,
+        repeat_threshold=settings.QUERY_REPEAT_THRESHOLD,
+    )
+
+# Outermost, so recorded latency covers the session lookup too
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware, server_timing=settings.SERVER_TIMING_ENABLED)
+
 # Include API routers
 app.include_router(user_router, prefix="/api")
 app.include_router(skill_router, prefix="/api")
+app.include_router(export_router, prefix="/api")
+app.include_router(import_router, prefix="/api")
+app.include_router(avatar_router, prefix="/api")
+
+startup_timer.mark("imports")
 
 @app.get("/")
 async def root():
@@ -47,6 +104,31 @@ async def health_check():
     """Health check endpoint"""
     return {"status": "healthy"}
 
+@app.get("/health/startup")
+async def startup_health():
+    """Time from import to ready, per warmup step"""
+    return startup_timer.stats()
+
+@app.get("/health/pool")
+async def pool_health():
+    """Database connection pool usage"""
+    return get_pool_stats()
+
+@app.get("/health/cache")
+async def cache_health():
+    """In-process cache hit/miss counters, and the bus keeping them in step across workers"""
+    return {"user": user_cache.stats(), "bus": cache_bus.stats()}
+
+@app.get("/health/sessions")
+async def session_health():
+    """Server-side session backend and live session count"""
+    return {"backend": session_store.name, "active_sessions": await session_store.count()}
+
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def metrics():
+    """Request, latency and database-time metrics in the Prometheus text format"""
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
@@ -0,0 +1,65 @@
+"""
+Production server: a gunicorn master preloading the app into uvicorn workers
+
+    python serve.py                 # one worker per available core with SESSION_BACKEND=redis
+    WEB_CONCURRENCY=4 python serve.py
+
+`kill -HUP <master pid>` starts a fresh set of workers, then lets the old
+ones finish their in-flight requests within WORKER_GRACEFUL_TIMEOUT
+seconds. Because the app is preloaded, code changes still need a restart
+of the master. Workers are also replaced one at a time after about
+WORKER_MAX_REQUESTS requests each.
+"""
+import logging
+import os
+import sys
+from typing import Any, Dict
+from gunicorn.app.base import BaseApplication
+from app.core.settings import settings
+from app.core.workers import SERVE_WORKERS_ENV, worker_count
+
+logger = logging.getLogger("gunicorn.error")
+
+
+class Server(BaseApplication):
+    """Runs gunicorn with options taken from Settings instead of a config file"""
+
+    def __init__(self, options: Dict[str, Any]) -> None:
+        self.options = options
+        super().__init__()
+
+    def load_config(self) -> None:
+        for key, value in self.options.items():
+            self.cfg.set(key, value)
+
+    def load(self):
+        # Imported once in the master and inherited by every forked worker
+        from main import app
+        return app
+
+
+def server_options(workers: int) -> Dict[str, Any]:
+    return {
+        "bind": f"{settings.HOST}:{settings.PORT}",
+        "workers": workers,
+        "worker_class": "uvicorn_worker.UvicornWorker",
+        "preload_app": True,
+        "max_requests": settings.WORKER_MAX_REQUESTS,
+        "max_requests_jitter": settings.WORKER_MAX_REQUESTS_JITTER,
+        "graceful_timeout": settings.WORKER_GRACEFUL_TIMEOUT,
+        "accesslog": "-" if settings.DEBUG else None,
+    }
+
+
+if __name__ == "__main__":
+    workers = worker_count()
+    if workers > 1 and settings.SESSION_BACKEND == "memory":
+        # Each worker would hold its own sessions, so requests reaching another worker fail with 401
+        logger.error(
+            "WEB_CONCURRENCY=%d needs SESSION_BACKEND=redis: SESSION_BACKEND=memory keeps sessions "
+            "and caches per worker. Set SESSION_BACKEND=redis or WEB_CONCURRENCY=1", workers
+        )
+        sys.exit(1)
+    # Read by the workers (and the preloading master) to split per-server budgets between them
+    os.environ[SERVE_WORKERS_ENV] = str(workers)
+    Server(server_options(workers)).run()
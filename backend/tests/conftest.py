@@ -0,0 +1,90 @@
+"""
+Shared fixtures: the app served in-process against a throwaway SQLite database
+
+Settings are read when the app is imported, so the environment is set up
+here before any application module is loaded.
+"""
+import os
+import tempfile
+
+TEST_DIR = tempfile.mkdtemp(prefix="skills-tests-")
+ADMIN_EMAIL = "admin@example.com"
+PASSWORD = "secret123"
+
+os.environ.update(
+    DATABASE_URL=f"sqlite+aiosqlite:///{os.path.join(TEST_DIR, 'test.db')}",
+    APP_NAME="skills-test",
+    APP_VERSION="test",
+    HOST="testserver",
+    AVATAR_STORAGE_DIR=os.path.join(TEST_DIR, "avatars"),
+    SESSION_BACKEND="memory",
+    IMPORT_ADMIN_EMAILS=ADMIN_EMAIL,
+    # Statement budgets fail the request instead of logging
+    QUERY_BUDGET_MODE="raise",
+    # History rows stay queued until a test flushes them
+    SKILL_HISTORY_FLUSH_INTERVAL="3600",
+)
+
+import httpx
+import pytest
+
+import main
+from database.base import Base
+from database.database import engine
+from app.skill.service.skill_name_index import skill_name_index
+from app.user.service.user_service import user_cache
+
+
+@pytest.fixture(scope="session")
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+async def app():
+    """The app with empty tables and cold in-process caches"""
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    user_cache.clear()
+    skill_name_index.expire()
+    async with main.app.router.lifespan_context(main.app):
+        yield main.app
+    await engine.dispose()
+
+
+@pytest.fixture
+async def client(app):
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://testserver") as client:
+        yield client
+
+
+@pytest.fixture
+def make_client(app):
+    """Factory for extra clients, each with its own cookie jar"""
+    def factory() -> httpx.AsyncClient:
+        return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://testserver")
+    return factory
+
+
+async def register(client: httpx.AsyncClient, email: str, name: str = "Test User") -> int:
+    """Create a user, log `client` in as them and return their id"""
+    response = await client.post(
+        "/api/v1/users/", json={"name": name, "position": "Engineer", "email": email, "password": PASSWORD}
+    )
+    assert response.status_code == 201, response.text
+    await login(client, email)
+    return response.json()["id"]
+
+
+async def login(client: httpx.AsyncClient, email: str) -> None:
+    response = await client.post("/api/v1/users/login", json={"email": email, "password": PASSWORD})
+    assert response.status_code == 200, response.text
+
+
+async def add_skill(client: httpx.AsyncClient, user_id: int, name: str, level: int = 5) -> int:
+    response = await client.post(
+        "/api/v1/skills/", json={"user_id": user_id, "name": name, "category": "Programming", "level": level}
+    )
+    assert response.status_code == 201, response.text
+    return response.json()["id"]
@@ -0,0 +1,77 @@
+"""Bulk import: admin only, valid rows land and rejected rows are reported by line"""
+import json
+
+import pytest
+
+from conftest import ADMIN_EMAIL, PASSWORD, login, register
+from app.core.security import hash_password_sync
+
+pytestmark = pytest.mark.anyio
+
+CSV_HEADER = "user_email,user_name,user_position,user_password,user_password_hash,skill_name,skill_category,skill_level\n"
+
+
+async def test_import_is_restricted_to_admins(client):
+    await register(client, "ana@example.com")
+
+    response = await client.post("/api/v1/import", content=CSV_HEADER)
+
+    assert response.status_code == 403
+
+
+async def test_csv_import_reports_rejected_rows_by_line(client):
+    await register(client, ADMIN_EMAIL)
+    body = CSV_HEADER + "".join([
+        f"ben@example.com,Ben,Engineer,{PASSWORD},,Python,Programming,7\n",  # line 2: created
+        "ben@example.com,,,,,Rust,Programming,5\n",  # line 3: second skill for ben
+        "cy@example.com,Cy,Engineer,,,Go,Programming,4\n",  # line 4: no password
+        "dee@example.com,Dee,Engineer,,scrypt$1$2$3$x$y,,,\n",  # line 5: malformed hash
+        "ben@example.com,,,,,Java,Programming,11\n",  # line 6: level out of range
+    ])
+
+    response = await client.post("/api/v1/import", params={"format": "csv"}, content=body)
+
+    assert response.status_code == 200, response.text
+    result = response.json()
+    assert result["rows"] == 5
+    assert result["users_created"] == 1
+    assert result["skills_created"] == 2
+    assert result["error_count"] == 4
+    assert [(error["line"], error["email"], error["detail"]) for error in result["errors"]] == [
+        (4, "cy@example.com", "Unknown user email; include a password to create the user"),
+        (4, "cy@example.com", "skill: Unknown user email"),
+        (5, "dee@example.com", "password_hash: Value error, Expected a scrypt$n$r$p$salt$key hash"),
+        (6, "ben@example.com", "skill: level: Input should be less than or equal to 10"),
+    ]
+
+    # The imported password works
+    await login(client, "ben@example.com")
+    me = (await client.get("/api/v1/users/me")).json()
+    skills = (await client.get(f"/api/v1/skills/user/{me['id']}")).json()
+    assert sorted(skill["name"] for skill in skills) == ["Python", "Rust"]
+
+
+async def test_ndjson_import_reports_malformed_lines(client):
+    await register(client, ADMIN_EMAIL)
+    lines = [
+        json.dumps({
+            "email": "ben@example.com", "name": "Ben", "position": "Engineer",
+            "password_hash": hash_password_sync(PASSWORD),
+            "skills": [{"name": "Python", "category": "Programming", "level": 6}],
+        }),
+        "{not json",
+        json.dumps(["a", "list"]),
+        json.dumps({"email": "cy@example.com", "name": "Cy", "position": "Engineer", "password": PASSWORD, "skills": "Go"}),
+    ]
+
+    response = await client.post("/api/v1/import", params={"format": "ndjson"}, content="\n".join(lines) + "\n")
+
+    result = response.json()
+    assert result["users_created"] == 1
+    assert result["skills_created"] == 1
+    assert [error["line"] for error in result["errors"]] == [2, 3, 4]
+    assert result["errors"][0]["detail"].startswith("Invalid JSON")
+    assert result["errors"][2]["detail"] == "skills: Input should be a valid list"
+
+    # A precomputed hash is stored as given, so the password behind it logs in
+    await login(client, "ben@example.com")
@@ -0,0 +1,73 @@
+"""Keyset cursors: round trips, and a 400 for anything not issued for the same sort"""
+import base64
+import json
+
+import pytest
+
+from conftest import add_skill, register
+
+pytestmark = pytest.mark.anyio
+
+
+def forge_cursor(sort, values) -> str:
+    """Encode a cursor the way app.core.pagination does, with arbitrary contents"""
+    raw = json.dumps({"s": sort, "v": values}).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+async def test_user_pages_follow_next_cursor(client):
+    await register(client, "ana@example.com", name="Ana")
+    await register(client, "ben@example.com", name="Ben")
+    await register(client, "cy@example.com", name="Cy")
+
+    first = (await client.get("/api/v1/users/", params={"cursor": "", "limit": 2})).json()
+    second = (await client.get("/api/v1/users/", params={"cursor": first["next_cursor"], "limit": 2})).json()
+
+    assert [user["name"] for user in first["items"]] == ["Ana", "Ben"]
+    assert [user["name"] for user in second["items"]] == ["Cy"]
+    assert second["next_cursor"] is None
+
+
+@pytest.mark.parametrize("cursor", [
+    "not base64 at all!",
+    base64.urlsafe_b64encode(b"not json").decode(),
+    forge_cursor("name", ["Ana"]),
+    forge_cursor("name", [1, 2]),
+    forge_cursor("name", ["Ana", "2"]),
+    forge_cursor("name", [None, 1]),
+    forge_cursor("name", "Ana"),
+    forge_cursor("id", [1]),
+])
+async def test_malformed_user_cursor_is_rejected(client, cursor):
+    await register(client, "ana@example.com")
+
+    response = await client.get("/api/v1/users/", params={"cursor": cursor})
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid pagination cursor"
+
+
+async def test_skill_cursor_is_bound_to_its_sort_order(client):
+    user_id = await register(client, "ana@example.com")
+    for level, name in enumerate(["Go", "Python", "Rust"], start=3):
+        await add_skill(client, user_id, name, level=level)
+
+    page = (await client.get("/api/v1/skills/", params={"cursor": "", "limit": 1, "sort": "name"})).json()
+    assert page["next_cursor"]
+
+    same_sort = await client.get("/api/v1/skills/", params={"cursor": page["next_cursor"], "sort": "name"})
+    other_sort = await client.get("/api/v1/skills/", params={"cursor": page["next_cursor"], "sort": "level"})
+
+    assert [skill["name"] for skill in same_sort.json()["items"]] == ["Python", "Rust"]
+    assert other_sort.status_code == 400
+
+
+async def test_skill_cursor_values_must_match_column_types(client):
+    user_id = await register(client, "ana@example.com")
+    await add_skill(client, user_id, "Go")
+
+    wrong_type = await client.get("/api/v1/skills/", params={"cursor": forge_cursor("level", ["high", 1]), "sort": "level"})
+    boolean_id = await client.get("/api/v1/skills/", params={"cursor": forge_cursor("name", ["Go", True]), "sort": "name"})
+
+    assert wrong_type.status_code == 400
+    assert boolean_id.status_code == 400
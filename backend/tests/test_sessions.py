@@ -0,0 +1,43 @@
+"""Server-side sessions: logout and user deletion revoke them, login rotates the id"""
+import pytest
+
+from conftest import login, register
+
+pytestmark = pytest.mark.anyio
+
+COOKIE = "session"
+
+
+async def test_logout_revokes_the_session_id(client, make_client):
+    await register(client, "ana@example.com")
+    session_id = client.cookies[COOKIE]
+
+    assert (await client.post("/api/v1/users/logout")).status_code == 200
+
+    # Replaying the old cookie from elsewhere must not get back in
+    async with make_client() as replay:
+        replay.cookies.set(COOKIE, session_id)
+        assert (await replay.get("/api/v1/users/me")).status_code == 401
+
+
+async def test_login_issues_a_fresh_session_id(client):
+    await register(client, "ana@example.com")
+    before = client.cookies[COOKIE]
+
+    await login(client, "ana@example.com")
+
+    assert client.cookies[COOKIE] != before
+    assert (await client.get("/api/v1/users/me")).status_code == 200
+
+
+async def test_deleting_a_user_revokes_all_their_sessions(client, make_client):
+    user_id = await register(client, "ana@example.com")
+    async with make_client() as laptop, make_client() as bystander:
+        await login(laptop, "ana@example.com")
+        await register(bystander, "ben@example.com")
+
+        assert (await client.delete(f"/api/v1/users/{user_id}")).status_code == 204
+
+        assert (await client.get("/api/v1/users/me")).status_code == 401
+        assert (await laptop.get("/api/v1/users/me")).status_code == 401
+        assert (await bystander.get("/api/v1/users/me")).status_code == 200
@@ -0,0 +1,61 @@
+"""Write-behind skill history: queued rows of deleted users and skills are discarded"""
+import pytest
+from sqlalchemy import func, select
+
+from conftest import add_skill, register
+from database.database import async_session_factory
+from app.skill.model.skill_level_history import SkillLevelHistory
+from app.skill.service.skill_history_service import skill_history_recorder
+
+pytestmark = pytest.mark.anyio
+
+
+async def history_counts():
+    """Stored history rows per user_id"""
+    async with async_session_factory() as db:
+        result = await db.execute(
+            select(SkillLevelHistory.user_id, func.count()).group_by(SkillLevelHistory.user_id)
+        )
+        return dict(result.all())
+
+
+async def test_queued_rows_are_recorded_on_flush(client):
+    user_id = await register(client, "ana@example.com")
+    skill_id = await add_skill(client, user_id, "Python", level=4)
+    await client.put(f"/api/v1/skills/{skill_id}", json={"level": 6})
+
+    assert await history_counts() == {}
+    assert await skill_history_recorder.flush() == 2
+    assert await history_counts() == {user_id: 2}
+
+
+async def test_deleting_a_user_discards_their_queued_and_stored_history(client, make_client):
+    user_id = await register(client, "ana@example.com")
+    skill_id = await add_skill(client, user_id, "Python", level=4)
+    async with make_client() as other:
+        other_id = await register(other, "ben@example.com")
+        await add_skill(other, other_id, "Rust", level=5)
+    await skill_history_recorder.flush()
+    # Queued, not yet written, when the user goes
+    await client.put(f"/api/v1/skills/{skill_id}", json={"level": 8})
+
+    assert (await client.delete(f"/api/v1/users/{user_id}")).status_code == 204
+    await skill_history_recorder.flush()
+
+    assert await history_counts() == {other_id: 1}
+
+
+async def test_deleting_a_skill_discards_its_history(client):
+    user_id = await register(client, "ana@example.com")
+    python_id = await add_skill(client, user_id, "Python", level=4)
+    await add_skill(client, user_id, "Rust", level=5)
+    await skill_history_recorder.flush()
+    await client.put(f"/api/v1/skills/{python_id}", json={"level": 7})
+
+    assert (await client.delete(f"/api/v1/skills/{python_id}")).status_code == 204
+    await skill_history_recorder.flush()
+
+    async with async_session_factory() as db:
+        skill_ids = (await db.execute(select(SkillLevelHistory.skill_id))).scalars().all()
+    assert python_id not in skill_ids
+    assert len(skill_ids) == 1
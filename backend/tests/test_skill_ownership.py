@@ -0,0 +1,76 @@
+"""Ownership-scoped skill writes: 409 for taken names, 404 vs 403 for misses"""
+import pytest
+
+from conftest import add_skill, login, register
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_create_duplicate_name_conflicts(client):
+    user_id = await register(client, "ana@example.com")
+    await add_skill(client, user_id, "Python")
+
+    response = await client.post(
+        "/api/v1/skills/", json={"user_id": user_id, "name": "Python", "category": "Programming", "level": 3}
+    )
+
+    assert response.status_code == 409
+
+
+async def test_create_for_another_user_is_forbidden(client, make_client):
+    async with make_client() as other:
+        other_id = await register(other, "ben@example.com")
+    await register(client, "ana@example.com")
+
+    response = await client.post(
+        "/api/v1/skills/", json={"user_id": other_id, "name": "Python", "category": "Programming", "level": 3}
+    )
+
+    assert response.status_code == 403
+
+
+async def test_rename_onto_existing_name_conflicts(client):
+    user_id = await register(client, "ana@example.com")
+    await add_skill(client, user_id, "Python")
+    rust_id = await add_skill(client, user_id, "Rust")
+
+    response = await client.put(f"/api/v1/skills/{rust_id}", json={"name": "Python"})
+
+    assert response.status_code == 409
+    assert (await client.get(f"/api/v1/skills/{rust_id}")).json()["name"] == "Rust"
+
+
+async def test_batch_with_duplicate_name_conflicts_and_rolls_back(client):
+    user_id = await register(client, "ana@example.com")
+    await add_skill(client, user_id, "Python")
+
+    response = await client.post("/api/v1/skills/batch", json={"operations": [
+        {"op": "create", "name": "Go", "category": "Programming", "level": 4},
+        {"op": "create", "name": "Python", "category": "Programming", "level": 4},
+    ]})
+
+    assert response.status_code == 409
+    names = [skill["name"] for skill in (await client.get(f"/api/v1/skills/user/{user_id}")).json()]
+    assert names == ["Python"]
+
+
+async def test_update_and_delete_missing_skill_is_not_found(client):
+    await register(client, "ana@example.com")
+
+    assert (await client.put("/api/v1/skills/999", json={"level": 7})).status_code == 404
+    assert (await client.delete("/api/v1/skills/999")).status_code == 404
+
+
+async def test_update_and_delete_other_users_skill_is_forbidden(client, make_client):
+    async with make_client() as other:
+        other_id = await register(other, "ben@example.com")
+        skill_id = await add_skill(other, other_id, "Python", level=4)
+    await register(client, "ana@example.com")
+
+    assert (await client.put(f"/api/v1/skills/{skill_id}", json={"level": 9})).status_code == 403
+    assert (await client.delete(f"/api/v1/skills/{skill_id}")).status_code == 403
+
+    async with make_client() as other:
+        await login(other, "ben@example.com")
+        skill = (await other.get(f"/api/v1/skills/{skill_id}")).json()
+    assert skill["level"] == 4
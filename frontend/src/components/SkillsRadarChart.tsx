@@ -1,4 +1,5 @@
-import { Paper, Typography, Box } from '@mui/material';
+import { useState, useEffect } from 'react';
+import { Paper, Typography, Box, CircularProgress } from '@mui/material';
 import { 
   RadarChart, 
   PolarGrid, 
@@ -8,16 +9,52 @@ import {
   ResponsiveContainer,
   Legend
 } from 'recharts';
-import type { Skill } from '../types/user';
+import type { CategoryAggregate } from '../types/user';
+import { SkillService } from '../services/user';
 
 interface SkillsRadarChartProps {
-  skills: Skill[];
+  userId: number;
 }
 
-function SkillsRadarChart({ skills }: SkillsRadarChartProps) {
-  const chartData = skills.map(skill => ({
-    skill: skill.name,
-    level: skill.level,
+function SkillsRadarChart({ userId }: SkillsRadarChartProps) {
+  const [categories, setCategories] = useState<CategoryAggregate[]>([]);
+  const [loading, setLoading] = useState(true);
+  const [error, setError] = useState<string | null>(null);
+
+  useEffect(() => {
+    let cancelled = false;
+
+    const fetchRadar = async () => {
+      try {
+        setLoading(true);
+        setError(null);
+        // Aggregated per category by the backend, with org-wide percentiles for comparison
+        const radar = await SkillService.getSkillRadar(userId, true);
+        if (!cancelled) {
+          setCategories(radar.categories);
+        }
+      } catch (err) {
+        console.error('Error fetching skill radar:', err);
+        if (!cancelled) {
+          setError('Failed to load skills overview.');
+        }
+      } finally {
+        if (!cancelled) {
+          setLoading(false);
+        }
+      }
+    };
+
+    fetchRadar();
+    return () => {
+      cancelled = true;
+    };
+  }, [userId]);
+
+  const chartData = categories.map(category => ({
+    category: category.category,
+    level: category.mean,
+    org: category.org?.p50 ?? category.org?.mean,
     fullMark: 10,
   }));
 
@@ -27,29 +64,41 @@ function SkillsRadarChart({ skills }: SkillsRadarChartProps) {
     fillOpacity: 0.3,
   };
 
+  const orgColors = {
+    stroke: '#82ca9d',
+    fill: '#82ca9d',
+    fillOpacity: 0.15,
+  };
+
+  const message = loading ? null : error || (categories.length === 0 ? 'No skills data available' : null);
+
   return (
     <Paper elevation={3} sx={{ p: 3, height: 500 }}>
       <Typography variant="h5" component="h2" gutterBottom align="center">
         Skills Overview
       </Typography>
       
-      {skills.length === 0 ? (
+      {loading || message ? (
         <Box 
           display="flex" 
           justifyContent="center" 
           alignItems="center" 
           height="400px"
         >
-          <Typography variant="body1" color="text.secondary">
-            No skills data available
-          </Typography>
+          {loading ? (
+            <CircularProgress />
+          ) : (
+            <Typography variant="body1" color={error ? 'error' : 'text.secondary'}>
+              {message}
+            </Typography>
+          )}
         </Box>
       ) : (
         <ResponsiveContainer width="100%" height={400}>
           <RadarChart data={chartData} margin={{ top: 20, right: 80, bottom: 20, left: 80 }}>
             <PolarGrid />
             <PolarAngleAxis 
-              dataKey="skill" 
+              dataKey="category" 
               tick={{ fontSize: 12, fill: '#666' }}
             />
             <PolarRadiusAxis 
@@ -59,20 +108,28 @@ function SkillsRadarChart({ skills }: SkillsRadarChartProps) {
               tickCount={6}
             />
             <Radar
-              name="Skill Level"
+              name="Average Level"
               dataKey="level"
               stroke={colors.stroke}
               fill={colors.fill}
               fillOpacity={colors.fillOpacity}
               strokeWidth={2}
             />
+            <Radar
+              name="Org Median"
+              dataKey="org"
+              stroke={orgColors.stroke}
+              fill={orgColors.fill}
+              fillOpacity={orgColors.fillOpacity}
+              strokeWidth={2}
+            />
             <Legend />
           </RadarChart>
         </ResponsiveContainer>
       )}
       
       <Typography variant="body2" color="text.secondary" align="center" sx={{ mt: 2 }}>
-        Skills are rated from 1 to 10 based on proficiency level
+        Average level per category, rated from 1 to 10, against the org-wide median
       </Typography>
     </Paper>
   );
@@ -1,5 +1,9 @@
 import { Avatar, Box } from '@mui/material';
 import { Person as PersonIcon } from '@mui/icons-material';
+import { API_BASE_URL } from '../services/api';
+
+// avatar_url values served by the backend's local avatar cache
+const LOCAL_AVATAR_PREFIX = '/api/v1/avatars/';
 
 interface UserAvatarProps {
   name: string;
@@ -13,8 +17,6 @@ function UserAvatar({ name, avatarUrl, size = 'large' }: UserAvatarProps) {
     return `https://api.dicebear.com/7.x/avataaars/svg?seed=${seed}&backgroundColor=b6e3f4,c0aede,d1d4f9`;
   };
 
-  const finalAvatarUrl = avatarUrl || generateAvatarUrl(name);
-
   const sizeStyles = {
     small: { width: 40, height: 40, fontSize: 16 },
     medium: { width: 80, height: 80, fontSize: 32 },
@@ -23,6 +25,14 @@ function UserAvatar({ name, avatarUrl, size = 'large' }: UserAvatarProps) {
 
   const currentSize = sizeStyles[size];
 
+  // Local avatars come as server-side thumbnails at twice the rendered size for sharp HiDPI display
+  const resolveAvatarUrl = (url: string) =>
+    url.startsWith(LOCAL_AVATAR_PREFIX)
+      ? `${API_BASE_URL}${url}?size=${currentSize.width * 2}`
+      : url;
+
+  const finalAvatarUrl = avatarUrl ? resolveAvatarUrl(avatarUrl) : generateAvatarUrl(name);
+
   return (
     <Box display="flex" justifyContent="center">
       <Avatar
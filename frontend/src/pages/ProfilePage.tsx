@@ -168,7 +168,7 @@ function ProfilePage({ userId: propUserId }: ProfilePageProps) {
 
         {/* Skills Radar Chart */}
         <Box flex={{ xs: '1', md: '1' }}>
-          <SkillsRadarChart skills={skills} />
+          <SkillsRadarChart userId={user.id} />
         </Box>
       </Box>
     </Container>
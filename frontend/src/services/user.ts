@@ -1,5 +1,5 @@
 import ApiService from './api';
-import type { User, Skill, UserProfile } from '../types/user';
+import type { User, Skill, UserProfile, SkillRadar } from '../types/user';
 
 export class UserService {
   /**
@@ -73,6 +73,21 @@ export class SkillService {
     }
   }
 
+  /**
+   * Get per-category skill aggregates for the radar chart (only own skills allowed)
+   */
+  static async getSkillRadar(userId: number, includeOrg: boolean = false): Promise<SkillRadar> {
+    try {
+      const response = await ApiService.get<SkillRadar>(
+        `/api/v1/skills/user/${userId}/radar?include_org=${includeOrg}`
+      );
+      return response;
+    } catch (error) {
+      console.error('Get skill radar error:', error);
+      throw error;
+    }
+  }
+
   /**
    * Create a new skill
    */
@@ -23,6 +23,29 @@ export interface UserProfile extends User {
   skills: Skill[];
 }
 
+export interface OrgCategoryStats {
+  count: number;
+  mean: number;
+  p25?: number;
+  p50?: number;
+  p75?: number;
+  p90?: number;
+}
+
+export interface CategoryAggregate {
+  category: string;
+  count: number;
+  mean: number;
+  max: number;
+  min: number;
+  org?: OrgCategoryStats;
+}
+
+export interface SkillRadar {
+  user_id: number;
+  categories: CategoryAggregate[];
+}
+
 export interface LoginCredentials {
   email: string;
   password: string;